@@ -1,35 +1,30 @@
 import streamlit as st
 import pandas as pd
-import joblib
-from sklearn.metrics.pairwise import cosine_similarity
 import os
 import datetime
-import plotly.express as px
-import html
-import base64
+
+# Modul khusus halaman admin / API (index_manager, classify, api) diimpor di fungsi yang memakainya
+from risda import (agregat, aset, labels, pekerjaan, pengguna, query_cache, render, resources, retrieval,
+                   storage, tracing)
 
 st.set_page_config(page_title="Sistem Rekomendasi Inovasi", layout="wide")
 
 if "page" not in st.session_state:
     st.session_state.page = "beranda"
 
-data = pd.read_csv("fixr.csv", encoding='utf-8', low_memory=True)
-data = data.dropna(subset=["judul", "sinopsis", "label"])
-data = data.reset_index(drop=True)
+# Korpus, vectorizer & matriks TF-IDF dimuat sekali per proses, model saat pertama dipakai (lihat risda/resources.py)
+with tracing.kumpulkan() as jejak_awal:
+    res = resources.get_resources()
+vectorizer = res.vectorizer
 
-data["gabungan"] = (data["judul"].fillna('') * 3 + " " + data["sinopsis"].fillna('')).str.strip()
+# API JSON opsional di thread latar, berbagi indeks di memori yang sama (lihat risda/api.py)
+if os.environ.get("RISDA_API_PORT"):
+    from risda import api
+    api.jalankan_di_latar(os.environ.get("RISDA_API_HOST", api.HOST), int(os.environ["RISDA_API_PORT"]))
 
-vectorizer = joblib.load("tfidf_vectorizer.pkl")
-model = joblib.load("model_kategori.pkl") 
-tfidf_matrix = vectorizer.transform(data["gabungan"])
+# Worker pekerjaan latar admin; pekerjaan tertunda dari proses sebelumnya dilanjutkan (lihat risda/pekerjaan.py)
+pekerjaan.lanjutkan()
 
-def rekomendasi(teks, top_n=None):
-    input_vec = vectorizer.transform([teks])
-    cosine_sim = cosine_similarity(input_vec, tfidf_matrix).flatten()
-    hasil = data.copy()
-    hasil["similarity"] = cosine_sim
-    hasil = hasil.sort_values(by="similarity", ascending=False)
-    return hasil if top_n is None else hasil.head(top_n)
 
 def show_footer():
     st.markdown("""
@@ -48,15 +43,15 @@ def show_footer():
         </div>
     """, unsafe_allow_html=True)
 
-def get_base64_from_image(image_path):
-    with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
-img_pemda = get_base64_from_image("animasi-gedung-pemerintah-0.png")
-img_industri = get_base64_from_image("industri.jpg")
-img_masyarakat = get_base64_from_image("masyarakat.jpg")
+# Thumbnail gambar beranda dibuat sekali per proses; disajikan lewat static file serving bila aktif
+FOLDER_STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 
 def halaman_beranda():
+    folder_static = FOLDER_STATIC if st.get_option("server.enableStaticServing") else None
+    img_pemda = aset.src("animasi-gedung-pemerintah-0.png", folder_static)
+    img_industri = aset.src("industri.jpg", folder_static)
+    img_masyarakat = aset.src("masyarakat.jpg", folder_static)
+
     st.markdown("""
         <style>
             .hero {
@@ -156,24 +151,12 @@ def halaman_beranda():
             <div class="highlight-subtitle">Rekomendasi dan publikasi unggulan terbaru yang perlu kamu lihat.</div>
         </div>
 
-        <!-- Grid Kartu Mulai -->
-        <div class="highlight-grid">
     """, unsafe_allow_html=True)
 
-    # Ambil 6 data terbaru
-    latest = data.sort_values("tahun", ascending=False).head(5)
-
-    # Render setiap kartu
-    for _, row in latest.iterrows():
-        st.markdown(f"""
-            <div class="highlight-card">
-                <h4>{row['judul']}</h4>
-                <p><b>{row['tahun']}</b> — {row['nama']}</p>
-                <p>{row['afiliasi']}</p>
-            </div>
-        """, unsafe_allow_html=True)
-
-    st.markdown("</div>", unsafe_allow_html=True)
+    # Inovasi terbaru sudah dihitung sekali per versi korpus (lihat risda/agregat.py)
+    latest = res.baris(agregat.ambil(res).terbaru)
+    isi = [render.isi_baris(row, []) for row in latest.to_dict("records")]
+    st.markdown(render.grid_highlight(isi), unsafe_allow_html=True)
 
 
     # === Testimoni Pengguna ===
@@ -332,7 +315,7 @@ def halaman_beranda():
         <div class="roles-container">
             <div class="role-box">
                 <div class="role-image-wrapper">
-                    <img src="data:image/png;base64,{img_pemda}" class="role-image" alt="Pemerintah">
+                    <img src="{img_pemda}" class="role-image" alt="Pemerintah">
                 </div>
                 <h3>Pemerintah Daerah</h3>
                 <ul>
@@ -344,7 +327,7 @@ def halaman_beranda():
             </div>
             <div class="role-box">
                 <div class="role-image-wrapper">
-                    <img src="data:image/jpeg;base64,{img_industri}" class="role-image" alt="Industri">
+                    <img src="{img_industri}" class="role-image" alt="Industri">
                 </div>
                 <h3>Perusahaan / Industri</h3>
                 <ul>
@@ -355,7 +338,7 @@ def halaman_beranda():
             </div>
             <div class="role-box">
                 <div class="role-image-wrapper">
-                    <img src="data:image/jpeg;base64,{img_masyarakat}" class="role-image" alt="Publik">
+                    <img src="{img_masyarakat}" class="role-image" alt="Publik">
                 </div>
                 <h3>Masyarakat Umum</h3>
                 <ul>
@@ -449,79 +432,6 @@ def halaman_beranda():
 
     show_footer()
 
-def render_label_badges(label_list):
-    color_map = {
-        'Air Bersih & Sanitasi': '#a2d5f2',
-        'Banjir': '#f8d7da',
-        'Energi': '#fce38a',
-        'Industri': '#cce5ff',
-        'Infrastruktur': '#e2f0cb',
-        'Kebakaran': '#ffcccc',
-        'Kemacetan': '#f6c6ea',
-        'Kemiskinan & Sosial': '#ffd3b6',
-        'Kesehatan': '#d1ecf1',
-        'Keselamatan': '#fff3cd',
-        'Ketahanan Pangan': '#c3f584',
-        'Limbah': '#ffddcc',
-        'Lingkungan': '#b8f2e6',
-        'Otomasi & Kontrol': '#f0e68c',
-        'Pencemaran Air': '#add8e6',
-        'Pendidikan': '#e2e3e5',
-        'Perkotaan / Permukiman': '#b5ead7',
-        'Perubahan Iklim': '#f4cccc',
-        'Polusi Udara': '#ffe4e1',
-        'Sampah': '#e0bbe4',
-        'Transportasi': '#dadada',
-        'Transportasi Laut / Maritim': '#d0f0c0',
-        'Umum': '#dddddd'
-    }
-
-    badge_html = ""
-    for label in label_list:
-        warna = color_map.get(label.strip(), "#e2e3e5")
-        badge_html += f"""
-        <span style="
-            background-color: {warna};
-            color: #111;
-            padding: 6px 12px;
-            margin: 4px 6px 4px 0;
-            border-radius: 14px;
-            font-size: 13px;
-            display: inline-block;
-            white-space: nowrap;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.08);
-        ">{label}</span>"""
-    return f'<div style="margin-top: 8px; display: flex; flex-wrap: wrap;">{badge_html}</div>'
-
-
-def label_with_emoji(label):
-    emoji_map = {
-        "Air Bersih & Sanitasi": "🚿",
-        "Banjir": "🌊",
-        "Energi": "⚡",
-        "Industri": "🏭",
-        "Infrastruktur": "🛣️",
-        "Kebakaran": "🔥",
-        "Kemacetan": "🚗",
-        "Kemiskinan & Sosial": "🤝",
-        "Kesehatan": "🩺",
-        "Keselamatan": "🛡️",
-        "Ketahanan Pangan": "🌾",
-        "Limbah": "🧴",
-        "Lingkungan": "🌱",
-        "Otomasi & Kontrol": "🤖",
-        "Pencemaran Air": "🚱",
-        "Pendidikan": "📚",
-        "Perkotaan / Permukiman": "🏘️",
-        "Perubahan Iklim": "🌡️",
-        "Polusi Udara": "🌫️",
-        "Sampah": "🗑️",
-        "Transportasi": "🚌",
-        "Transportasi Laut / Maritim": "🚢",
-        "Umum": "📌"
-    }
-    return f"{emoji_map.get(label, '')} {label}"
-
 #Fungsi Inovasi
 def halaman_research():
     col1, col2 = st.columns([6, 1])
@@ -598,228 +508,48 @@ def halaman_research():
 
     view_option = st.session_state.view_option
 
-    # Ambil semua label unik (handle format string list)
-    all_labels = set()
-    for lbl in data["label"]:
-        try:
-            labels = eval(lbl) if isinstance(lbl, str) else lbl
-            all_labels.update(labels)
-        except:
-            continue
+    # Daftar label unik dihitung sekali per versi korpus (lihat risda/agregat.py)
+    all_labels = agregat.ambil(res).label
 
     # Filter Label & Urutan Tahun
     col1, col2 = st.columns([3, 2])
     with col1:
-        selected_labels = st.multiselect("🔍 Filter berdasarkan Label", sorted(all_labels))
+        selected_labels = st.multiselect("🔍 Filter berdasarkan Label", all_labels)
     with col2:
-        sort_order = st.selectbox("Urutkan Tahun", ["Terbaru", "Terlama"])
+        sort_order = st.selectbox("Urutkan", ["Terbaru", "Terlama", "Relevansi"])
 
     search = st.text_input("Cari berdasarkan judul, label, atau sinopsis")
 
 
-    filtered = data.copy()
-
-    if search:
-        # === 1. Cosine similarity
-        hasil_rekom = rekomendasi(search)
-
-        # === 2. Cek sinopsis mengandung minimal satu kata dari input
-        keywords = search.lower().split()  # pisahkan kata-kata
-        sinopsis_match = data[data["sinopsis"].str.lower().apply(lambda text: any(k in text for k in keywords))]
-
-        # === 3. Gabungkan hasil tanpa duplikat
-        filtered = pd.concat([hasil_rekom, sinopsis_match]).drop_duplicates(subset=["judul", "sinopsis"])
-
-    # Tetap filter label
-    if selected_labels:
-        def match_labels(label_raw):
-            try:
-                label_list = eval(label_raw) if isinstance(label_raw, str) else label_raw
-                return any(lbl in label_list for lbl in selected_labels)
-            except:
-                return False
-        filtered = filtered[filtered["label"].apply(match_labels)]
-
-    # Urutkan berdasarkan tahun
-    filtered = filtered.sort_values("tahun", ascending=(sort_order == "Terlama"))
-
-    # # Urutkan tahun
-    # filtered = filtered.sort_values("tahun", ascending=(sort_order == "Terlama"))
+    # Skor gabungan BM25 + kemiripan, lalu filter label (lihat retrieval.cari_research).
+    # Hanya id baris; tanpa filter, ids=None = semua baris hidup
+    ids = retrieval.cari_research(res, search, selected_labels) if search or selected_labels else None
 
-    # Paginasi
+    # Paginasi di atas id: urutan tahun sudah dihitung per versi korpus dan urutan relevansi
+    # ikut dari hasil pencarian, jadi hanya baris halaman ini yang diambil dari data
+    # (lihat retrieval.halaman_ids). Relevansi tanpa teks pencarian = Terbaru.
     per_page = 15
-    total_data = len(filtered)
-    total_pages = (total_data - 1) // per_page + 1
 
     if "page_research" not in st.session_state:
         st.session_state.page_research = 1
 
     page = st.session_state.page_research
-    start = (page - 1) * per_page
-    end = min(start + per_page, total_data)
-
-    if view_option == "Card View":
-        num_cols = 3
-        rows = [filtered.iloc[i:i+num_cols] for i in range(start, end, num_cols)]
-
-        for row_chunk in rows:
-            cols = st.columns(num_cols)
-            for idx, (_, row) in enumerate(row_chunk.iterrows()):
-                with cols[idx]:
-                    try:
-                        label_list = eval(row["label"]) if isinstance(row["label"], str) else row["label"]
-                    except:
-                        label_list = [row["label"]]
-
-                    # Handle label dan sinopsis aman
-                    label_badges = ", ".join([label_with_emoji(lbl) for lbl in label_list])
-                    sinopsis_text = html.escape(row.get('sinopsis', '-'))
-                    judul = html.escape(row.get('judul', ''))
-                    afiliasi = html.escape(row.get('afiliasi', ''))
-                    daerah = html.escape(row.get('daerah', ''))
-
-                    # Format nama peneliti
-                    nama_peneliti = html.escape(row.get("nama", ""))
-                    peneliti_list = [p.strip() for p in nama_peneliti.split(";") if p.strip()]
-                    peneliti_display = "; ".join(peneliti_list[:2]) + (", dkk." if len(peneliti_list) > 2 else "")
-
-                    # Kondisi link
-                    html_link_section = ""
-                    if pd.notna(row.get("link")) and str(row["link"]).startswith("http"):
-                        html_link_section = f"""
-                            <div style="margin-top: 8px;">
-                                <a href="{row['link']}" target="_blank" style="
-                                    font-size: 13px;
-                                    color: #2563eb;
-                                    text-decoration: none;
-                                ">🔗 Link Penelitian</a>
-                            </div>
-                        """
-
-                    # Render kartu
-                    # Escape sinopsis text
-                    sinopsis_text = html.escape(row.get('sinopsis', '-'))
-
-                    # Kartu HTML
-                    card_html = f"""
-                    <div style="
-                        background-color: #fdfdfd;
-                        padding: 20px;
-                        border-radius: 12px;
-                        box-shadow: 0 1px 6px rgba(0,0,0,0.08);
-                        display: flex;
-                        flex-direction: column;
-                        justify-content: space-between;
-                        min-height: 480px;
-                        margin-bottom: 16px;
-                    ">
-                        <div>
-                            <h4 style="margin-bottom: 0.2rem;">{row['judul']}</h4>
-                            <div style="font-size: 13px; color: #555;">
-                                <b>{row['tahun']}</b> &bull; {label_badges}
-                            </div>
-                            <p style="font-size: 14px; margin-top: 0.8rem;">
-                                <b>Peneliti:</b> {peneliti_display}<br>
-                                <b>Afiliasi:</b> {row['afiliasi']}<br>
-                                <b>Daerah:</b> {row['daerah']}
-                            </p>
-                            <div style="
-                                margin-top: 14px;
-                                font-size: 13px;
-                                color: #374151;
-                            ">
-                                <b>📝 Sinopsis:</b>
-                                <div style="
-                                    max-height: 100px;
-                                    overflow-y: auto;
-                                    padding: 10px;
-                                    background-color: #ffffff;
-                                    border: 1px solid #e5e7eb;
-                                    border-radius: 8px;
-                                    margin-top: 6px;
-                                ">
-                                    {sinopsis_text}
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    """
-
-                    # Tampilkan kartu
-                    st.markdown(card_html, unsafe_allow_html=True)
-
-                    # Tampilkan tombol link jika ada
-                    if pd.notna(row.get("link")) and str(row["link"]).startswith("http"):
-                        st.markdown(f"""
-                            <div style="margin-top: -12px; margin-bottom: 12px;">
-                                <a href="{row['link']}" target="_blank" style="
-                                    font-size: 13px;
-                                    color: #2563eb;
-                                    text-decoration: none;
-                                ">🔗 Link Penelitian</a>
-                            </div>
-                        """, unsafe_allow_html=True)
-
-    else:
-        for _, row in filtered.iloc[start:end].iterrows():
-            try:
-                label_list = eval(row["label"]) if isinstance(row["label"], str) else row["label"]
-            except:
-                label_list = [row["label"]]
-
-            # Bagian Header: Tahun + Label
-            st.markdown(f"""
-            <div style="display: flex; justify-content: space-between; align-items: center;
-                        background-color: #f1f5f9; padding: 10px 16px; border-radius: 10px 10px 0 0;
-                        border: 1px solid #e5e7eb; border-bottom: none;">
-                <div style="font-weight: 600; font-size: 15px;"> {row['tahun']}</div>
-                <div>{render_label_badges(label_list)}</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Judul + Info Peneliti
-            st.markdown(f"""
-            <div style="border: 1px solid #e5e7eb; border-top: none; border-radius: 0 0 10px 10px;
-                        background-color: #ffffff; padding: 16px 20px; margin-bottom: 20px;">
-                <h4 style="margin-top: 0; margin-bottom: 8px; color: #1f2937;">{row['judul']}</h4>
-                <div style="font-size: 14px; color: #374151;">
-                    <b>👤 Nama:</b> {row['nama']}<br>
-                    <b>📧 Email:</b> {row['email']}<br>
-                    <b>🏢 Afiliasi:</b> {row['afiliasi']}<br>
-                    <b>📍 Daerah:</b> {row['daerah']}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Sinopsis
-            with st.expander("📝 Sinopsis"):
-                st.markdown(f"""
-                <div style="background-color: #f9fafb; border: 1px solid #e2e8f0;
-                            border-radius: 8px; padding: 12px; font-size: 14px;
-                            color: #374151; max-height: 150px; overflow-y: auto;">
-                    <b>Sinopsis:</b><br>{row.get('sinopsis', '-')}
-                </div>
-
-                """, unsafe_allow_html=True)
-
-            # Tombol Link jika ada
-            if pd.notna(row['link']) and row['link'].startswith("http"):
-                st.markdown(f"""
-                <a href="{row['link']}" target="_blank" style="
-                    display: inline-block;
-                    margin-top: 10px;
-                    background-color: #1d4ed8;
-                    color: white;
-                    padding: 6px 14px;
-                    font-size: 13px;
-                    border-radius: 8px;
-                    text-decoration: none;">
-                    🔗 Kunjungi Penelitian
-                </a>
-                """, unsafe_allow_html=True)
-
-            # Garis pemisah
-            st.markdown("<hr style='margin: 24px 0;'>", unsafe_allow_html=True)
+    with tracing.tahap("filter_urut"):
+        urut = sort_order.lower() if search or sort_order != "Relevansi" else "terbaru"
+        ids_halaman, total_data = retrieval.halaman_ids(res, ids, page, per_page, urut)
+    total_pages = (total_data - 1) // per_page + 1
+    tracing.catat(aksi="cari" if search or selected_labels else None,
+                  panjang_query=len(search), jumlah_hasil=total_data)
+
+    # Satu payload HTML per halaman; potongan HTML per baris di-cache (lihat risda/render.py)
+    with tracing.tahap("render"):
+        halaman_df = res.baris(ids_halaman)
+        isi = [render.isi_baris(row, res.labels.daftar(i))
+               for i, row in zip(ids_halaman, halaman_df.to_dict("records"))]
+        if view_option == "Card View":
+            st.markdown(render.halaman_kartu(isi), unsafe_allow_html=True)
+        else:
+            st.markdown(render.halaman_daftar(isi), unsafe_allow_html=True)
 
     col1, col2, col3 = st.columns([1, 2, 1])
     with col1:
@@ -843,33 +573,6 @@ def halaman_research():
 
     show_footer()
 
-# Lokasi file CSV
-USER_DB_PATH = "users.csv"
-# Fungsi untuk load data user
-def load_users():
-    if os.path.exists(USER_DB_PATH):
-        return pd.read_csv(USER_DB_PATH)
-    else:
-        return pd.DataFrame(columns=["username", "password", "name", "email", "phone", "institution"])
-
-# Fungsi untuk menyimpan user baru
-def save_user(username, password, name, email, phone, institution):
-    users = load_users()
-    if username in users["username"].values:
-        return False  # Username sudah ada
-
-    new_user = pd.DataFrame([{
-        "username": username,
-        "password": password,
-        "name": name,
-        "email": email,
-        "phone": phone,
-        "institution": institution
-    }])
-    updated_users = pd.concat([users, new_user], ignore_index=True)
-    updated_users.to_csv(USER_DB_PATH, index=False)
-    return True
-
 # === Halaman input pemerintah ===
 def halaman_pemerintah():
     if not st.session_state.get("is_logged_in", False):
@@ -958,14 +661,11 @@ def halaman_pemerintah():
                     submitted = st.form_submit_button("Masuk")
 
             if submitted:
-                users = load_users()
-                user = users[(users["username"] == username) & (users["password"] == password)]
-                if not user.empty:
+                user_info = pengguna.verifikasi(username, password)
+                if user_info is not None:
                     st.session_state.is_logged_in = True
                     st.session_state.current_user = username
                     st.success(f"✅ Berhasil masuk sebagai **{username}**!")
-                    users = load_users()
-                    user_info = users[users["username"] == username].iloc[0]
                     st.session_state.nama_instansi = user_info["institution"]
                     st.rerun()
                 else:
@@ -1028,7 +728,7 @@ def halaman_pemerintah():
 
             if submitted:
                 if all([name, email, phone, institution, new_username, new_password]):
-                    if save_user(new_username, new_password, name, email, phone, institution):
+                    if pengguna.daftar(new_username, new_password, name, email, phone, institution):
                         st.success("✅ Berhasil daftar! Silakan login.")
                     else:
                         st.error("❌ Username sudah digunakan. Silakan pilih yang lain.")
@@ -1098,33 +798,31 @@ def halaman_pemerintah():
     st.markdown("---")
 
     # === LOAD DATA PERMASALAHAN & REKOMENDASI TERSIMPAN ===
-    if os.path.exists("permasalahan.csv"):
-        df_problems = pd.read_csv("permasalahan.csv")
-        if st.session_state["current_user"] != "admin":
-            if "username" in df_problems.columns:
-                df_problems = df_problems[df_problems["username"] == st.session_state["current_user"]]
-            else:
-                df_problems = df_problems[df_problems["Instansi"] == st.session_state.nama_instansi]
+    if st.session_state["current_user"] != "admin":
+        total_permasalahan = storage.jumlah_permasalahan(st.session_state["current_user"], st.session_state.nama_instansi)
     else:
-        df_problems = pd.DataFrame(columns=["Waktu", "Nama", "Instansi", "Judul", "Deskripsi", "username"])
+        total_permasalahan = storage.jumlah_permasalahan()
 
     # ✅ Tambahkan ini:
     df_rekom = pd.DataFrame(st.session_state.get("saved_rekomendasi", []))
 
     # === DASHBOARD RINGKASAN ===
     col1, col2, col3 = st.columns(3)
-    col1.metric("📌 Total Permasalahan", len(df_problems))
+    col1.metric("📌 Total Permasalahan", total_permasalahan)
     col2.metric("🧠 Klasifikasi Unik", df_rekom["label"].nunique() if not df_rekom.empty else 0)
     col3.metric("🔍 Total Rekomendasi", len(df_rekom))
 
     # === CHART ===
     if not df_rekom.empty:
+        # Plotly hanya dimuat saat dashboard ini benar-benar menggambar grafik
+        import plotly.express as px
+
         col_chart1, col_chart2 = st.columns(2)
 
         with col_chart1:
             try:
-                label_flat = df_rekom["label"].dropna().apply(lambda x: eval(x) if isinstance(x, str) else x)
-                label_counts = pd.Series([lbl for sublist in label_flat for lbl in sublist]).value_counts().reset_index()
+                jumlah_label = labels.hitung_label(df_rekom["label"].dropna())
+                label_counts = pd.Series(jumlah_label).sort_values(ascending=False).reset_index()
                 label_counts.columns = ["Klasifikasi", "Jumlah"]
                 fig = px.bar(label_counts, x="Klasifikasi", y="Jumlah", color="Klasifikasi", height=350)
                 st.plotly_chart(fig, use_container_width=True)
@@ -1213,25 +911,18 @@ def halaman_pemerintah():
 
         col_left, col_center, col_right = st.columns([1, 6, 1])
         with col_center:
-            if os.path.exists("permasalahan.csv"):
-                df = pd.read_csv("permasalahan.csv")
-                if "username" in df.columns:
-                    df = df[df["username"] == st.session_state["current_user"]]
-                else:
-                    df = df[df["Instansi"] == st.session_state["nama_instansi"]]
+            df = storage.permasalahan_df(st.session_state["current_user"], st.session_state["nama_instansi"])
 
-                if df.empty:
-                    st.info("Belum ada permasalahan yang pernah diajukan.")
-                else:
-                    st.dataframe(df[["Waktu", "Nama", "Instansi", "Judul", "Deskripsi"]])
-                    csv = df.to_csv(index=False).encode("utf-8")
-                    st.download_button("⬇️ Download CSV", data=csv, file_name="permasalahan_saya.csv", mime="text/csv")
-
-                    if st.button("❌ Tutup"):
-                        st.session_state.show_permasalahan = False
-                        st.rerun()
+            if df.empty:
+                st.info("Belum ada permasalahan yang pernah diajukan.")
             else:
-                st.info("Belum ada data permasalahan yang tersimpan.")
+                st.dataframe(df[["Waktu", "Nama", "Instansi", "Judul", "Deskripsi"]])
+                csv = df.to_csv(index=False).encode("utf-8")
+                st.download_button("⬇️ Download CSV", data=csv, file_name="permasalahan_saya.csv", mime="text/csv")
+
+                if st.button("❌ Tutup"):
+                    st.session_state.show_permasalahan = False
+                    st.rerun()
 
 
     if st.session_state.get("tampilkan_rekom", False):
@@ -1242,18 +933,22 @@ def halaman_pemerintah():
         st.markdown("---")
         st.subheader("🔎 Rekomendasi Inovasi")
 
-        hasil = rekomendasi(input_text, top_n=50)  # ambil lebih banyak dulu
-        hasil = hasil.drop_duplicates(subset=["judul", "sinopsis", "link"]).head(20).reset_index(drop=True)
+        # Korpus sudah bebas duplikat sejak ditulis (risda/dedup.py): cukup minta tepat 20.
+        # Baris tanpa kata yang sama (skor 0) tidak relevan dan tidak perlu ikut diperingkat
+        ids, skor = retrieval.rekomendasi_ids(res, input_text, top_n=20, min_skor=0)
+        hasil = retrieval.ambil_baris(res, ids, skor).reset_index(drop=True)
         st.session_state.rekomendasi = hasil
+        # Label per baris dari matriks label yang sudah terurai (seperti halaman research), sekali per rekomendasi
+        st.session_state.rekomendasi_label = [res.labels.daftar(int(i)) for i in ids]
+        tracing.catat(aksi="rekomendasi", panjang_query=len(input_text), jumlah_hasil=len(hasil))
 
         # Simpan histori
         waktu = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         user = st.session_state["current_user"]
         nama_instansi = st.session_state.get("nama_instansi", "")
 
-        users = load_users()
-        user_info = users[users["username"] == user].iloc[0]
-        nama_lengkap = user_info["name"]
+        user_info = pengguna.cari(user)
+        nama_lengkap = user_info["name"] if user_info else user
 
         data_baru = {
             "Waktu": waktu,
@@ -1263,14 +958,7 @@ def halaman_pemerintah():
             "Deskripsi": deskripsi
         }
 
-        columns = ["Waktu", "Nama", "Instansi", "Judul", "Deskripsi"]
-        if os.path.exists("permasalahan.csv"):
-            df_lama = pd.read_csv("permasalahan.csv")
-        else:
-            df_lama = pd.DataFrame(columns=columns)
-
-        df_baru = pd.concat([df_lama, pd.DataFrame([data_baru])], ignore_index=True)
-        df_baru.to_csv("permasalahan.csv", index=False)
+        storage.tambah_permasalahan(data_baru, username=user)
 
         st.success("✅ Permasalahan berhasil disimpan!")
 
@@ -1285,7 +973,7 @@ def halaman_pemerintah():
     # === TAMPILKAN INOVASI ACAK JIKA BELUM ADA HASIL ===
     if hasil.empty and not st.session_state.get("show_saved", False) and not st.session_state.get("show_permasalahan", False):
 
-        random_samples = data.sample(n=6).reset_index(drop=True)
+        random_samples = res.baris(pd.Series(res.live_ids()).sample(n=6).to_numpy()).reset_index(drop=True)
 
         st.markdown("""
             <style>
@@ -1328,22 +1016,11 @@ def halaman_pemerintah():
                     }
                 }
             </style>
-
-            <div class="grid-container">
         """, unsafe_allow_html=True)
 
-        for _, row in random_samples.iterrows():
-            st.markdown(f"""
-                <div class="inovasi-card">
-                    <h4>{row['judul']}</h4>
-                    <p><b>{row['tahun']}</b> — {row['nama']}</p>
-                    <p>{row['afiliasi']}</p>
-                    <p><i>{row['daerah']}</i></p>
-                    <p class="sinopsis">{row.get('sinopsis', '-')[:150]}...</p>
-                </div>
-            """, unsafe_allow_html=True)
-
-        st.markdown("</div>", unsafe_allow_html=True)
+        with tracing.tahap("render"):
+            isi = [render.isi_baris(row, []) for row in random_samples.to_dict("records")]
+            st.markdown(render.grid_ringkas(isi), unsafe_allow_html=True)
 
     # Navigasi Halaman
     if "page_research" not in st.session_state:
@@ -1355,65 +1032,10 @@ def halaman_pemerintah():
     start = (page - 1) * per_page
     end = start + per_page
 
-    for _, row in hasil.iloc[start:end].iterrows():
-        # Ubah label ke list
-        try:
-            label_list = eval(row["label"]) if isinstance(row["label"], str) else row["label"]
-        except:
-            label_list = [row["label"]]
-
-        # Header (Tahun + Label)
-        st.markdown(f"""
-        <div style="display: flex; justify-content: space-between; align-items: center;
-                    background-color: #f1f5f9; padding: 10px 16px; border-radius: 10px 10px 0 0;
-                    border: 1px solid #e5e7eb; border-bottom: none;">
-            <div style="font-weight: 600; font-size: 15px;">{row['tahun']}</div>
-            <div>{render_label_badges(label_list)}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Judul dan detail peneliti
-        st.markdown(f"""
-        <div style="border: 1px solid #e5e7eb; border-top: none; border-radius: 0 0 10px 10px;
-                    background-color: #ffffff; padding: 16px 20px; margin-bottom: 20px;">
-            <h4 style="margin-top: 0; margin-bottom: 8px; color: #1f2937;">{row['judul']}</h4>
-            <div style="font-size: 14px; color: #374151;">
-                <b>👤 Nama:</b> {row['nama']}<br>
-                <b>📧 Email:</b> {row['email']}<br>
-                <b>🏢 Afiliasi:</b> {row['afiliasi']}<br>
-                <b>📍 Daerah:</b> {row['daerah']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Sinopsis & Ringkasan
-        with st.expander("📝 Sinopsis"):
-            st.markdown(f"""
-            <div style="background-color: #f9fafb; border: 1px solid #e2e8f0;
-                        border-radius: 8px; padding: 12px; font-size: 14px;
-                        color: #374151; max-height: 150px; overflow-y: auto;">
-                <b>Sinopsis:</b><br>{row.get('sinopsis', '-')}
-            </div>
-            """, unsafe_allow_html=True)
-
-        # Link penelitian
-        if pd.notna(row['link']) and row['link'].startswith("http"):
-            st.markdown(f"""
-            <a href="{row['link']}" target="_blank" style="
-                display: inline-block;
-                margin-top: 10px;
-                background-color: #1d4ed8;
-                color: white;
-                padding: 6px 14px;
-                font-size: 13px;
-                border-radius: 8px;
-                text-decoration: none;">
-                🔗 Kunjungi Penelitian
-            </a>
-            """, unsafe_allow_html=True)
-
-        # Garis pemisah
-        st.markdown("<hr style='margin: 24px 0;'>", unsafe_allow_html=True)
+    with tracing.tahap("render"):
+        label_rekom = st.session_state.get("rekomendasi_label", [])[start:end]
+        isi = [render.isi_baris(row, lbl) for row, lbl in zip(hasil.iloc[start:end].to_dict("records"), label_rekom)]
+        st.markdown(render.halaman_daftar(isi), unsafe_allow_html=True)
 
 
     # Navigasi halaman
@@ -1456,7 +1078,62 @@ def login_admin():
         else:
             st.error("Username atau password salah.")
 
+# === Panel pekerjaan latar (admin) ===
+# Hanya fragmen ini yang dijalankan ulang tiap 2 detik untuk memperbarui progres
+@st.fragment(run_every=2)
+def panel_pekerjaan():
+    st.markdown("""
+    <h4 style='color: #333333; margin-bottom: 0.2rem;'>⚙️ Pekerjaan Latar</h4>
+    <hr style='border: 0.5px solid #cccccc; margin-top: 0.2rem; margin-bottom: 0.8rem;' />
+    """, unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🔄 Bangun Ulang Indeks", key="job_bangun_indeks", use_container_width=True):
+            pekerjaan.kirim("bangun_indeks")
+    with col2:
+        if st.button("📊 Rekomendasi Batch Semua Permasalahan", key="job_rekomendasi_batch", use_container_width=True):
+            pekerjaan.kirim("rekomendasi_batch")
+
+    df_job = pekerjaan.daftar(10)
+    if df_job.empty:
+        st.caption("Belum ada pekerjaan latar.")
+        return
+
+    aktif = set(df_job.loc[~df_job["status"].isin(pekerjaan.SELESAI), "id"])
+    # Pekerjaan yang dipantau sesi ini baru selesai: muat ulang seluruh halaman agar data ikut baru
+    baru_selesai = st.session_state.get("pekerjaan_aktif", set()) - aktif
+    st.session_state.pekerjaan_aktif = aktif
+
+    for job in df_job.to_dict("records"):
+        judul = f"#{job['id']} {pekerjaan.label(job['jenis'])}"
+        if job["id"] in aktif:
+            progres = float(job["progres"] or 0)
+            st.progress(progres, text=f"{judul}: {job['status']} {progres:.0%} {job['pesan'] or ''}")
+            continue
+        ikon = "✅" if job["status"] == "selesai" else "❌"
+        with st.expander(f"{ikon} {judul}: {job['status']} ({job['selesai'] or '-'})"):
+            info = pekerjaan.ambil(job["id"])
+            if info["galat"]:
+                st.code(info["galat"])
+            elif info["jenis"] == "upload":
+                hasil = info["hasil"]
+                st.write(f"{hasil['tersimpan']} dari {hasil['baris']} baris disimpan, "
+                         f"{hasil['duplikat']} duplikat dilewati. Klasifikasi "
+                         f"{hasil['klasifikasi']['baris_per_detik']:.0f} baris/detik.")
+                if hasil["baris_duplikat"]:
+                    # duplikat_dari: id inovasi yang isinya sama, -1 = baris sebelumnya di CSV yang sama
+                    st.dataframe(pd.DataFrame(hasil["baris_duplikat"]))
+            else:
+                st.json(info["hasil"])
+
+    if baru_selesai:
+        st.rerun()
+
+
 def tambah_inovasi():
+    from risda import classify, index_manager
+
     st.markdown("""
         <style>
             .judul-container {
@@ -1631,23 +1308,24 @@ def tambah_inovasi():
             submit_manual = st.form_submit_button("💾 Simpan Inovasi")
 
         if submit_manual:
-            input_text = f"{judul}. {sinopsis}" if judul and sinopsis else judul or sinopsis
-            label = model.predict([input_text])[0]
-            st.success(f"🔖 Prediksi Klasifikasi: **{label}**")
+            label = classify.klasifikasi(res.model, res.mlb, judul, sinopsis)
+            st.success(f"🔖 Prediksi Klasifikasi: **{', '.join(label)}**")
 
             new_data = {
                 "judul": judul, "sinopsis": sinopsis,
                 "nama": nama, "email": email, "afiliasi": afiliasi,
-                "daerah": daerah, "tahun": tahun, "label": str([label]), "link": link
+                "daerah": daerah, "tahun": tahun, "label": str(label), "link": link
             }
 
             df = pd.DataFrame([new_data])
-            if os.path.exists("fixr.csv"):
-                df.to_csv("fixr.csv", mode="a", index=False, header=False)
+            _, duplikat = index_manager.tambah(df)
+            tracing.catat(aksi="tambah", jumlah_hasil=1 - len(duplikat))
+            if len(duplikat):
+                st.warning(f"⚠️ Inovasi dengan judul dan sinopsis yang sama sudah ada "
+                           f"(id {duplikat['duplikat_dari'].iloc[0]}); data tidak disimpan.")
             else:
-                df.to_csv("fixr.csv", index=False)
-            st.success("✅ Inovasi berhasil ditambahkan!")
-            st.balloons()
+                st.success("✅ Inovasi berhasil ditambahkan!")
+                st.balloons()
 
     elif st.session_state.metode_input == "Upload CSV":
         st.subheader("📁 Upload File CSV")
@@ -1663,16 +1341,15 @@ def tambah_inovasi():
                 if not all(col in df_upload.columns for col in required_cols):
                     st.error(f"❌ Kolom CSV harus mencakup: {', '.join(required_cols)}")
                 else:
-                    df_upload["label"] = df_upload.apply(
-                        lambda row: str([model.predict([f"{row['judul']}. {row['sinopsis']}"])[0]]),
-                        axis=1)
-
-                    if os.path.exists("fixr.csv"):
-                        df_upload.to_csv("fixr.csv", mode="a", index=False, header=False)
-                    else:
-                        df_upload.to_csv("fixr.csv", index=False)
-
-                    st.success("✅ Data dari CSV berhasil ditambahkan ke sistem!")
+                    # Klasifikasi + penyimpanan berjalan di latar; file yang sama tidak dikirim ulang tiap rerun
+                    terkirim = st.session_state.setdefault("upload_terkirim", {})
+                    if uploaded_file.file_id not in terkirim:
+                        berkas = pekerjaan.simpan_berkas(df_upload, "upload")
+                        terkirim[uploaded_file.file_id] = pekerjaan.kirim("upload", berkas=berkas,
+                                                                          nama=uploaded_file.name)
+                        tracing.catat(aksi="upload", jumlah_hasil=len(df_upload))
+                    st.success(f"✅ {len(df_upload)} baris diterima. Klasifikasi dan penyimpanan berjalan di latar "
+                               f"(pekerjaan #{terkirim[uploaded_file.file_id]}), pantau di panel Pekerjaan Latar.")
                     st.dataframe(df_upload)
 
             except Exception as e:
@@ -1685,10 +1362,21 @@ def tambah_inovasi():
     <hr style='border: 1px solid #ccc; margin-top: 0.3rem;' />
     """, unsafe_allow_html=True)
 
+    # Statistik cache query untuk menentukan ukuran cache di produksi
+    stat_cache = query_cache.cache.statistik()
+    st.caption(f"Cache query: {stat_cache['hit']} hit, {stat_cache['miss']} miss "
+               f"(hit rate {stat_cache['hit_rate']:.0%}), {stat_cache['entri']}/{stat_cache['ukuran']} entri")
+    # Cache HTML kartu (risda/render.py), untuk menentukan maxsize-nya
+    st.caption("Cache kartu: " + ", ".join(
+        f"{nama} {info['hits']} hit/{info['misses']} miss ({info['currsize']}/{info['maxsize']})"
+        for nama, info in render.statistik().items()))
+    stat_jejak = tracing.statistik()
+    st.caption(f"Log jejak: {stat_jejak['ditulis']} ditulis, {stat_jejak['dibuang']} dibuang, "
+               f"{stat_jejak['antrean']} antre, {stat_jejak['rotasi']}x dirotasi")
+
+    panel_pekerjaan()
 
 
-    fixr_path = "fixr.csv"
-    trash_path = "fixr_trash.csv"
 
     # --- STATE & TOGGLE ---
     if "show_all_data" not in st.session_state:
@@ -1702,15 +1390,17 @@ def tambah_inovasi():
     st.button(label, on_click=toggle_data_view)
 
     # --- TAMPILKAN DATA + UNDUH ---
-    if st.session_state.show_all_data and os.path.exists(fixr_path):
-        df_all = pd.read_csv(fixr_path)
-        st.dataframe(df_all, use_container_width=True)
+    # Dari sumber daya termuat (delta admin sudah diterapkan, lihat risda/index_manager.py),
+    # bukan membaca ulang fixr.csv + jurnal di setiap rerun
+    df_inovasi = (res.baris(res.live_ids()).drop(columns=["gabungan", "hash"], errors="ignore")
+                  .set_index("id", drop=False))
+    if st.session_state.show_all_data and len(df_inovasi):
+        st.dataframe(df_inovasi.reset_index(drop=True), use_container_width=True)
 
-    if os.path.exists(fixr_path):
-        df_inovasi = pd.read_csv(fixr_path)
+    if len(df_inovasi):
 
         # Unduh seluruh data
-        st.download_button("⬇️ Unduh Semua Data Inovasi", data=df_inovasi.to_csv(index=False).encode("utf-8"),
+        st.download_button("⬇️ Unduh Semua Data Inovasi", data=df_inovasi.drop(columns="id").to_csv(index=False).encode("utf-8"),
                         file_name="data_inovasi.csv", mime="text/csv")
 
         st.markdown("""
@@ -1718,6 +1408,7 @@ def tambah_inovasi():
         <hr style='border: 0.5px solid #cccccc; margin-top: 0.2rem; margin-bottom: 0.8rem;' />
         """, unsafe_allow_html=True)
 
+        # Pilihan berdasarkan id baris yang stabil, bukan nomor baris di berkas
         selected_index = st.selectbox("Pilih baris untuk diedit atau dihapus:", df_inovasi.index)
         selected_data = df_inovasi.loc[selected_index]
 
@@ -1738,9 +1429,8 @@ def tambah_inovasi():
             delete_row = st.form_submit_button("🗑️ Hapus Data Ini")
 
         if submit_edit:
-            input_text = f"{judul}. {sinopsis}"
-            label_baru = model.predict([input_text])[0]
-            df_inovasi.loc[selected_index] = {
+            label_baru = classify.klasifikasi(res.model, res.mlb, judul, sinopsis)
+            lain = index_manager.ubah(selected_index, {
                 "judul": judul,
                 "sinopsis": sinopsis,
                 "nama": nama,
@@ -1748,24 +1438,22 @@ def tambah_inovasi():
                 "afiliasi": afiliasi,
                 "daerah": daerah,
                 "tahun": tahun,
-                "label": str([label_baru]),
+                "label": str(label_baru),
                 "link": link
-            }
-            df_inovasi.to_csv(fixr_path, index=False)
-            st.success("✅ Data berhasil diperbarui!")
-            st.rerun()
+            })
+            tracing.catat(aksi="ubah")
+            if lain is not None:
+                st.warning(f"⚠️ Judul dan sinopsis ini sudah dipakai inovasi id {lain}; perubahan tidak disimpan.")
+            else:
+                st.success("✅ Data berhasil diperbarui!")
+                st.rerun()
 
         if delete_row:
             deleted_row = df_inovasi.loc[[selected_index]]
-            if os.path.exists(trash_path):
-                df_trash = pd.read_csv(trash_path)
-                df_trash = pd.concat([df_trash, deleted_row], ignore_index=True)
-            else:
-                df_trash = deleted_row
-            df_trash.to_csv(trash_path, index=False)
+            storage.buang_ke_trash(deleted_row)
 
-            df_inovasi = df_inovasi.drop(index=selected_index).reset_index(drop=True)
-            df_inovasi.to_csv(fixr_path, index=False)
+            index_manager.hapus(selected_index)
+            tracing.catat(aksi="hapus")
             st.success("🗑️ Data berhasil dihapus dan disimpan di tempat sampah.")
             st.rerun()
     else:
@@ -1776,26 +1464,24 @@ def tambah_inovasi():
     <h4 style='color: #333333; margin-bottom: 0.2rem;'>♻️ Pulihkan Data</h4>
     <hr style='border: 0.5px solid #cccccc; margin-top: 0.2rem; margin-bottom: 0.8rem;' />
     """, unsafe_allow_html=True)
-    if os.path.exists(trash_path):
-        df_trash = pd.read_csv(trash_path)
-        if not df_trash.empty:
-            idx_to_restore = st.selectbox("Pilih baris yang ingin dipulihkan:", df_trash.index, key="restore_select")
-            st.write(df_trash.loc[idx_to_restore])
-
-            if st.button("♻️ Pulihkan Data", key="restore_button"):
-                df_restore = df_trash.loc[[idx_to_restore]]
-                df_trash = df_trash.drop(index=idx_to_restore).reset_index(drop=True)
-
-                df_existing = pd.read_csv(fixr_path) if os.path.exists(fixr_path) else pd.DataFrame()
-                df_combined = pd.concat([df_existing, df_restore], ignore_index=True)
-                df_combined.to_csv(fixr_path, index=False)
-                df_trash.to_csv(trash_path, index=False)
+    df_trash = storage.trash_df()
+    if not df_trash.empty:
+        idx_to_restore = st.selectbox("Pilih baris yang ingin dipulihkan:", df_trash.index, key="restore_select")
+        st.write(df_trash.loc[idx_to_restore])
+
+        if st.button("♻️ Pulihkan Data", key="restore_button"):
+            # Ditulis ke korpus dulu; baris baru dikeluarkan dari tempat sampah bila bukan duplikat
+            _, duplikat = index_manager.tambah(df_trash.loc[[idx_to_restore]])
+            tracing.catat(aksi="pulihkan", jumlah_hasil=1 - len(duplikat))
+            if len(duplikat):
+                st.warning(f"⚠️ Inovasi dengan judul dan sinopsis yang sama sudah ada "
+                           f"(id {duplikat['duplikat_dari'].iloc[0]}); data tetap di tempat sampah.")
+            else:
+                storage.pulihkan_dari_trash(idx_to_restore)
                 st.success("✅ Data berhasil dipulihkan ke database inovasi.")
                 st.rerun()
-        else:
-            st.info("Tempat sampah kosong.")
     else:
-        st.info("Belum ada data yang dihapus.")
+        st.info("Tempat sampah kosong.")
 
     # Tombol Kembali
     if st.button("🔙 Daftar Inovasi"):
@@ -1826,26 +1512,22 @@ def tambah_inovasi():
     if st.session_state.show_data_kerjasama:
         st.markdown("<br>", unsafe_allow_html=True)
 
-        file_path = "form_kerjasama.csv"
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-            if df.empty:
-                st.info("Belum ada permintaan kerja sama.")
-            else:
-                st.markdown("""
-                <div style='background-color: #f8fafc; padding: 1rem; border-radius: 12px; box-shadow: 0 4px 10px rgba(0,0,0,0.05);'>
-                """, unsafe_allow_html=True)
+        df = storage.kerjasama_df()
+        if df.empty:
+            st.info("Belum ada permintaan kerja sama.")
+        else:
+            st.markdown("""
+            <div style='background-color: #f8fafc; padding: 1rem; border-radius: 12px; box-shadow: 0 4px 10px rgba(0,0,0,0.05);'>
+            """, unsafe_allow_html=True)
 
-                st.dataframe(df, use_container_width=True)
+            st.dataframe(df, use_container_width=True)
 
-                csv = df.to_csv(index=False).encode("utf-8")
-                st.download_button("⬇️ Unduh Data Kerja Sama", data=csv,
-                                   file_name="permintaan_kerjasama.csv", mime="text/csv",
-                                   use_container_width=True)
+            csv = df.to_csv(index=False).encode("utf-8")
+            st.download_button("⬇️ Unduh Data Kerja Sama", data=csv,
+                               file_name="permintaan_kerjasama.csv", mime="text/csv",
+                               use_container_width=True)
 
-                st.markdown("</div>", unsafe_allow_html=True)
-        else:
-            st.info("Belum ada file permintaan kerja sama.")
+            st.markdown("</div>", unsafe_allow_html=True)
 
 def tampilkan_bantuan():
     with st.expander("❓ Bantuan"):
@@ -1884,7 +1566,7 @@ def tampilkan_form_kerjasama():
             kirim = st.form_submit_button("📩 Kirim")
 
             if kirim:
-                # Simpan ke CSV
+                # Simpan ke database
                 data_kerjasama = {
                     "nama": nama,
                     "instansi": instansi,
@@ -1893,14 +1575,7 @@ def tampilkan_form_kerjasama():
                     "tanggal": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
                 }
 
-                df_kerjasama = pd.DataFrame([data_kerjasama])
-                file_path = "form_kerjasama.csv"
-
-                if os.path.exists(file_path):
-                    existing = pd.read_csv(file_path)
-                    df_kerjasama = pd.concat([existing, df_kerjasama], ignore_index=True)
-
-                df_kerjasama.to_csv(file_path, index=False)
+                storage.tambah_kerjasama(data_kerjasama)
                 st.success("Terima kasih! Admin akan menghubungi Anda maksimal dalam H+2 hari kerja.")
 
                 st.session_state.show_form_kerjasama = False
@@ -1908,16 +1583,18 @@ def tampilkan_form_kerjasama():
 
 
 # === Navigasi antar halaman ===
-if st.session_state.page == "beranda":
-    halaman_beranda()
-elif st.session_state.page == "research":
-    halaman_research()
-elif st.session_state.page == "rekomendasi":
-    halaman_pemerintah()
-elif st.session_state.page == "login":
-    login_admin()
-elif st.session_state.page == "tambah_inovasi":
-    tambah_inovasi()
+# Satu baris jejak per rerun: halaman, aksi, jumlah hasil, cache & waktu per tahap (lihat risda/tracing.py)
+with tracing.jejak(st.session_state.page, awal=jejak_awal):
+    if st.session_state.page == "beranda":
+        halaman_beranda()
+    elif st.session_state.page == "research":
+        halaman_research()
+    elif st.session_state.page == "rekomendasi":
+        halaman_pemerintah()
+    elif st.session_state.page == "login":
+        login_admin()
+    elif st.session_state.page == "tambah_inovasi":
+        tambah_inovasi()
 
 # === Sidebar navigasi ===
 with st.sidebar:
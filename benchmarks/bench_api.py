@@ -0,0 +1,88 @@
+"""Benchmark throughput dan latensi HTTP API (risda/api.py) terhadap targetnya.
+
+Membuat korpus sintetis di folder sementara, menjalankan server di proses ini
+lalu menembakkan permintaan /rekomendasi dari beberapa thread klien. Jalankan
+dari root repo:
+
+    python benchmarks/bench_api.py --rows 100000 --clients 4 --requests 400
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from korpus_sintetis import buat_korpus, query_sintetis  # noqa: E402
+from risda import api, resources  # noqa: E402
+from risda.query_cache import cache  # noqa: E402
+
+BERKAS_MODEL = [resources.VECTORIZER_PATH, resources.MODEL_PATH, resources.MLB_PATH]
+
+
+def tembak(url, queries, latensi):
+    for q in queries:
+        body = json.dumps({"q": q, "k": 20}).encode()
+        req = urllib.request.Request(url, body, {"Content-Type": "application/json"})
+        mulai = time.perf_counter()
+        with urllib.request.urlopen(req) as r:
+            r.read()
+        latensi.append(time.perf_counter() - mulai)
+
+
+def jalankan(url, queries, clients):
+    latensi = []
+    bagian = [queries[i::clients] for i in range(clients)]
+    threads = [threading.Thread(target=tembak, args=(url, b, latensi)) for b in bagian]
+    mulai = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    detik = time.perf_counter() - mulai
+    ms = np.array(latensi) * 1000
+    return len(queries) / detik, np.percentile(ms, 50), np.percentile(ms, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=400)
+    args = parser.parse_args()
+
+    root = os.getcwd()
+    tmp = tempfile.mkdtemp(prefix="risda-api-")
+    try:
+        for f in BERKAS_MODEL:
+            shutil.copy(os.path.join(root, f), tmp)
+        os.chdir(tmp)
+        buat_korpus(args.rows).to_csv(resources.CORPUS_PATH, index=False)
+        resources.get_resources()
+
+        server = api.buat_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://{api.HOST}:{server.server_port}/rekomendasi"
+
+        unik = [f"{q} {i}" for i, q in enumerate(query_sintetis(args.requests))]
+        print(f"{'skenario':<14} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        for nama, queries in [("tanpa cache", unik), ("query ulang", [unik[0]] * args.requests)]:
+            rps, p50, p95 = jalankan(url, queries, args.clients)
+            print(f"{nama:<14} {rps:>8.1f} {p50:>9.2f} {p95:>9.2f}")
+        print("cache:", cache.statistik())
+        server.shutdown()
+    finally:
+        os.chdir(root)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark rekomendasi batch (risda/batch.py) vs satu query per permasalahan.
+
+Korpus dan permasalahan sintetis; sebagian permasalahan juga dihitung lewat
+``retrieval.rekomendasi_sparse`` (jalur halaman pemerintah) dan dicek
+menghasilkan id dan skor yang sama. Jalankan dari root repo:
+
+    python benchmarks/bench_batch.py --rows 100000 --permasalahan 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from korpus_sintetis import buat_korpus, query_sintetis  # noqa: E402
+from risda import batch, resources, retrieval  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--permasalahan", type=int, default=5000)
+    parser.add_argument("--k", type=int, default=batch.K)
+    parser.add_argument("--cek", type=int, default=200, help="permasalahan yang dibandingkan per query")
+    args = parser.parse_args()
+
+    vectorizer = joblib.load(resources.VECTORIZER_PATH)
+    data = resources.siapkan_korpus(buat_korpus(args.rows))
+    res = resources.Resources(data, vectorizer, None, vectorizer.transform(data["gabungan"]), 0)
+    teks = query_sintetis(args.permasalahan, seed=3)
+
+    mulai = time.perf_counter()
+    ids, skor = batch.rekomendasi_batch(res, teks, args.k)
+    detik_batch = time.perf_counter() - mulai
+
+    n_cek = min(args.cek, len(teks))
+    mulai = time.perf_counter()
+    for i in range(n_cek):
+        acuan_ids, acuan_skor = retrieval.rekomendasi_sparse(res, teks[i], args.k, min_skor=0)
+        n = len(acuan_ids)
+        assert np.array_equal(ids[i, :n], acuan_ids) and (ids[i, n:] == -1).all(), f"id berbeda: {teks[i]}"
+        assert np.allclose(skor[i, :n], acuan_skor), f"skor berbeda: {teks[i]}"
+    per_query = (time.perf_counter() - mulai) / max(n_cek, 1)
+
+    print(f"korpus {args.rows} baris, {len(teks)} permasalahan, top-{args.k}")
+    print(f"  batch      {detik_batch:8.2f} detik ({len(teks) / detik_batch:8.0f} permasalahan/detik)")
+    print(f"  per query  {per_query * len(teks):8.2f} detik ({1 / per_query:8.0f} permasalahan/detik, "
+          f"diperkirakan dari {n_cek})")
+    print(f"  {n_cek} permasalahan pertama identik dengan jalur per query")
+
+
+if __name__ == "__main__":
+    main()
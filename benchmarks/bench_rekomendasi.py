@@ -0,0 +1,74 @@
+"""Benchmark latensi rekomendasi: cara lama (copy + sort seluruh korpus) vs mesin top-k.
+
+Jalankan dari root repo:
+
+    python benchmarks/bench_rekomendasi.py --rows 10000 50000 --top-n 20 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from korpus_sintetis import buat_korpus  # noqa: E402
+from risda import retrieval  # noqa: E402
+from risda.query_cache import cache  # noqa: E402
+from risda.resources import Resources  # noqa: E402
+
+QUERY = ["banjir di bantaran sungai", "sampah plastik", "kemacetan jalan kota", "air bersih desa"]
+
+
+def buat_data(n):
+    data = buat_korpus(n)
+    data["gabungan"] = (data["judul"] * 3 + " " + data["sinopsis"]).str.strip()
+    return data
+
+
+def rekomendasi_lama(res, teks, top_n):
+    input_vec = res.vectorizer.transform([teks])
+    cosine_sim = cosine_similarity(input_vec, res.tfidf_matrix).flatten()
+    hasil = res.data.copy()
+    hasil["similarity"] = cosine_sim
+    hasil = hasil.sort_values(by="similarity", ascending=False)
+    return hasil.head(top_n)
+
+
+def rekomendasi_baru(res, teks, top_n):
+    ids, skor = retrieval.rekomendasi_ids(res, teks, top_n)
+    return retrieval.ambil_baris(res, ids, skor)
+
+
+def ukur(fn, res, top_n, ulang):
+    mulai = time.perf_counter()
+    for i in range(ulang):
+        fn(res, QUERY[i % len(QUERY)], top_n)
+    return (time.perf_counter() - mulai) / ulang * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--top-n", type=int, nargs="+", default=[20, 50])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Query yang sama diulang, jadi cache dimatikan agar yang terukur memang skoringnya
+    cache.atur(ukuran=0)
+    vectorizer = joblib.load("tfidf_vectorizer.pkl")
+    print(f"{'rows':>8} {'top_n':>6} {'lama (ms)':>10} {'baru (ms)':>10} {'speedup':>8}")
+    for n in args.rows:
+        data = buat_data(n)
+        res = Resources(data, vectorizer, None, vectorizer.transform(data["gabungan"]), 0)
+        for top_n in args.top_n:
+            lama = ukur(rekomendasi_lama, res, top_n, args.repeat)
+            baru = ukur(rekomendasi_baru, res, top_n, args.repeat)
+            print(f"{n:>8} {top_n:>6} {lama:>10.2f} {baru:>10.2f} {lama / baru:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
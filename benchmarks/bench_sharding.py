@@ -0,0 +1,56 @@
+"""Benchmark skoring paralel per shard (risda/sharding.py) terhadap jumlah worker.
+
+Setiap konfigurasi worker juga dicek menghasilkan id dan skor yang identik
+dengan jalur satu thread. Jalankan dari root repo:
+
+    python benchmarks/bench_sharding.py --rows 500000 1000000 --worker 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from korpus_sintetis import buat_korpus, query_sintetis  # noqa: E402
+from risda import retrieval, sharding  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[500000])
+    parser.add_argument("--worker", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    vectorizer = joblib.load("tfidf_vectorizer.pkl")
+    queries = [vectorizer.transform([q]).toarray().ravel() for q in query_sintetis(args.repeat)]
+    print(f"{'rows':>8} {'worker':>7} {'ms/query':>9} {'speedup':>8}")
+    for n in args.rows:
+        data = buat_korpus(n)
+        matriks = vectorizer.transform((data["judul"] * 3 + " " + data["sinopsis"]).str.strip())
+        del data
+        alive = np.ones(n, dtype=bool)
+        acuan = [retrieval.top_k(matriks @ q, args.top_n, None, alive) for q in queries]
+
+        dasar = None
+        for w in args.worker:
+            mulai = time.perf_counter()
+            for q, (ids, skor) in zip(queries, acuan):
+                if w == 1:
+                    hasil = retrieval.top_k(matriks @ q, args.top_n, None, alive)
+                else:
+                    hasil = sharding.top_k_paralel(matriks, q, args.top_n, None, alive, n_worker=w)
+                assert np.array_equal(hasil[0], ids) and np.array_equal(hasil[1], skor), "hasil berbeda"
+            ms = (time.perf_counter() - mulai) / len(queries) * 1000
+            dasar = dasar or ms
+            print(f"{n:>8} {w:>7} {ms:>9.2f} {dasar / ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Waktu start dingin app2.py: laporan ``python -X importtime`` dengan anggaran.
+
+Impor tingkat atas app2.py dibaca langsung dari sumbernya (AST), lalu dijalankan
+di proses Python baru dengan ``-X importtime`` dalam dua tahap:
+
+* ``impor``: hanya baris-baris import app2.py
+* ``muat``: impor + ``resources.get_resources()`` atas korpus sintetis kecil,
+  sehingga modul yang ikut terimpor saat unpickle vectorizer/model juga terhitung
+
+Setiap tahap diulang beberapa kali dan diambil median. Anggaran tahap ``impor``
+berlaku untuk total waktu impor, anggaran ``muat`` untuk waktu dinding proses
+(start interpreter + impor + muat sumber daya). Benchmark gagal (exit 1) bila
+anggaran terlewati atau ada modul yang seharusnya hanya dimuat oleh halaman
+yang membutuhkannya (plotly.express untuk dashboard pemda, model klasifikasi
+untuk admin). Jalankan dari root repo:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --anggaran-impor-ms 2500 --anggaran-muat-ms 4000 --top 15
+"""
+
+import argparse
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from korpus_sintetis import buat_korpus  # noqa: E402
+from risda import resources  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app2.py")
+BERKAS_MODEL = [resources.VECTORIZER_PATH, resources.MODEL_PATH, resources.MLB_PATH]
+# Modul yang tidak boleh ikut termuat saat start (hanya di halaman yang memakainya). Inti
+# plotly (plotly.graph_objects) sudah diimpor streamlit sendiri, jadi yang dijaga plotly.express.
+TERLARANG = ("plotly.express", "sklearn.linear_model", "sklearn.multiclass")
+
+
+def impor_app(path=APP):
+    """Baris-baris import tingkat atas app2.py, sebagai satu potongan kode."""
+    with open(path, encoding="utf-8") as f:
+        pohon = ast.parse(f.read())
+    return "\n".join(ast.unparse(n) for n in pohon.body if isinstance(n, (ast.Import, ast.ImportFrom)))
+
+
+def parse_importtime(stderr):
+    """{modul: (self_us, kumulatif_us, kedalaman)} dari keluaran ``-X importtime``."""
+    modul = {}
+    for baris in stderr.splitlines():
+        if not baris.startswith("import time:") or "|" not in baris:
+            continue
+        bagian = baris[len("import time:"):].split("|")
+        try:
+            sendiri, kumulatif = int(bagian[0]), int(bagian[1])
+        except ValueError:
+            continue  # baris judul kolom
+        nama = bagian[2].rstrip()
+        kedalaman = (len(nama) - len(nama.lstrip())) // 2
+        modul.setdefault(nama.strip(), (sendiri, kumulatif, kedalaman))
+    return modul
+
+
+def jalankan(kode, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    mulai = time.perf_counter()
+    proses = subprocess.run([sys.executable, "-X", "importtime", "-W", "ignore", "-c", kode],
+                            cwd=cwd, env=env, capture_output=True, text=True)
+    detik = time.perf_counter() - mulai
+    if proses.returncode != 0:
+        raise RuntimeError(proses.stderr[-2000:])
+    return detik, parse_importtime(proses.stderr)
+
+
+def ringkas(modul, top):
+    # Waktu per paket akar = jumlah kumulatif modul kedalaman 0 milik paket itu
+    paket = {}
+    for nama, (_, kumulatif, kedalaman) in modul.items():
+        if kedalaman == 0:
+            akar = nama.split(".")[0]
+            paket[akar] = paket.get(akar, 0) + kumulatif
+    total = sum(paket.values())
+    return total, sorted(paket.items(), key=lambda x: -x[1])[:top]
+
+
+def ukur(nama, kode, cwd, ulang, top):
+    hasil = [jalankan(kode, cwd) for _ in range(ulang)]
+    totals = [ringkas(modul, top)[0] for _, modul in hasil]
+    idx = totals.index(sorted(totals)[len(totals) // 2])
+    detik, modul = hasil[idx]
+    total, teratas = ringkas(modul, top)
+    terlarang = sorted(m for m in modul if m in TERLARANG or m.startswith(tuple(t + "." for t in TERLARANG)))
+    print(f"\n== {nama}: impor {total / 1000:.0f} ms (median {ulang}x), proses {detik * 1000:.0f} ms, "
+          f"{len(modul)} modul")
+    for akar, us in teratas:
+        print(f"   {akar:<28} {us / 1000:>8.1f} ms")
+    return {"impor_ms": total / 1000, "proses_ms": detik * 1000, "modul": len(modul), "terlarang": terlarang}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000, help="baris korpus sintetis untuk tahap muat")
+    parser.add_argument("--ulang", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--anggaran-impor-ms", type=float, default=3000)
+    parser.add_argument("--anggaran-muat-ms", type=float, default=5000)
+    args = parser.parse_args()
+
+    impor = impor_app()
+    tmp = tempfile.mkdtemp(prefix="risda-startup-")
+    try:
+        for f in BERKAS_MODEL:
+            shutil.copy(os.path.join(ROOT, f), tmp)
+        buat_korpus(args.rows).to_csv(os.path.join(tmp, resources.CORPUS_PATH), index=False)
+
+        hasil = {
+            "impor": ukur("impor", impor, tmp, args.ulang, args.top),
+            "muat": ukur("muat", impor + "\nfrom risda import resources\nresources.get_resources()",
+                         tmp, args.ulang, args.top),
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    gagal = []
+    for tahap, ukuran, anggaran in [("impor", "impor_ms", args.anggaran_impor_ms),
+                                    ("muat", "proses_ms", args.anggaran_muat_ms)]:
+        if hasil[tahap][ukuran] > anggaran:
+            gagal.append(f"{tahap}: {hasil[tahap][ukuran]:.0f} ms > anggaran {anggaran:.0f} ms")
+        if hasil[tahap]["terlarang"]:
+            gagal.append(f"{tahap}: modul dimuat saat start: {', '.join(hasil[tahap]['terlarang'][:5])}")
+    print()
+    if gagal:
+        print("GAGAL\n  " + "\n  ".join(gagal))
+        sys.exit(1)
+    print("OK: dalam anggaran")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Benchmark menyeluruh untuk korpus yang membesar (1k/10k/100k/1M baris).
+
+Untuk setiap ukuran korpus sintetis (benchmarks/korpus_sintetis.py) diukur:
+
+* ``muat_vektorisasi``: baca fixr.csv + transform TF-IDF + indeks kata kunci & label
+* ``rekomendasi``: latensi top-k ``retrieval.rekomendasi_ids`` (cache dimatikan)
+* ``research``: kata kunci + filter label + rentang tahun + urut tahun
+* ``klasifikasi``: klasifikasi massal seperti upload CSV (baris/detik)
+* ``riwayat``: penulisan riwayat permasalahan ke SQLite (ms/tulis)
+
+Hasil ditulis sebagai JSON agar bisa dibandingkan antar-run. Jalankan dari root repo:
+
+    python benchmarks/bench_suite.py --rows 1000 10000 100000 --out hasil.json
+    python benchmarks/bench_suite.py --rows 10000 --bandingkan hasil.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import scipy
+import sklearn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from korpus_sintetis import buat_korpus, query_sintetis  # noqa: E402
+from risda import classify, resources, retrieval, storage  # noqa: E402
+from risda.query_cache import cache  # noqa: E402
+
+BERKAS_MODEL = [resources.VECTORIZER_PATH, resources.MODEL_PATH, resources.MLB_PATH]
+
+
+def _persentil(detik):
+    ms = np.asarray(detik) * 1000
+    return {"p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95)),
+            "rata_ms": float(ms.mean()), "n": int(len(ms))}
+
+
+def _waktu(fn, *args):
+    mulai = time.perf_counter()
+    hasil = fn(*args)
+    return time.perf_counter() - mulai, hasil
+
+
+def ukur_muat():
+    resources.invalidate()
+    detik, res = _waktu(resources.get_resources)
+    return {"detik": detik, "baris": int(len(res.data)), "nnz": int(res.tfidf_matrix.nnz)}, res
+
+
+def ukur_rekomendasi(res, queries, top_n):
+    return dict(_persentil([_waktu(retrieval.rekomendasi_ids, res, q, top_n)[0] for q in queries]),
+                top_n=top_n)
+
+
+def ukur_research(res, queries, seed=0):
+    rng = np.random.default_rng(seed)
+    kelas = res.labels.semua_label()
+    detik = []
+    for q in queries:
+        labels = list(rng.choice(kelas, size=2, replace=False))
+        tahun_min = int(rng.integers(2010, 2020))
+
+        def research():
+            ids = retrieval.cari_research(res, q, labels, tahun_min, tahun_min + 5)
+            return res.data.iloc[retrieval.halaman_ids(res, ids, 1, 15)[0]]
+        detik.append(_waktu(research)[0])
+    return _persentil(detik)
+
+
+def ukur_klasifikasi(res, n, seed=0):
+    df = buat_korpus(n, seed=seed + 1)[["judul", "sinopsis"]]
+    _, statistik = classify.klasifikasi_batch(res.model, res.mlb, df)
+    return statistik
+
+
+def ukur_riwayat(n):
+    detik = []
+    for i in range(n):
+        data = {"Waktu": storage.sekarang(), "Nama": "Bench", "Instansi": "Dinas Bench",
+                "Judul": f"Masalah {i}", "Deskripsi": "banjir di bantaran sungai"}
+        detik.append(_waktu(storage.tambah_permasalahan, data, "bench")[0])
+    return _persentil(detik)
+
+
+def jalankan(n, args):
+    root = os.getcwd()
+    tmp = tempfile.mkdtemp(prefix=f"risda-bench-{n}-")
+    try:
+        for f in BERKAS_MODEL:
+            shutil.copy(os.path.join(root, f), tmp)
+        os.chdir(tmp)
+        storage.DB_PATH = os.path.join(tmp, "risda.db")
+
+        buat_detik, korpus = _waktu(buat_korpus, n, args.seed)
+        korpus.to_csv(resources.CORPUS_PATH, index=False)
+        del korpus
+
+        muat, res = ukur_muat()
+        queries = query_sintetis(args.queries, seed=args.seed + 1)
+        hasil = {
+            "baris": n,
+            "buat_korpus_detik": buat_detik,
+            "muat_vektorisasi": muat,
+            "rekomendasi": ukur_rekomendasi(res, queries, args.top_n),
+            "research": ukur_research(res, queries, args.seed),
+            "klasifikasi": ukur_klasifikasi(res, min(n, args.klasifikasi), args.seed),
+            "riwayat": ukur_riwayat(args.riwayat),
+        }
+        resources.invalidate()
+        return hasil
+    finally:
+        os.chdir(root)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def ringkasan(hasil):
+    return {
+        "muat_vektorisasi_detik": hasil["muat_vektorisasi"]["detik"],
+        "rekomendasi_p95_ms": hasil["rekomendasi"]["p95_ms"],
+        "research_p95_ms": hasil["research"]["p95_ms"],
+        "klasifikasi_baris_per_detik": hasil["klasifikasi"]["baris_per_detik"],
+        "riwayat_p95_ms": hasil["riwayat"]["p95_ms"],
+    }
+
+
+def bandingkan(baru, path_lama):
+    with open(path_lama, encoding="utf-8") as f:
+        lama = {h["baris"]: ringkasan(h) for h in json.load(f)["hasil"]}
+    for h in baru:
+        if h["baris"] not in lama:
+            continue
+        print(f"\n{h['baris']} baris (baru / lama):")
+        for k, v in ringkasan(h).items():
+            print(f"  {k:<30} {v:>10.2f} / {lama[h['baris']][k]:>10.2f}  ({v / lama[h['baris']][k]:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="ukuran korpus, mis. 1000 10000 100000 1000000")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--klasifikasi", type=int, default=10000, help="maksimal baris upload yang diklasifikasi")
+    parser.add_argument("--riwayat", type=int, default=200, help="jumlah penulisan riwayat permasalahan")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="berkas JSON hasil (default: stdout)")
+    parser.add_argument("--bandingkan", help="JSON hasil run sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    # Yang diukur biaya skoring, bukan cache query
+    cache.atur(ukuran=0)
+    hasil = []
+    for n in args.rows:
+        print(f"[bench] {n} baris ...", file=sys.stderr)
+        hasil.append(jalankan(n, args))
+
+    laporan = {
+        "meta": {
+            "waktu": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu": os.cpu_count(),
+            "numpy": np.__version__, "scipy": scipy.__version__,
+            "pandas": pd.__version__, "sklearn": sklearn.__version__,
+            "argumen": vars(args),
+        },
+        "hasil": hasil,
+    }
+    teks = json.dumps(laporan, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(teks + "\n")
+    else:
+        print(teks)
+    if args.bandingkan:
+        bandingkan(hasil, args.bandingkan)
+
+
+if __name__ == "__main__":
+    main()
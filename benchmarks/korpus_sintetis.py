@@ -0,0 +1,118 @@
+"""Generator korpus inovasi sintetis dengan format yang sama seperti fixr.csv.
+
+Judul dan sinopsis disusun dari kosakata bertema per label (mirip teks
+penelitian berbahasa Indonesia), label disimpan sebagai string list Python,
+ditambah tahun, daerah, peneliti dan afiliasi. Hasilnya deterministik untuk
+``seed`` yang sama. Bisa dipakai sebagai modul (``buat_korpus``) atau CLI:
+
+    python benchmarks/korpus_sintetis.py --rows 100000 --out fixr_100k.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+KOLOM = ["judul", "sinopsis", "nama", "email", "afiliasi", "daerah", "tahun", "label", "link"]
+
+TEMA = {
+    "Air Bersih & Sanitasi": "air bersih sanitasi sumur filtrasi jamban pdam distribusi kualitas",
+    "Banjir": "banjir sungai drainase genangan curah hujan tanggul bantaran peringatan dini",
+    "Energi": "energi listrik surya panel baterai hemat daya terbarukan mikrohidro",
+    "Industri": "industri pabrik produksi umkm manufaktur rantai pasok efisiensi mesin",
+    "Infrastruktur": "jalan jembatan bangunan konstruksi beton irigasi infrastruktur perawatan",
+    "Kebakaran": "kebakaran api asap hutan lahan gambut deteksi pemadam",
+    "Kemacetan": "kemacetan lalu lintas simpang antrean kendaraan jalan raya lampu",
+    "Kemiskinan & Sosial": "kemiskinan sosial bantuan keluarga pemberdayaan ekonomi masyarakat desa",
+    "Kesehatan": "kesehatan puskesmas pasien gizi stunting penyakit rumah sakit ibu anak",
+    "Keselamatan": "keselamatan kecelakaan kerja risiko darurat evakuasi bencana",
+    "Ketahanan Pangan": "pangan padi petani panen pupuk hidroponik beras lahan pertanian",
+    "Limbah": "limbah cair pengolahan b3 industri rumah tangga daur ulang",
+    "Lingkungan": "lingkungan hijau konservasi mangrove ekosistem keanekaragaman hayati",
+    "Otomasi & Kontrol": "otomasi kontrol sensor mikrokontroler iot arduino monitoring otomatis",
+    "Pencemaran Air": "pencemaran air sungai logam berat limbah kualitas oksigen terlarut",
+    "Pendidikan": "pendidikan sekolah siswa guru pembelajaran digital literasi kurikulum",
+    "Perkotaan / Permukiman": "perkotaan permukiman kumuh perumahan tata ruang kawasan kota",
+    "Perubahan Iklim": "iklim emisi karbon suhu adaptasi mitigasi cuaca ekstrem",
+    "Polusi Udara": "polusi udara emisi partikulat kualitas udara asap kendaraan",
+    "Sampah": "sampah plastik bank sampah organik kompos tpa pemilahan",
+    "Transportasi": "transportasi angkutan umum bus terminal rute penumpang",
+    "Transportasi Laut / Maritim": "kapal pelabuhan nelayan maritim pesisir laut perikanan",
+    "Umum": "sistem informasi aplikasi data layanan publik pemerintah daerah",
+}
+UMUM = ("sistem berbasis aplikasi metode penelitian analisis model rancang bangun pengembangan "
+        "implementasi evaluasi teknologi masyarakat wilayah studi kasus hasil menunjukkan").split()
+POLA_JUDUL = ["Sistem {a} Berbasis {b}", "Rancang Bangun {a} untuk {b}", "Analisis {a} dan {b}",
+              "Pengembangan {a} {b} di {d}", "Model {a} untuk Mengatasi {b}", "Penerapan {a} pada {b}"]
+DAERAH = ["Surabaya", "Sidoarjo", "Gresik", "Malang", "Kediri", "Jember", "Banyuwangi", "Madiun",
+          "Mojokerto", "Pasuruan", "Probolinggo", "Lamongan", "Tuban", "Bojonegoro", "Blitar",
+          "Jakarta", "Bandung", "Semarang", "Yogyakarta", "Makassar", "Medan", "Denpasar"]
+AFILIASI = ["Institut Teknologi Sepuluh Nopember", "Universitas Airlangga", "Universitas Brawijaya",
+            "Universitas Negeri Surabaya", "Politeknik Elektronika Negeri Surabaya", "BRIN",
+            "Universitas Jember", "Dinas Lingkungan Hidup", "Bappeda"]
+NAMA = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fitri", "Gilang", "Hana", "Indra", "Joko",
+        "Kurnia", "Lestari", "Made", "Nur", "Putri", "Rizky", "Sari", "Taufik", "Wahyu", "Yusuf"]
+
+
+def buat_korpus(n, seed=0, tahun=(2010, 2025)):
+    # Dibangkitkan secara vektor per kolom agar 1 juta baris tetap cepat
+    rng = np.random.default_rng(seed)
+    kelas = np.array(list(TEMA), dtype=object)
+    kata_tema = [TEMA[k].split() for k in kelas]
+    panjang = np.array([len(k) for k in kata_tema])
+    kamus = np.array([k + [""] * (panjang.max() - len(k)) for k in kata_tema], dtype=object)
+
+    # 1-3 label berbeda per baris: ambil kolom pertama dari permutasi acak
+    n_label = rng.choice([1, 1, 2, 2, 3], size=n)
+    label_idx = np.argsort(rng.random((n, len(kelas))), axis=1)[:, :3]
+
+    def kata_acak(k):
+        # Setiap kata diambil dari tema salah satu label baris itu
+        j = label_idx[np.arange(n)[:, None], (rng.random((n, k)) * n_label[:, None]).astype(int)]
+        return kamus[j, (rng.random((n, k)) * panjang[j]).astype(int)]
+
+    tema = kata_acak(40)
+    sinopsis = np.empty((n, 60), dtype=object)
+    sinopsis[:, 0::3], sinopsis[:, 1::3] = tema[:, :20], tema[:, 20:]
+    sinopsis[:, 2::3] = rng.choice(np.array(UMUM, dtype=object), size=(n, 20))
+    ab = kata_acak(2)
+    daerah = rng.choice(np.array(DAERAH, dtype=object), size=n)
+    pola = rng.integers(len(POLA_JUDUL), size=n)
+    n_peneliti = rng.integers(1, 5, size=n)
+    peneliti = np.argsort(rng.random((n, len(NAMA))), axis=1)[:, :4]
+    link = rng.random(n) < 0.7
+
+    nama = ["; ".join(NAMA[j] for j in peneliti[i, :n_peneliti[i]]) for i in range(n)]
+    return pd.DataFrame({
+        "judul": [POLA_JUDUL[pola[i]].format(a=ab[i, 0].title(), b=ab[i, 1].title(), d=daerah[i])
+                  for i in range(n)],
+        "sinopsis": [" ".join(baris) for baris in sinopsis],
+        "nama": nama,
+        "email": [f"{NAMA[peneliti[i, 0]].lower()}{i}@contoh.ac.id" for i in range(n)],
+        "afiliasi": rng.choice(np.array(AFILIASI, dtype=object), size=n),
+        "daerah": daerah,
+        "tahun": rng.integers(tahun[0], tahun[1] + 1, size=n),
+        "label": [str(list(kelas[label_idx[i, :n_label[i]]])) for i in range(n)],
+        "link": [f"https://contoh.ac.id/penelitian/{i}" if link[i] else "" for i in range(n)],
+    }, columns=KOLOM)
+
+
+def query_sintetis(n, seed=1):
+    """Teks masalah pemda sintetis untuk dipakai sebagai query benchmark."""
+    rng = np.random.default_rng(seed)
+    kata = [w for teks in TEMA.values() for w in teks.split()]
+    return [" ".join(rng.choice(kata, size=rng.integers(2, 7))) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buat korpus inovasi sintetis")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="fixr_sintetis.csv")
+    args = parser.parse_args()
+    buat_korpus(args.rows, args.seed).to_csv(args.out, index=False)
+    print(f"{args.rows} baris ditulis ke {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Komponen inti RISDA yang dipakai bersama oleh aplikasi Streamlit (app2.py)."""
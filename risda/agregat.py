@@ -0,0 +1,90 @@
+"""Agregat korpus yang dimaterialisasi sekali per versi sumber daya.
+
+Beranda dan widget filter hanya butuh ringkasan korpus (inovasi terbaru,
+daftar label, rentang tahun, daftar daerah, jumlah per label), dan paginasi
+halaman research butuh urutan tahun seluruh korpus. Semuanya baru berubah
+bila korpus berubah. Ringkasan itu dihitung sekali untuk setiap
+``Resources.version`` lalu dipakai ulang oleh semua rerun dan sesi; versi baru
+(muat ulang atau delta admin) otomatis memicu hitung ulang.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+N_TERBARU = 5
+
+_lock = threading.Lock()
+_cache = {"versi": None, "agregat": None}
+
+
+class Agregat:
+    def __init__(self, terbaru, label, jumlah_label, tahun_min, tahun_maks, daerah, jumlah_inovasi,
+                 urutan, peringkat):
+        # terbaru: posisi baris (iloc) N inovasi hidup dengan tahun terbaru, seri -> id terkecil
+        self.terbaru = terbaru
+        self.label = label
+        self.jumlah_label = jumlah_label
+        self.tahun_min = tahun_min
+        self.tahun_maks = tahun_maks
+        self.daerah = daerah
+        self.jumlah_inovasi = jumlah_inovasi
+        # urutan[arah]: id baris hidup terurut tahun; peringkat[arah][id]: posisi id itu dalam
+        # urutan semua baris (arah "terbaru"/"terlama"), dipakai paginasi (retrieval.halaman_ids)
+        self.urutan = urutan
+        self.peringkat = peringkat
+
+    def sebagai_dict(self):
+        return {"jumlah_inovasi": self.jumlah_inovasi, "tahun_min": self.tahun_min,
+                "tahun_maks": self.tahun_maks, "label": self.jumlah_label, "daerah": self.daerah}
+
+
+def tahun_numerik(tahun):
+    return pd.to_numeric(tahun, errors="coerce").to_numpy(dtype=float)
+
+
+def _urutan_tahun(tahun):
+    """(urutan, peringkat) semua baris per arah; tahun kosong/tidak valid paling akhir, seri -> id terkecil."""
+    urutan, peringkat = {}, {}
+    for arah, kunci in (("terbaru", -tahun), ("terlama", tahun)):
+        urut = np.argsort(kunci, kind="stable")  # NaN selalu di akhir
+        rank = np.empty(len(urut), dtype=np.int64)
+        rank[urut] = np.arange(len(urut))
+        urutan[arah], peringkat[arah] = urut, rank
+    return urutan, peringkat
+
+
+def hitung(res, n_terbaru=N_TERBARU):
+    ids = res.live_ids()
+    semua_tahun = tahun_numerik(res.kolom("tahun"))
+    tahun = semua_tahun[ids]
+    urutan, peringkat = _urutan_tahun(semua_tahun)
+    urutan = {arah: urut[res.alive[urut]] for arah, urut in urutan.items()}
+    terbaru = urutan["terbaru"][:n_terbaru]
+
+    ada_tahun = tahun[~np.isnan(tahun)]
+    daerah = res.kolom("daerah").iloc[ids].dropna().astype(str).str.strip()
+    jumlah_label = {lbl: int(n) for lbl, n in sorted(res.labels.jumlah.items()) if n > 0}
+    return Agregat(
+        terbaru=terbaru,
+        label=list(jumlah_label),
+        jumlah_label=jumlah_label,
+        tahun_min=int(ada_tahun.min()) if len(ada_tahun) else None,
+        tahun_maks=int(ada_tahun.max()) if len(ada_tahun) else None,
+        daerah=sorted(set(daerah[daerah != ""])),
+        jumlah_inovasi=int(len(ids)),
+        urutan=urutan,
+        peringkat=peringkat,
+    )
+
+
+def ambil(res):
+    """Agregat untuk versi ``res``; dihitung hanya sekali per versi."""
+    with _lock:
+        if _cache["versi"] == res.version:
+            return _cache["agregat"]
+    agregat = hitung(res)
+    with _lock:
+        _cache["versi"], _cache["agregat"] = res.version, agregat
+    return agregat
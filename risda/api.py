@@ -0,0 +1,247 @@
+"""HTTP API JSON tanpa antarmuka untuk rekomendasi, pencarian dan klasifikasi.
+
+Hanya memakai pustaka standar (``http.server``), jadi tidak butuh layanan lain.
+Indeks yang dipakai sama dengan Streamlit (``resources.get_resources()``):
+
+* berdiri sendiri: ``python -m risda.api --port 8502`` (dijalankan dari folder
+  yang berisi fixr.csv dan berkas model). Perubahan korpus dari aplikasi
+  Streamlit terbaca lewat pemantauan berkas seperti biasa.
+* di dalam proses Streamlit: set ``RISDA_API_PORT=8502`` sebelum
+  ``streamlit run app2.py``; server berjalan di thread latar dan berbagi
+  indeks di memori yang sama.
+
+Endpoint (GET dengan query string, atau POST dengan body JSON):
+
+* ``/rekomendasi`` ``q``, ``k`` (default 10) -> top-k baris + skor
+* ``/cari`` ``q``, ``label`` (boleh berulang), ``tahun_min``, ``tahun_maks``,
+  ``urut`` (terbaru/terlama/relevansi), ``halaman``, ``per_halaman`` -> satu halaman hasil
+* ``/klasifikasi`` (POST) ``teks`` (list string) atau ``items`` (list
+  {judul, sinopsis}) -> label per item, maksimal ``MAKS_BATCH``
+* ``/status`` -> ukuran korpus, versi indeks, statistik cache, agregat korpus
+  (rentang tahun, jumlah per label, daftar daerah)
+
+Target kinerja ``/rekomendasi`` k=20 pada korpus 100k baris, satu proses
+(ukur dengan ``benchmarks/bench_api.py``):
+
+* query baru (cache miss): p95 < 50 ms untuk satu klien, >= 25 permintaan/detik
+* query berulang (cache hit): p95 < 10 ms untuk satu klien, >= 140 permintaan/detik
+
+Skoring terikat CPU dan GIL, jadi klien paralel menambah antrean, bukan
+throughput; untuk skala lebih besar jalankan beberapa proses di balik proxy.
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from risda import agregat, classify, query_cache, resources, retrieval, tracing
+
+HOST = "127.0.0.1"
+PORT = 8502
+MAKS_K = 100
+MAKS_PER_HALAMAN = 100
+MAKS_BATCH = 1000
+KOLOM_HASIL = ["id", "judul", "sinopsis", "nama", "afiliasi", "daerah", "tahun", "link"]
+
+_latar = {"server": None}
+_latar_lock = threading.Lock()
+
+
+class PermintaanSalah(ValueError):
+    pass
+
+
+def _int(params, nama, default=None, minimum=None, maksimum=None):
+    nilai = params.get(nama, default)
+    if nilai is None:
+        return None
+    try:
+        nilai = int(nilai)
+    except (TypeError, ValueError):
+        raise PermintaanSalah(f"'{nama}' harus bilangan bulat")
+    if minimum is not None and nilai < minimum:
+        raise PermintaanSalah(f"'{nama}' minimal {minimum}")
+    return min(nilai, maksimum) if maksimum is not None else nilai
+
+
+def _nilai(v):
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    return v.item() if hasattr(v, "item") else v
+
+
+def _baris_json(res, ids, skor=None):
+    data = res.baris(ids)
+    kolom = [k for k in KOLOM_HASIL if k in data.columns]
+    hasil = []
+    for j, (i, baris) in enumerate(zip(ids, data[kolom].to_dict("records"))):
+        baris = {k: _nilai(v) for k, v in baris.items()}
+        baris["label"] = res.labels.daftar(int(i))
+        if skor is not None:
+            baris["skor"] = float(skor[j])
+        hasil.append(baris)
+    return hasil
+
+
+def _daftar_str(params, nama):
+    # Satu string atau list string (parameter berulang di query string); selain itu ditolak
+    nilai = params.get(nama)
+    if nilai is None:
+        return None
+    if isinstance(nilai, str):
+        return [nilai]
+    if isinstance(nilai, list) and all(isinstance(v, str) for v in nilai):
+        return nilai
+    raise PermintaanSalah(f"'{nama}' harus string atau list string")
+
+
+def rekomendasi(res, params):
+    teks = str(params.get("q") or "").strip()
+    if not teks:
+        raise PermintaanSalah("'q' wajib diisi")
+    k = _int(params, "k", 10, minimum=1, maksimum=MAKS_K)
+    ids, skor = retrieval.rekomendasi_ids(res, teks, top_n=k, min_skor=0)
+    tracing.catat(panjang_query=len(teks), jumlah_hasil=int(len(ids)))
+    return {"q": teks, "hasil": _baris_json(res, ids, skor)}
+
+
+def cari(res, params):
+    label = [lbl for lbl in _daftar_str(params, "label") or [] if lbl]
+    halaman = _int(params, "halaman", 1, minimum=1)
+    per_halaman = _int(params, "per_halaman", 15, minimum=1, maksimum=MAKS_PER_HALAMAN)
+    urut = str(params.get("urut", "terbaru")).lower()
+    if urut not in ("terbaru", "terlama", "relevansi"):
+        raise PermintaanSalah("'urut' harus 'terbaru', 'terlama' atau 'relevansi'")
+
+    teks = str(params.get("q") or "").strip()
+    ids = retrieval.cari_research(res, teks, label, _int(params, "tahun_min"), _int(params, "tahun_maks"))
+    with tracing.tahap("filter_urut"):
+        # Tanpa ``q`` tidak ada skor relevansi: diurutkan seperti terbaru
+        ids_halaman, _ = retrieval.halaman_ids(res, ids, halaman, per_halaman,
+                                               urut if teks or urut != "relevansi" else "terbaru")
+    tracing.catat(panjang_query=len(teks), jumlah_hasil=int(len(ids)))
+    return {"total": int(len(ids)), "halaman": halaman, "per_halaman": per_halaman,
+            "hasil": _baris_json(res, ids_halaman)}
+
+
+def klasifikasi(res, params):
+    items = params.get("items")
+    if isinstance(items, list) and all(isinstance(i, dict) for i in items):
+        df = pd.DataFrame(items, columns=["judul", "sinopsis"])
+    elif "teks" in params:
+        teks = _daftar_str(params, "teks")
+        if teks is None:
+            raise PermintaanSalah("'teks' harus string atau list string")
+        df = pd.DataFrame({"judul": teks, "sinopsis": ""})
+    else:
+        raise PermintaanSalah("kirim 'teks' (list string) atau 'items' (list {judul, sinopsis})")
+    if len(df) > MAKS_BATCH:
+        raise PermintaanSalah(f"maksimal {MAKS_BATCH} item per permintaan")
+    if df.empty:
+        return {"hasil": []}
+    hasil = classify.prediksi_batch(res.model, res.mlb, classify.teks_input_batch(df).tolist())
+    tracing.catat(jumlah_hasil=len(hasil))
+    return {"hasil": [{"label": lbl} for lbl in hasil]}
+
+
+def status(res, params):
+    return {"korpus": int(res.alive.sum()), "versi": res.version,
+            "cache": query_cache.cache.statistik(), "agregat": agregat.ambil(res).sebagai_dict()}
+
+
+ENDPOINT = {
+    "/rekomendasi": rekomendasi,
+    "/cari": cari,
+    "/klasifikasi": klasifikasi,
+    "/status": status,
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "RisdaAPI/1.0"
+
+    def _kirim(self, kode, isi):
+        body = json.dumps(isi, ensure_ascii=False).encode("utf-8")
+        self.send_response(kode)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _layani(self, params):
+        url = urlparse(self.path)
+        fungsi = ENDPOINT.get(url.path.rstrip("/") or "/")
+        if fungsi is None:
+            return self._kirim(404, {"error": f"endpoint tidak dikenal: {url.path}"})
+        with tracing.jejak("api", url.path) as j:
+            try:
+                return self._kirim(200, fungsi(resources.get_resources(), params))
+            except PermintaanSalah as e:
+                tracing.catat(status=400)
+                return self._kirim(400, {"error": str(e)})
+            except Exception as e:  # noqa: BLE001 - klien tetap menerima JSON, bukan koneksi terputus
+                if j is not None:
+                    j.galat = type(e).__name__
+                return self._kirim(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self):
+        # Parameter berulang (label=a&label=b) menjadi list, sisanya nilai tunggal
+        params = {k: v if k == "label" else v[-1]
+                  for k, v in parse_qs(urlparse(self.path).query).items()}
+        self._layani(params)
+
+    def do_POST(self):
+        panjang = int(self.headers.get("Content-Length") or 0)
+        try:
+            params = json.loads(self.rfile.read(panjang) or b"{}")
+        except ValueError:
+            return self._kirim(400, {"error": "body harus JSON"})
+        if not isinstance(params, dict):
+            return self._kirim(400, {"error": "body harus objek JSON"})
+        self._layani(params)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def buat_server(host=HOST, port=PORT):
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def jalankan_di_latar(host=HOST, port=PORT):
+    """Jalankan server sekali per proses di thread daemon (dipakai dari app2.py)."""
+    with _latar_lock:
+        if _latar["server"] is None:
+            server = buat_server(host, port)
+            threading.Thread(target=server.serve_forever, name="risda-api", daemon=True).start()
+            _latar["server"] = server
+        return _latar["server"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP API JSON RISDA")
+    parser.add_argument("--host", default=os.environ.get("RISDA_API_HOST", HOST))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("RISDA_API_PORT", PORT)))
+    args = parser.parse_args(argv)
+
+    resources.get_resources()  # muat indeks sebelum menerima permintaan
+    server = buat_server(args.host, args.port)
+    print(f"RISDA API berjalan di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Gambar beranda: thumbnail yang dikecilkan & dikompres sekali per proses.
+
+Gambar asli (hingga 860 px, ±270 KB total) hanya ditampilkan di kotak
+``.role-image`` setinggi 130 px. Di sini gambar dikecilkan agar tetap menutupi
+kotak 2x ukuran tampilnya (tajam di layar HiDPI), dikompres ke WebP, dan hasilnya
+disimpan di cache proses (kunci: path, mtime, ukuran berkas), sehingga tidak
+ada lagi baca + encode base64 di setiap rerun.
+
+Bila static file serving Streamlit aktif (``server.enableStaticServing``, lihat
+``.streamlit/config.toml``), thumbnail ditulis ke folder ``static/`` di samping
+app dengan nama ber-hash isi, dan ``<img>`` cukup memuat URL-nya: payload
+halaman tidak lagi membawa gambar dan browser bisa meng-cache-nya. Bila tidak
+aktif, dipakai data URI dari thumbnail.
+
+    python -m risda.aset            # laporan byte per tampilan beranda
+"""
+
+import base64
+import hashlib
+import io
+import os
+from functools import lru_cache
+
+LEBAR, TINGGI = 640, 260
+KUALITAS = 80
+GAMBAR_BERANDA = ("animasi-gedung-pemerintah-0.png", "industri.jpg", "masyarakat.jpg")
+URL_STATIC = "app/static"
+
+_MIME = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+
+
+def _kunci(path):
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=32)
+def _thumbnail(path, mtime, ukuran):
+    with open(path, "rb") as f:
+        asli = f.read()
+    mime_asli = _MIME.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+    try:
+        from PIL import Image
+    except ImportError:
+        return asli, mime_asli
+
+    with Image.open(io.BytesIO(asli)) as img:
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        # Perkecil secukupnya agar tetap menutupi kotak LEBAR x TINGGI (object-fit: cover)
+        skala = max(LEBAR / img.width, TINGGI / img.height)
+        if skala < 1:
+            img = img.resize((round(img.width * skala), round(img.height * skala)), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, "WEBP", quality=KUALITAS, method=6)
+    if buf.tell() >= len(asli):
+        return asli, mime_asli
+    return buf.getvalue(), "image/webp"
+
+
+def thumbnail(path):
+    """(bytes, mime) thumbnail gambar; di-cache per proses sampai berkas aslinya berubah."""
+    return _thumbnail(*_kunci(path))
+
+
+@lru_cache(maxsize=32)
+def _data_uri(path, mtime, ukuran):
+    isi, mime = _thumbnail(path, mtime, ukuran)
+    return f"data:{mime};base64,{base64.b64encode(isi).decode()}"
+
+
+def _nama_static(path, isi, mime):
+    # Nama ber-hash isi: berkas lama tidak pernah ditimpa, cache browser aman
+    ext = ".webp" if mime == "image/webp" else os.path.splitext(path)[1].lower()
+    return f"{os.path.splitext(os.path.basename(path))[0]}-{hashlib.sha1(isi).hexdigest()[:10]}{ext}"
+
+
+@lru_cache(maxsize=32)
+def _url_static(path, mtime, ukuran, folder):
+    isi, mime = _thumbnail(path, mtime, ukuran)
+    nama = _nama_static(path, isi, mime)
+    tujuan = os.path.join(folder, nama)
+    if not os.path.exists(tujuan):
+        os.makedirs(folder, exist_ok=True)
+        tmp = f"{tujuan}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(isi)
+        os.replace(tmp, tujuan)
+    return f"{URL_STATIC}/{nama}"
+
+
+def src(path, folder_static=None):
+    """Nilai atribut ``src`` untuk ``<img>``: URL static bila ``folder_static`` diberikan, selain itu data URI."""
+    if folder_static:
+        return _url_static(*_kunci(path), folder_static)
+    return _data_uri(*_kunci(path))
+
+
+def laporan(paths=GAMBAR_BERANDA):
+    """Byte gambar per tampilan beranda: data URI asli vs data URI thumbnail vs URL static."""
+    baris = []
+    for path in paths:
+        with open(path, "rb") as f:
+            asli = f.read()
+        isi, mime = thumbnail(path)
+        baris.append({
+            "gambar": path,
+            "asli": len(asli),
+            "thumbnail": len(isi),
+            "uri_asli": len(f"data:{_MIME.get(os.path.splitext(path)[1].lower())};base64,")
+                        + len(base64.b64encode(asli)),
+            "uri_thumbnail": len(src(path)),
+            "url_static": len(f"{URL_STATIC}/{_nama_static(path, isi, mime)}"),
+        })
+    return baris
+
+
+def main():
+    baris = laporan()
+    print(f"{'gambar':<34} {'asli':>8} {'thumb':>8} {'uri asli':>9} {'uri thumb':>10} {'url':>5}")
+    for b in baris:
+        print(f"{b['gambar']:<34} {b['asli']:>8} {b['thumbnail']:>8} {b['uri_asli']:>9} "
+              f"{b['uri_thumbnail']:>10} {b['url_static']:>5}")
+    total = {k: sum(b[k] for b in baris) for k in ("uri_asli", "uri_thumbnail", "url_static")}
+    print(f"per tampilan beranda: {total['uri_asli']} -> {total['uri_thumbnail']} byte (data URI thumbnail, "
+          f"hemat {total['uri_asli'] - total['uri_thumbnail']}), {total['url_static']} byte (static)")
+
+
+if __name__ == "__main__":
+    main()
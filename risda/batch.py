@@ -0,0 +1,125 @@
+"""Rekomendasi batch offline untuk semua permasalahan pemda.
+
+Halaman pemerintah menghitung rekomendasi satu permasalahan per sesi, dan
+hasilnya hilang bersama sesi itu. Di sini semua permasalahan (tabel
+``permasalahan`` di risda.db, atau CSV dengan kolom Judul/Deskripsi)
+di-transform dalam satu panggilan ``vectorizer.transform``, lalu diskor
+terhadap korpus sebagai perkalian matriks sparse x sparse per blok
+permasalahan. Ukuran blok dibatasi agar matriks skor (blok x korpus) tidak
+melebihi ``BATAS_ELEMEN`` elemen. Top-k per baris dipilih seperti
+``retrieval.top_k``: skor > 0 saja, baris terhapus dilewati, seri -> id terkecil.
+
+Hasil ditulis ke CSV (satu baris per permasalahan x peringkat) berisi id
+permasalahan, id inovasi (kolom ``id`` korpus) dan skornya. Skor selalu cosine
+TF-IDF persis, juga bila mode LSA aktif.
+
+    python -m risda.batch                               # -> rekomendasi_batch.csv
+    python -m risda.batch --k 20 --csv permasalahan.csv --out hasil.csv
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+K = 10
+BATAS_ELEMEN = 1 << 23
+PATH_HASIL = "rekomendasi_batch.csv"
+
+
+def teks_permasalahan(judul, deskripsi):
+    # Sama dengan teks query di halaman pemerintah
+    judul = "" if pd.isna(judul) else str(judul)
+    deskripsi = "" if pd.isna(deskripsi) else str(deskripsi)
+    return f"{judul}. {deskripsi}" if judul and deskripsi else judul or deskripsi
+
+
+def rekomendasi_batch(res, teks, k=K, batas_elemen=BATAS_ELEMEN, progres=None):
+    """(ids, skor) berbentuk (len(teks), k): posisi baris korpus dan cosine-nya, -1 / NaN bila kosong.
+
+    ``progres(porsi selesai 0..1)`` dipanggil setiap blok (pekerjaan latar, risda/pekerjaan.py).
+    """
+    ids = np.full((len(teks), k), -1, dtype=np.int64)
+    skor = np.full((len(teks), k), np.nan)
+    if not len(teks) or k <= 0:
+        return ids, skor
+    kueri = res.vectorizer.transform(teks)
+    # term x baris: setiap baris query hanya menyentuh posting term-nya sendiri
+    korpus_t = res.tfidf_matrix.T.tocsr()
+    blok = max(1, batas_elemen // max(korpus_t.shape[1], 1))
+    for awal in range(0, len(teks), blok):
+        matriks_skor = (kueri[awal:awal + blok] @ korpus_t).tocsr()
+        for j in range(matriks_skor.shape[0]):
+            a, b = matriks_skor.indptr[j], matriks_skor.indptr[j + 1]
+            kolom, s = _top_k_baris(matriks_skor.data[a:b], matriks_skor.indices[a:b], k, res.alive)
+            ids[awal + j, :len(kolom)] = kolom
+            skor[awal + j, :len(kolom)] = s
+        if progres is not None:
+            progres(min(awal + blok, len(teks)) / len(teks))
+    return ids, skor
+
+
+def _top_k_baris(skor, kolom, k, alive):
+    # Sama dengan retrieval.top_k(min_skor=0), tetapi kolom baris hasil perkalian sparse
+    # tidak terurut: seri diputus dengan id kolom itu sendiri, tanpa sort_indices() (mahal)
+    pakai = (skor > 0) & alive[kolom]
+    skor, kolom = skor[pakai], kolom[pakai]
+    if k < len(skor):
+        batas = np.partition(skor, len(skor) - k)[len(skor) - k]
+        pakai = skor >= batas
+        skor, kolom = skor[pakai], kolom[pakai]
+    urutan = np.lexsort((kolom, -skor))[:k]
+    return kolom[urutan], skor[urutan]
+
+
+def tabel_hasil(res, permasalahan, ids, skor):
+    """Satu baris per (permasalahan, peringkat) yang berisi rekomendasi."""
+    baris, peringkat = np.nonzero(ids >= 0)
+    pos = ids[baris, peringkat]
+    return pd.DataFrame({
+        "id_permasalahan": permasalahan["id"].to_numpy()[baris],
+        "judul_permasalahan": permasalahan["Judul"].to_numpy()[baris],
+        "peringkat": peringkat + 1,
+        "id_inovasi": res.row_id[pos],
+        "judul_inovasi": res.data["judul"].to_numpy()[pos],
+        "skor": skor[baris, peringkat],
+    })
+
+
+def tulis(df, path=PATH_HASIL):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    from risda import resources, storage
+
+    parser = argparse.ArgumentParser(description="Rekomendasi inovasi untuk semua permasalahan sekaligus")
+    parser.add_argument("--k", type=int, default=K)
+    parser.add_argument("--csv", help="baca permasalahan dari CSV (kolom Judul, Deskripsi) alih-alih risda.db")
+    parser.add_argument("--out", default=PATH_HASIL)
+    parser.add_argument("--batas-elemen", type=int, default=BATAS_ELEMEN)
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        permasalahan = pd.read_csv(args.csv)
+        permasalahan.insert(0, "id", np.arange(1, len(permasalahan) + 1))
+    else:
+        permasalahan = storage.semua_permasalahan()
+    res = resources.get_resources()
+
+    mulai = time.perf_counter()
+    teks = [teks_permasalahan(j, d) for j, d in zip(permasalahan["Judul"], permasalahan["Deskripsi"])]
+    ids, skor = rekomendasi_batch(res, teks, args.k, args.batas_elemen)
+    hasil = tabel_hasil(res, permasalahan, ids, skor)
+    detik = time.perf_counter() - mulai
+    tulis(hasil, args.out)
+    print(f"{len(permasalahan)} permasalahan x top-{args.k} dari {int(res.alive.sum())} inovasi dalam "
+          f"{detik:.2f} detik ({len(permasalahan) / max(detik, 1e-9):.0f} permasalahan/detik) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Klasifikasi label inovasi, satu per satu (form manual) maupun massal (upload CSV).
+
+Teks masukan disusun dengan aturan yang sama untuk keduanya, lalu model
+dipanggil sekali per batch besar, bukan sekali per baris.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+UKURAN_BATCH = 5000
+
+
+def teks_input(judul, sinopsis):
+    return f"{judul}. {sinopsis}" if judul and sinopsis else judul or sinopsis
+
+
+def teks_input_batch(df):
+    # Versi vektor dari teks_input() untuk seluruh DataFrame sekaligus
+    judul = df["judul"].fillna("").astype(str)
+    sinopsis = df["sinopsis"].fillna("").astype(str)
+    keduanya = (judul != "") & (sinopsis != "")
+    return judul.where(~keduanya, judul + ". " + sinopsis).where(judul != "", sinopsis)
+
+
+def _ke_label(model, mlb, teks):
+    prediksi = model.predict(teks)
+    if getattr(prediksi, "ndim", 1) == 1:
+        # Model satu-label: prediksi sudah berupa nama kelas
+        return [[str(p)] for p in prediksi]
+
+    hasil = [list(labels) for labels in mlb.inverse_transform(prediksi)]
+    kosong = [i for i, labels in enumerate(hasil) if not labels]
+    if kosong and hasattr(model, "predict_proba"):
+        # Tidak ada kelas yang lolos ambang: ambil kelas dengan probabilitas tertinggi
+        terbaik = np.asarray(model.predict_proba([teks[i] for i in kosong])).argmax(axis=1)
+        for i, j in zip(kosong, terbaik):
+            hasil[i] = [mlb.classes_[j]]
+    return hasil
+
+
+def klasifikasi(model, mlb, judul, sinopsis):
+    return _ke_label(model, mlb, [teks_input(judul, sinopsis)])[0]
+
+
+def prediksi_batch(model, mlb, teks, ukuran_batch=UKURAN_BATCH, progres=None):
+    # progres(porsi selesai 0..1) dipanggil setiap batch, mis. oleh pekerjaan latar upload
+    labels = []
+    for awal in range(0, len(teks), ukuran_batch):
+        labels.extend(_ke_label(model, mlb, teks[awal:awal + ukuran_batch]))
+        if progres is not None:
+            progres(len(labels) / len(teks))
+    return labels
+
+
+def klasifikasi_batch(model, mlb, df, ukuran_batch=UKURAN_BATCH, progres=None):
+    """Kembalikan (Series label dalam format string list, statistik throughput)."""
+    teks = teks_input_batch(df).tolist()
+    mulai = time.perf_counter()
+    labels = prediksi_batch(model, mlb, teks, ukuran_batch, progres)
+    detik = time.perf_counter() - mulai
+
+    statistik = {
+        "baris": len(teks),
+        "detik": detik,
+        "baris_per_detik": len(teks) / detik if detik > 0 else float("inf"),
+    }
+    return pd.Series([str(lbl) for lbl in labels], index=df.index), statistik
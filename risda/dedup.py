@@ -0,0 +1,92 @@
+"""Hash isi kanonis per inovasi dan indeks hash untuk menolak duplikat saat ditulis.
+
+Dua inovasi dianggap sama bila judul dan sinopsisnya sama setelah dinormalisasi
+(NFKC, huruf kecil, spasi dirapatkan). Hash dihitung saat korpus disiapkan
+(kolom ``hash``, lihat ``resources.siapkan_korpus``) dan untuk setiap baris
+yang masuk lewat form manual, upload CSV atau pulihkan dari tempat sampah.
+
+``IndeksHash`` memetakan hash -> id stabil baris (kolom ``id`` jurnal), jadi
+tidak perlu diubah saat tombstone dipadatkan; peta balik id -> hash membuat
+penghapusan per id tidak perlu memindai seluruh peta. Karena korpus dijamin bebas
+duplikat, retrieval cukup meminta tepat k hasil tanpa langkah dedup.
+"""
+
+import hashlib
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from risda.lapisan import PetaBerlapis
+
+KOLOM_HASH = ("judul", "sinopsis")
+
+
+def _kanonis(teks):
+    if not isinstance(teks, str):
+        if teks is None or pd.isna(teks):
+            return ""
+        teks = str(teks)
+    # split()/join ~2x lebih cepat daripada regex \s+ untuk sinopsis panjang
+    return " ".join(unicodedata.normalize("NFKC", teks).casefold().split())
+
+
+def hash_konten(judul, sinopsis):
+    isi = "\x1f".join(_kanonis(t) for t in (judul, sinopsis))
+    return hashlib.sha1(isi.encode("utf-8")).hexdigest()[:16]
+
+
+def kolom_hash(df):
+    """Series hash isi untuk setiap baris ``df`` (indeks sama dengan ``df``)."""
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    kolom = [df[k].tolist() if k in df.columns else [None] * len(df) for k in KOLOM_HASH]
+    return pd.Series([hash_konten(*nilai) for nilai in zip(*kolom)], index=df.index, dtype=object)
+
+
+class IndeksHash:
+    def __init__(self, peta=None, balik=None):
+        # hash isi -> id stabil baris hidup, dan sebaliknya (id -> hash) untuk menghapus per id.
+        # Keduanya berlapis (risda/lapisan.py): salinan per perubahan sebanding dengan perubahannya.
+        self.peta = peta if peta is not None else PetaBerlapis()
+        self.balik = balik if balik is not None else PetaBerlapis(
+            {i: h for h, i in self.peta.items()})
+
+    @classmethod
+    def dari_data(cls, data, row_id):
+        hashes, ids = data["hash"].tolist(), np.asarray(row_id).tolist()
+        return cls(PetaBerlapis(dict(zip(hashes, ids))), PetaBerlapis(dict(zip(ids, hashes))))
+
+    def __len__(self):
+        return len(self.peta)
+
+    def cari(self, h):
+        return self.peta.get(h)
+
+    def dengan(self, hashes, row_ids):
+        # Salinan baru (copy-on-write seperti indeks lain di Resources)
+        pasangan = list(zip(hashes, (int(i) for i in row_ids)))
+        return IndeksHash(self.peta.dengan(pasangan), self.balik.dengan((i, h) for h, i in pasangan))
+
+    def tanpa(self, row_ids):
+        row_ids = [int(i) for i in row_ids]
+        hashes = []
+        for i in row_ids:
+            h = self.balik.get(i)
+            if h is not None and self.peta.get(h) == i:
+                hashes.append(h)
+        return IndeksHash(self.peta.dengan(hapus=hashes), self.balik.dengan(hapus=row_ids))
+
+    def saring(self, hashes):
+        """Untuk setiap hash: id baris yang sudah memuatnya, -1 bila duplikat baris sebelumnya
+        di ``hashes`` sendiri, atau None bila baru."""
+        hasil, dilihat = [], set()
+        for h in hashes:
+            if h in self.peta:
+                hasil.append(self.peta.get(h))
+            elif h in dilihat:
+                hasil.append(-1)
+            else:
+                dilihat.add(h)
+                hasil.append(None)
+        return hasil
@@ -0,0 +1,197 @@
+"""Pembaruan indeks inkremental untuk perubahan data dari halaman tambah_inovasi.
+
+Setiap fungsi di sini mencatat perubahan ke jurnal fixr (lihat risda/journal.py)
+lalu menerapkan delta yang
+sama ke sumber daya yang sudah termuat: baris baru di-transform lalu
+ditambahkan, baris yang diedit diganti di tempat, dan baris yang dihapus
+ditandai tombstone. Hanya baris yang berubah yang melewati vectorizer, parser
+label dan tokenizer, dan baris baru/diubah hanya masuk ke lapisan copy-on-write
+(risda/lapisan.py), jadi korpus dasar dan matriksnya tidak disalin per
+perubahan. Tombstone, lapisan dan bagian tambahan indeks kata kunci
+dipadatkan secara berkala.
+
+Baris yang isinya (judul + sinopsis) sudah ada di korpus ditolak sebelum
+ditulis ke jurnal (lihat risda/dedup.py).
+"""
+
+import numpy as np
+import pandas as pd
+
+from risda import dedup, journal, resources
+from risda.lapisan import Lapisan, PetaBerlapis
+
+# Pemadatan dijalankan bila tombstone melebihi porsi ini dari korpus ...
+BATAS_TOMBSTONE = 0.2
+# ... atau bila baris di bagian tambahan indeks kata kunci melebihi jumlah ini
+BATAS_TAMBAHAN = 2000
+
+
+def _siapkan_baris(res, df):
+    # Kolom disamakan dengan korpus dasar, seperti hasil replay jurnal saat muat ulang penuh
+    data_baru = resources.siapkan_korpus(df.reset_index(drop=True))
+    return data_baru.reindex(columns=res.data_dasar.columns)
+
+
+def _dense_baru(res, tfidf_baru):
+    # Mode LSA: baris baru/diubah diproyeksikan
+    return res.proyeksi.transform(tfidf_baru) if res.dense_dasar is not None else None
+
+
+def _tambah_slot(res, df_baru):
+    data_baru = _siapkan_baris(res, df_baru)
+    if data_baru.empty:
+        return res.ganti()
+    n = len(res.alive)
+    ids = np.arange(n, n + len(data_baru))
+    tfidf_baru = res.vectorizer.transform(data_baru["gabungan"])
+    row_ids = data_baru["id"].to_numpy()
+    return res.ganti(
+        lapisan=res.lapisan.dengan(ids, data_baru, tfidf_baru, _dense_baru(res, tfidf_baru)),
+        keyword_index=res.keyword_index.dengan_baris(ids, data_baru),
+        labels=res.labels.dengan_baris(ids, data_baru["label"]),
+        alive=np.concatenate([res.alive, np.ones(len(data_baru), dtype=bool)]),
+        row_id=np.concatenate([res.row_id, row_ids]),
+        hash_index=res.hash_index.dengan(data_baru["hash"], row_ids),
+        posisi_id=res.posisi_id.dengan(zip(row_ids.tolist(), ids.tolist())),
+    )
+
+
+def _tandai_hapus(res, ids):
+    # Hanya mask tombstone dan id (array datar) yang disalin; korpus dasar tidak disentuh
+    alive = res.alive.copy()
+    alive[ids] = False
+    row_id = res.row_id.copy()
+    row_id[ids] = -1
+    return res.ganti(alive=alive, row_id=row_id, labels=res.labels.tanpa_baris(ids),
+                     hash_index=res.hash_index.tanpa(res.row_id[ids]),
+                     posisi_id=res.posisi_id.dengan(hapus=res.row_id[ids].tolist()))
+
+
+def _slot(res, row_id):
+    return res.posisi_id.get(int(row_id))
+
+
+def delta_tambah(res, df_baru):
+    # df_baru sudah membawa kolom id hasil journal.tambah()
+    return _tambah_slot(res, df_baru)
+
+
+def delta_ubah(res, row_id, baris):
+    df_baris = pd.DataFrame([dict(baris, id=row_id)])
+    slot = _slot(res, row_id)
+
+    if slot is None:
+        # Baris sebelumnya tidak diindeks (judul/sinopsis/label kosong)
+        return _tambah_slot(res, df_baris)
+    data_baru = _siapkan_baris(res, df_baris)
+    if data_baru.empty:
+        return _tandai_hapus(res, [slot])
+
+    # Baris diganti di lapisan (posisi tetap); korpus dasar dan matriksnya tidak disalin
+    tfidf_baru = res.vectorizer.transform(data_baru["gabungan"])
+    return res.ganti(
+        lapisan=res.lapisan.dengan([slot], data_baru, tfidf_baru, _dense_baru(res, tfidf_baru)),
+        keyword_index=res.keyword_index.dengan_baris([slot], data_baru),
+        labels=res.labels.dengan_baris([slot], data_baru["label"]),
+        hash_index=res.hash_index.tanpa([row_id]).dengan(data_baru["hash"], [row_id]),
+    )
+
+
+def delta_hapus(res, row_id):
+    slot = _slot(res, row_id)
+    return _tandai_hapus(res, [slot]) if slot is not None else res.ganti()
+
+
+def perlu_dipadatkan(res):
+    n_mati = int((~res.alive).sum())
+    return (n_mati > BATAS_TOMBSTONE * len(res.alive)
+            or len(res.keyword_index.tambahan) > BATAS_TAMBAHAN
+            or len(res.lapisan) > BATAS_TAMBAHAN
+            or len(res.labels.timpa) > BATAS_TAMBAHAN)
+
+
+def padatkan(res):
+    """Lebur lapisan ke korpus dasar dan buang tombstone (O(n), sesekali)."""
+    keep = res.alive
+    if keep.all() and not res.keyword_index.tambahan and not len(res.lapisan) and not res.labels.timpa:
+        return res
+    data = res.data[keep].reset_index(drop=True)
+    row_id = res.row_id[keep]
+    return res.ganti(
+        data_dasar=data,
+        tfidf_dasar=res.tfidf_matrix[keep],
+        dense_dasar=res.dense[keep] if res.dense_dasar is not None else None,
+        lapisan=Lapisan(len(data)),
+        keyword_index=res.keyword_index.padatkan(keep),
+        labels=res.labels.padatkan(keep),
+        alive=np.ones(len(data), dtype=bool),
+        row_id=row_id,
+        posisi_id=PetaBerlapis(dict(zip(row_id.tolist(), range(len(row_id))))),
+    )
+
+
+def _terapkan(tulis, delta):
+    def delta_lalu_padatkan(res, hasil):
+        res = delta(res, hasil)
+        return padatkan(res) if perlu_dipadatkan(res) else res
+    # Pemadatan jurnal mengganti snapshot, jadi kedua berkas dipantau bersama
+    return resources.terapkan_delta((resources.CORPUS_PATH, resources.JOURNAL_PATH),
+                                    tulis, delta_lalu_padatkan)
+
+
+def _indeks_hash(res):
+    if res is not None:
+        return res.hash_index
+    # Sumber daya termuat tertinggal dari berkas (diubah proses lain): indeks dari jurnal saat ini
+    data = resources.load_corpus()
+    return dedup.IndeksHash.dari_data(data, data["id"])
+
+
+def duplikat(df):
+    """Untuk setiap baris ``df``: id baris korpus yang isinya sama, -1 bila sama dengan baris
+    sebelumnya di ``df``, atau None bila baru."""
+    return resources.get_resources().hash_index.saring(dedup.kolom_hash(df))
+
+
+def tambah(df_baru):
+    """Tambahkan baris baru (form manual, upload CSV, pulihkan) beserta indeksnya.
+
+    Baris baru selalu mendapat id baru. Baris yang isinya sudah ada (di korpus atau
+    di ``df_baru`` sendiri) tidak ditulis. Mengembalikan (baris tersimpan dengan kolom
+    id, baris duplikat dengan kolom ``duplikat_dari``: id baris yang sama, -1 = baris
+    sebelumnya di ``df_baru``).
+    """
+    df_baru = df_baru.reset_index(drop=True)
+    hashes = dedup.kolom_hash(df_baru)
+
+    def tulis(res):
+        duplikat_dari = pd.Series(_indeks_hash(res).saring(hashes), index=df_baru.index, dtype="Int64")
+        ditolak = duplikat_dari.notna().to_numpy(dtype=bool)
+        baru = df_baru[~ditolak]
+        tersimpan = journal.tambah(baru) if len(baru) else baru.assign(id=pd.Series(dtype="int64"))
+        return tersimpan, df_baru[ditolak].assign(duplikat_dari=duplikat_dari[ditolak])
+    return _terapkan(tulis, lambda res, hasil: delta_tambah(res, hasil[0]))
+
+
+def ubah(row_id, baris):
+    """Ganti isi baris ber-id ``row_id``.
+
+    Ditolak bila isinya sama dengan baris lain: mengembalikan id baris itu, atau None bila tersimpan.
+    """
+    h = dedup.hash_konten(baris.get("judul"), baris.get("sinopsis"))
+
+    def tulis(res):
+        lain = _indeks_hash(res).cari(h)
+        if lain is not None and lain != int(row_id):
+            return lain, None
+        # Delta dihitung sebelum record ditulis: bila gagal, jurnal tidak tersentuh
+        res_baru = delta_ubah(res, row_id, baris) if res is not None else None
+        journal.ubah(row_id, baris)
+        return None, res_baru
+    lain, _ = _terapkan(tulis, lambda res, hasil: res if hasil[0] is not None else hasil[1])
+    return lain
+
+
+def hapus(row_id):
+    """Hapus baris ber-id ``row_id``."""
+    _terapkan(lambda res: journal.hapus(row_id), lambda res, _: delta_hapus(res, row_id))
@@ -0,0 +1,264 @@
+"""Jurnal tulis-di-depan (write-ahead) untuk korpus inovasi fixr.csv.
+
+Perubahan dari admin tidak lagi menulis ulang fixr.csv. Setiap insert, update
+dan delete ditambahkan sebagai satu baris JSON ke ``fixr.journal``, dengan
+kunci id baris yang stabil (kolom ``id``). Biaya tulisnya O(1): id berikutnya
+dan jumlah record jurnal disimpan di ``fixr.meta.json``. Secara berkala
+jurnal dipadatkan: keadaan terkini ditulis ke berkas sementara lalu di-rename
+secara atomik menjadi fixr.csv, dan jurnal dikosongkan. Pembaca memuat
+snapshot ditambah ekor jurnal, sehingga tidak pernah melihat berkas yang
+setengah tertulis.
+"""
+
+import contextlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from risda import tracing
+
+SNAPSHOT_PATH = "fixr.csv"
+JOURNAL_PATH = "fixr.journal"
+META_PATH = "fixr.meta.json"
+LOCK_PATH = "fixr.lock"
+
+# Jurnal dipadatkan ke snapshot setelah sebanyak ini record
+BATAS_RECORD = 1000
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+_thread_lock = threading.RLock()
+_lokal = threading.local()
+
+
+@contextlib.contextmanager
+def kunci():
+    # Kunci antar-thread (sesi Streamlit) sekaligus antar-proses (flock) untuk penulis.
+    # Bisa dipanggil bersarang dalam thread yang sama (mis. tambah() -> padatkan()).
+    with _thread_lock:
+        if fcntl is None or getattr(_lokal, "dipegang", False):
+            yield
+            return
+        with open(LOCK_PATH, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            _lokal.dipegang = True
+            try:
+                yield
+            finally:
+                _lokal.dipegang = False
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def ada():
+    return os.path.exists(SNAPSHOT_PATH) or os.path.exists(JOURNAL_PATH)
+
+
+def _nilai_json(v):
+    if v is None or (not isinstance(v, (list, tuple, dict)) and pd.isna(v)):
+        return None
+    return v.item() if hasattr(v, "item") else v
+
+
+def _baca_record():
+    if not os.path.exists(JOURNAL_PATH):
+        return []
+    records = []
+    with open(JOURNAL_PATH, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Baris terakhir yang terpotong (proses mati saat menulis) diabaikan
+                continue
+    return records
+
+
+def _baca_snapshot():
+    if not os.path.exists(SNAPSHOT_PATH):
+        return pd.DataFrame(columns=["id"])
+    df = pd.read_csv(SNAPSHOT_PATH, encoding="utf-8", low_memory=True)
+    if "id" not in df.columns:
+        # Snapshot lama tanpa id: id = nomor baris (ditulis permanen saat pemadatan pertama)
+        df.insert(0, "id", range(len(df)))
+    return df
+
+
+def _timpa(df, index, baris):
+    # Per kolom: kolom yang tidak bisa menampung nilai baru (mis. kolom yang seluruhnya kosong
+    # terbaca float64 lalu diisi teks; pandas 3 menolak tanpa pelebaran) dijadikan object dulu
+    for kolom in df.columns:
+        nilai = baris[kolom].to_numpy(dtype=object)
+        try:
+            df.loc[index, kolom] = nilai
+        except (TypeError, ValueError):
+            df[kolom] = df[kolom].astype(object)
+            df.loc[index, kolom] = nilai
+            # dtype akhir sedekat mungkin dengan hasil membaca ulang CSV setelah pemadatan
+            df[kolom] = df[kolom].infer_objects()
+    return df
+
+
+def _replay(df, records):
+    akhir, hapus = {}, set()
+    for rec in records:
+        if rec["op"] == "delete":
+            akhir.pop(rec["id"], None)
+            hapus.add(rec["id"])
+        else:
+            akhir[rec["id"]] = rec["baris"]
+            hapus.discard(rec["id"])
+    if not akhir and not hapus:
+        return df
+
+    df = df.set_index("id", drop=False)
+    lama = [i for i in akhir if i in df.index]
+    if lama:
+        # Update diterapkan di tempat agar urutan baris tetap
+        pembaruan = pd.DataFrame([dict(akhir[i], id=i) for i in lama], index=lama).reindex(columns=df.columns)
+        df = _timpa(df, lama, pembaruan)
+    baru = [dict(akhir[i], id=i) for i in akhir if i not in df.index]
+    df = df.drop(index=[i for i in hapus if i in df.index])
+    if baru:
+        df = pd.concat([df, pd.DataFrame(baru)], ignore_index=True)
+    df = df.reset_index(drop=True)
+    df["id"] = df["id"].astype("int64")
+    return df
+
+
+@tracing.tahap("muat_csv")
+def baca():
+    """Keadaan korpus terkini: snapshot + ekor jurnal, dengan kolom ``id``."""
+    # Jurnal dibaca lebih dulu: bila pemadatan terjadi di antaranya, snapshot baru sudah
+    # memuat semua record lama dan replay yang idempoten tetap menghasilkan keadaan benar.
+    records = _baca_record()
+    return _replay(_baca_snapshot(), records)
+
+
+def _header():
+    if os.path.exists(SNAPSHOT_PATH):
+        return [k for k in pd.read_csv(SNAPSHOT_PATH, nrows=0).columns if k != "id"]
+    return None
+
+
+def _baca_meta():
+    if not os.path.exists(META_PATH):
+        return {}
+    with open(META_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _simpan_meta(**kolom):
+    meta = dict(_baca_meta(), **kolom)
+    _tulis_atomik(META_PATH, lambda f: json.dump(meta, f))
+
+
+def _next_id():
+    # Penghitung id disimpan terpisah agar penulis tidak perlu membaca seluruh korpus
+    meta = _baca_meta()
+    if "next_id" in meta:
+        return meta["next_id"]
+    ids = baca()["id"]
+    return int(ids.max()) + 1 if len(ids) else 0
+
+
+def _ambil_id(n):
+    berikut = _next_id()
+    _simpan_meta(next_id=berikut + n)
+    return list(range(berikut, berikut + n))
+
+
+def _tulis_atomik(path, tulis, mode="w"):
+    tmp = f"{path}.tmp"
+    with open(tmp, mode, encoding="utf-8", newline="") as f:
+        tulis(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _append(records):
+    data = "".join(json.dumps(rec, ensure_ascii=False, default=str) + "\n" for rec in records)
+    jumlah = _jumlah_record()
+    with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    # Crash sebelum baris ini hanya membuat hitungan kurang, jadi pemadatan sedikit terlambat
+    _simpan_meta(record=jumlah + len(records))
+
+
+def _hitung_record():
+    if not os.path.exists(JOURNAL_PATH):
+        return 0
+    with open(JOURNAL_PATH, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def _jumlah_record():
+    # Jumlah record jurnal disimpan di meta agar penulis tidak perlu membaca ulang jurnal;
+    # hanya meta lama (tanpa hitungan) yang dihitung dari berkas, sekali
+    meta = _baca_meta()
+    return meta["record"] if "record" in meta else _hitung_record()
+
+
+def _siapkan():
+    # Snapshot lama tanpa kolom id dipadatkan dulu agar id yang dirujuk jurnal permanen
+    if os.path.exists(SNAPSHOT_PATH) and "id" not in pd.read_csv(SNAPSHOT_PATH, nrows=0).columns:
+        padatkan()
+
+
+def _setelah_tulis():
+    if _jumlah_record() >= BATAS_RECORD:
+        padatkan()
+
+
+@tracing.tahap("tulis")
+def tambah(df_baru):
+    """Tambahkan baris baru; id baru selalu diberikan. Mengembalikan DataFrame dengan kolom id."""
+    with kunci():
+        _siapkan()
+        header = _header()
+        df_baru = df_baru.drop(columns="id", errors="ignore")
+        if header is not None:
+            df_baru = df_baru.reindex(columns=header)
+        df_baru = df_baru.reset_index(drop=True)
+        df_baru.insert(0, "id", _ambil_id(len(df_baru)))
+        _append([{"op": "insert", "id": int(b["id"]),
+                  "baris": {k: _nilai_json(v) for k, v in b.items() if k != "id"}}
+                 for b in df_baru.to_dict("records")])
+        _setelah_tulis()
+        return df_baru
+
+
+@tracing.tahap("tulis")
+def ubah(row_id, baris):
+    with kunci():
+        _siapkan()
+        _append([{"op": "update", "id": int(row_id),
+                  "baris": {k: _nilai_json(v) for k, v in dict(baris).items() if k != "id"}}])
+        _setelah_tulis()
+
+
+@tracing.tahap("tulis")
+def hapus(row_id):
+    with kunci():
+        _siapkan()
+        _append([{"op": "delete", "id": int(row_id)}])
+        _setelah_tulis()
+
+
+@tracing.tahap("tulis")
+def padatkan():
+    """Tulis keadaan terkini ke snapshot baru (rename atomik) lalu kosongkan jurnal."""
+    with kunci():
+        df = baca()
+        berikut = max(int(df["id"].max()) + 1 if len(df) else 0, _next_id())
+        _tulis_atomik(SNAPSHOT_PATH, lambda f: df.to_csv(f, index=False))
+        # Crash di antara dua langkah ini aman: replay jurnal lama ke snapshot baru idempoten
+        _tulis_atomik(JOURNAL_PATH, lambda f: None)
+        _simpan_meta(next_id=berikut, record=0)
@@ -0,0 +1,157 @@
+"""Indeks terbalik (token -> daftar id baris) untuk kotak pencarian halaman research.
+
+Indeks dibangun sekali saat korpus dimuat dari kolom ``judul``, ``sinopsis``
+dan ``label``. Pencarian hanya menyentuh posting list token yang cocok, jadi
+biayanya sebanding dengan jumlah baris yang cocok, bukan ukuran korpus.
+
+Baris yang ditambah/diubah setelah indeks dibangun disimpan di bagian
+``tambahan`` (id baris -> token) sampai indeks dipadatkan kembali.
+
+``bm25`` memberi skor BM25 dari posting yang sama: tf = jumlah token baris
+yang berawalan kata query, panjang dokumen = jumlah token unik baris.
+"""
+
+import bisect
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+KOLOM_INDEKS = ("judul", "sinopsis", "label")
+
+_token_re = re.compile(TOKEN_PATTERN)
+
+
+def tokenisasi(teks):
+    return _token_re.findall(str(teks).lower())
+
+
+def teks_baris(data):
+    teks = data[KOLOM_INDEKS[0]].fillna("").astype(str)
+    for kolom in KOLOM_INDEKS[1:]:
+        teks = teks + " " + data[kolom].fillna("").astype(str)
+    return teks
+
+
+class KeywordIndex:
+    def __init__(self, tokens, indptr, indices, n_rows, basi=None, tambahan=None):
+        # tokens terurut alfabetis; posting token ke-j = indices[indptr[j]:indptr[j + 1]]
+        self.tokens = tokens
+        self.indptr = indptr
+        self.indices = indices
+        self.n_rows = n_rows
+        # basi: id baris dasar yang postingnya sudah tidak berlaku (baris diubah)
+        self.basi = basi if basi is not None else np.empty(0, dtype=np.int64)
+        self.tambahan = tambahan if tambahan is not None else {}
+        self._panjang = None
+
+    def _rentang_prefix(self, prefix):
+        awal = bisect.bisect_left(self.tokens, prefix)
+        akhir = bisect.bisect_left(self.tokens, prefix + "\uffff", lo=awal)
+        return awal, akhir
+
+    def posting_tf(self, kata):
+        """(id baris terurut, jumlah token baris itu yang berawalan ``kata``)."""
+        # Kata dicocokkan sebagai awalan token ("banj" -> "banjir", "banjirnya"),
+        # sedekat mungkin dengan pencocokan substring yang dipakai sebelumnya
+        awal, akhir = self._rentang_prefix(kata)
+        ids = self.indices[self.indptr[awal]:self.indptr[akhir]].astype(np.int64)
+        if akhir - awal > 1:
+            ids, tf = np.unique(ids, return_counts=True)
+        else:
+            tf = np.ones(len(ids), dtype=np.int64)
+        if len(self.basi):
+            tetap = ~np.isin(ids, self.basi, assume_unique=True)
+            ids, tf = ids[tetap], tf[tetap]
+        if self.tambahan:
+            ekstra = [(i, sum(t.startswith(kata) for t in toks)) for i, toks in self.tambahan.items()]
+            ekstra = [(i, n) for i, n in ekstra if n]
+            if ekstra:
+                # Baris tambahan tidak pernah ada di posting dasar (baru, atau sudah ditandai basi)
+                ids = np.concatenate([ids, [i for i, _ in ekstra]])
+                tf = np.concatenate([tf, [n for _, n in ekstra]])
+                urut = np.argsort(ids, kind="stable")
+                ids, tf = ids[urut], tf[urut]
+        return ids, tf
+
+    def panjang_baris(self):
+        """Jumlah token unik per baris; dihitung sekali per indeks."""
+        if self._panjang is None:
+            n = max(self.n_rows, max(self.tambahan, default=-1) + 1)
+            panjang = np.bincount(np.asarray(self.indices), minlength=n)[:n].astype(np.float64)
+            for i, toks in self.tambahan.items():
+                panjang[i] = len(toks)
+            self._panjang = panjang
+        return self._panjang
+
+    def bm25(self, teks, alive=None, k1=1.2, b=0.75):
+        """(id baris terurut, skor BM25) semua baris yang cocok dengan kata kunci ``teks``."""
+        kata_kunci = set(tokenisasi(teks))
+        panjang = self.panjang_baris()
+        # Statistik korpus hanya atas baris hidup, sama dengan indeks yang dibangun ulang penuh
+        hidup = panjang[alive] if alive is not None else panjang
+        n_dok, rata2 = len(hidup), float(hidup.mean()) if len(hidup) else 1.0
+        semua_ids, semua_skor = [], []
+        for kata in kata_kunci:
+            ids, tf = self.posting_tf(kata)
+            if alive is not None:
+                hidup = alive[ids]
+                ids, tf = ids[hidup], tf[hidup]
+            if not len(ids):
+                continue
+            idf = np.log1p((n_dok - len(ids) + 0.5) / (len(ids) + 0.5))
+            semua_ids.append(ids)
+            semua_skor.append(idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * panjang[ids] / rata2)))
+        if not semua_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ids, posisi = np.unique(np.concatenate(semua_ids), return_inverse=True)
+        return ids, np.bincount(posisi, weights=np.concatenate(semua_skor), minlength=len(ids))
+
+    def dengan_baris(self, ids, data_baris):
+        # ids boleh baris baru (>= n_rows) atau baris lama yang isinya diubah
+        tambahan = dict(self.tambahan)
+        for i, teks in zip(ids, teks_baris(data_baris)):
+            tambahan[int(i)] = frozenset(tokenisasi(teks))
+        lama = [int(i) for i in ids if i < self.n_rows]
+        basi = np.union1d(self.basi, lama) if lama else self.basi
+        return KeywordIndex(self.tokens, self.indptr, self.indices, self.n_rows, basi, tambahan)
+
+    def padatkan(self, keep):
+        # Gabungkan bagian tambahan ke posting dasar dan buang baris yang tidak dipertahankan
+        remap = np.cumsum(keep) - 1
+        kolom = np.repeat(np.arange(len(self.tokens)), np.diff(self.indptr))
+        baris = self.indices.astype(np.int64)
+        pakai = keep[baris] & ~np.isin(baris, self.basi)
+
+        token_baru = sorted(set(np.asarray(self.tokens, dtype=object)[np.unique(kolom[pakai])])
+                            | {t for i, toks in self.tambahan.items() if keep[i] for t in toks})
+        posisi = {t: j for j, t in enumerate(token_baru)}
+        peta_kolom = np.array([posisi.get(t, -1) for t in self.tokens], dtype=np.int64)
+
+        pasangan = [(remap[i], posisi[t]) for i, toks in self.tambahan.items() if keep[i] for t in toks]
+        baris_all = np.concatenate([remap[baris[pakai]], np.array([b for b, _ in pasangan], dtype=np.int64)])
+        kolom_all = np.concatenate([peta_kolom[kolom[pakai]], np.array([k for _, k in pasangan], dtype=np.int64)])
+
+        n_baru = int(keep.sum())
+        matriks = sp.csc_matrix((np.ones(len(baris_all), dtype=np.int8), (baris_all, kolom_all)),
+                                shape=(n_baru, len(token_baru)))
+        matriks.sum_duplicates()
+        return KeywordIndex(token_baru, matriks.indptr, matriks.indices, n_baru)
+
+
+def bangun_indeks(data):
+    # sklearn (~1 detik diimpor) hanya dibutuhkan saat membangun indeks, tidak saat dimuat dari snapshot
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    teks = teks_baris(data)
+
+    cv = CountVectorizer(token_pattern=TOKEN_PATTERN, lowercase=True, binary=True, dtype=np.int8)
+    try:
+        matriks = cv.fit_transform(teks).tocsc()
+    except ValueError:
+        # Korpus kosong / tanpa token sama sekali
+        return KeywordIndex([], np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32), len(data))
+
+    matriks.sort_indices()
+    return KeywordIndex(list(cv.get_feature_names_out()), matriks.indptr, matriks.indices, len(data))
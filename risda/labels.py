@@ -0,0 +1,141 @@
+"""Matriks label biner yang di-parse sekali saat korpus dimuat.
+
+Kolom ``label`` disimpan sebagai string list Python (mis. "['Banjir', 'Sampah']").
+String tersebut di-parse dengan ``ast.literal_eval`` (bukan ``eval``) lalu
+disusun menjadi matriks boolean baris x label, sehingga filter, daftar label
+dan jumlah per label cukup berupa operasi vektor.
+
+Setiap string label unik cukup di-parse sekali: kolom dikodekan dulu
+(``kodekan``: kode per baris + tuple label per string unik), lalu matriks
+disusun dari kode tersebut (``dari_kode``). Kode ini juga disimpan di snapshot
+indeks (risda/snapshot.py) sehingga start tidak perlu mem-parse ulang.
+"""
+
+import ast
+
+import numpy as np
+import pandas as pd
+
+
+def parse_label(raw):
+    if isinstance(raw, (list, tuple, set)):
+        return [str(lbl).strip() for lbl in raw]
+    if not isinstance(raw, str):
+        return []
+    try:
+        nilai = ast.literal_eval(raw)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return [raw.strip()]
+    if isinstance(nilai, (list, tuple, set)):
+        return [str(lbl).strip() for lbl in nilai]
+    return [str(nilai).strip()]
+
+
+class LabelMatrix:
+    def __init__(self, kelas, matriks, per_baris, timpa=None, n=None, jumlah=None):
+        self.kelas = list(kelas)
+        self.kolom = {lbl: j for j, lbl in enumerate(self.kelas)}
+        # matriks/per_baris: baris dasar, tidak pernah diubah. timpa: posisi -> tuple label baris
+        # yang ditambah/diubah/dihapus sesudahnya (copy-on-write per baris, lihat risda/lapisan.py)
+        self.matriks = matriks
+        self.per_baris = per_baris
+        self.timpa = timpa if timpa is not None else {}
+        self.n = n if n is not None else matriks.shape[0]
+        if jumlah is None:
+            jumlah = dict(zip(self.kelas, matriks.sum(axis=0).tolist()))
+        self.jumlah = jumlah
+
+    def daftar(self, i):
+        return list(self.timpa[i] if i in self.timpa else self.per_baris[i])
+
+    def semua_label(self):
+        return sorted(lbl for lbl, n in self.jumlah.items() if n > 0)
+
+    def mask_any(self, labels):
+        mask = np.zeros(self.n, dtype=bool)
+        kolom = [self.kolom[lbl] for lbl in labels if lbl in self.kolom and self.kolom[lbl] < self.matriks.shape[1]]
+        if kolom:
+            mask[:self.matriks.shape[0]] = self.matriks[:, kolom].any(axis=1)
+        if self.timpa:
+            dicari = set(labels)
+            for i, lbls in self.timpa.items():
+                mask[i] = not dicari.isdisjoint(lbls)
+        return mask
+
+    def _ganti(self, ids, per_baris_baru, kelas):
+        # Biaya sebanding dengan baris yang berubah (+ ukuran timpa), bukan ukuran korpus
+        timpa, jumlah = dict(self.timpa), dict(self.jumlah)
+        for lbl in kelas[len(self.kelas):]:
+            jumlah[lbl] = 0
+        for i, labels in zip(ids, per_baris_baru):
+            i = int(i)
+            lama = timpa.get(i, self.per_baris[i] if i < len(self.per_baris) else ())
+            for lbl in lama:
+                jumlah[lbl] -= 1
+            for lbl in labels:
+                jumlah[lbl] += 1
+            timpa[i] = tuple(labels)
+        n = max(self.n, max((int(i) for i in ids), default=-1) + 1)
+        return LabelMatrix(kelas, self.matriks, self.per_baris, timpa, n, jumlah)
+
+    def dengan_baris(self, ids, label_series):
+        # ids boleh menunjuk baris lama (diganti) atau baris baru tepat setelah baris terakhir
+        tambahan = bangun_label_matrix(label_series, self.kelas)
+        return self._ganti(ids, tambahan.per_baris, tambahan.kelas)
+
+    def tanpa_baris(self, ids):
+        return self._ganti(ids, [()] * len(ids), self.kelas)
+
+    def padatkan(self, keep):
+        per_baris = list(self.per_baris) + [()] * (self.n - len(self.per_baris))
+        for i, labels in self.timpa.items():
+            per_baris[i] = labels
+        matriks = np.zeros((self.n, len(self.kelas)), dtype=bool)
+        matriks[:self.matriks.shape[0], :self.matriks.shape[1]] = self.matriks
+        for i, labels in self.timpa.items():
+            matriks[i] = False
+            matriks[i, [self.kolom[lbl] for lbl in labels]] = True
+        return LabelMatrix(self.kelas, matriks[keep], [labels for labels, k in zip(per_baris, keep) if k])
+
+
+def kodekan(label_series):
+    """(kode int32 per baris, list tuple label per string unik) dari kolom label."""
+    try:
+        kode, unik = pd.factorize(pd.Series(label_series, dtype=None if len(label_series) else object))
+    except TypeError:
+        # Ada nilai list/set (tidak hashable): dikodekan lewat repr-nya
+        kunci = [repr(raw) if isinstance(raw, (list, tuple, set)) else raw for raw in label_series]
+        kode, unik = pd.factorize(np.array(kunci, dtype=object))
+    kode = np.asarray(kode, dtype=np.int32)
+    unik = [tuple(dict.fromkeys(parse_label(raw))) for raw in unik]
+    if (kode < 0).any():
+        # NaN/None: tanpa label
+        kode[kode < 0] = len(unik)
+        unik.append(())
+    return kode, unik
+
+
+def dari_kode(kode, unik, kelas=None):
+    kelas = list(kelas) if kelas is not None else []
+    dikenal = set(kelas)
+    for labels in unik:
+        for lbl in labels:
+            if lbl not in dikenal:
+                dikenal.add(lbl)
+                kelas.append(lbl)
+
+    kolom = {lbl: j for j, lbl in enumerate(kelas)}
+    matriks_unik = np.zeros((len(unik), len(kelas)), dtype=bool)
+    for u, labels in enumerate(unik):
+        matriks_unik[u, [kolom[lbl] for lbl in labels]] = True
+    kode = np.asarray(kode)
+    per_baris = [unik[k] for k in kode.tolist()]
+    return LabelMatrix(kelas, matriks_unik[kode], per_baris)
+
+
+def bangun_label_matrix(label_series, kelas=None):
+    return dari_kode(*kodekan(label_series), kelas)
+
+
+def hitung_label(label_series):
+    return bangun_label_matrix(label_series).jumlah
@@ -0,0 +1,192 @@
+"""Lapisan copy-on-write per baris di atas korpus dasar.
+
+Sebelumnya setiap delta admin menyalin seluruh DataFrame korpus, menyusun
+ulang matriks TF-IDF (``vstack``) dan menyalin dict indeks hash, jadi biaya
+satu edit sebanding dengan ukuran korpus. Di sini korpus dasar (DataFrame,
+matriks TF-IDF, matriks LSA) tidak pernah diubah; baris yang ditambah atau
+diedit sejak pemadatan terakhir disimpan di ``Lapisan`` kecil yang disalin
+per perubahan, dan dict dasar di ``PetaBerlapis`` dengan dict perubahan di
+atasnya. Biaya satu perubahan sebanding dengan baris yang berubah (dan ukuran
+lapisan, yang dibatasi pemadatan berkala di risda/index_manager.py).
+
+Posisi baris (id baris di retrieval) bersifat logis: 0..n-1, baris dasar
+memakai posisinya sendiri kecuali ditimpa lapisan, baris baru mendapat posisi
+>= jumlah baris dasar.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# PetaBerlapis dilipat ke dict dasar setelah lapisan perubahannya sebesar ini
+BATAS_PETA = 2048
+
+_HAPUS = None
+
+
+class PetaBerlapis:
+    """dict dasar (tidak pernah diubah) + dict perubahan kecil; nilai None = kunci dihapus."""
+
+    def __init__(self, dasar=None, ubahan=None, n=None):
+        self.dasar = dasar if dasar is not None else {}
+        self.ubahan = ubahan if ubahan is not None else {}
+        self.n = n if n is not None else len(self.dasar)
+
+    def get(self, kunci, default=None):
+        nilai = self.ubahan[kunci] if kunci in self.ubahan else self.dasar.get(kunci)
+        return default if nilai is _HAPUS else nilai
+
+    def __contains__(self, kunci):
+        return self.get(kunci) is not None
+
+    def __len__(self):
+        return self.n
+
+    def items(self):
+        for kunci, nilai in self.dasar.items():
+            if kunci not in self.ubahan:
+                yield kunci, nilai
+        for kunci, nilai in self.ubahan.items():
+            if nilai is not _HAPUS:
+                yield kunci, nilai
+
+    def sebagai_dict(self):
+        return dict(self.items())
+
+    def dengan(self, pasangan=(), hapus=()):
+        """Salinan baru dengan ``pasangan`` (kunci, nilai) diset dan kunci ``hapus`` dibuang."""
+        ubahan, n = dict(self.ubahan), self.n
+
+        def ada(kunci):
+            return ubahan[kunci] is not _HAPUS if kunci in ubahan else kunci in self.dasar
+        for kunci in hapus:
+            if ada(kunci):
+                n -= 1
+            if kunci in self.dasar:
+                ubahan[kunci] = _HAPUS
+            else:
+                ubahan.pop(kunci, None)
+        for kunci, nilai in pasangan:
+            if not ada(kunci):
+                n += 1
+            ubahan[kunci] = nilai
+        if len(ubahan) > BATAS_PETA:
+            # Dilipat sesekali (O(n)), jadi biaya per perubahan tetap terbatas
+            dasar = dict(self.dasar)
+            for kunci, nilai in ubahan.items():
+                if nilai is _HAPUS:
+                    dasar.pop(kunci, None)
+                else:
+                    dasar[kunci] = nilai
+            return PetaBerlapis(dasar, {}, len(dasar))
+        return PetaBerlapis(self.dasar, ubahan, n)
+
+
+class Lapisan:
+    """Baris yang ditambah/diubah sejak korpus dasar dipadatkan, terurut posisi logis."""
+
+    def __init__(self, n_dasar, posisi=None, data=None, tfidf=None, dense=None):
+        self.n_dasar = n_dasar
+        self.posisi = posisi if posisi is not None else np.empty(0, dtype=np.int64)
+        self.data = data
+        self.tfidf = tfidf
+        self.dense = dense
+
+    def __len__(self):
+        return len(self.posisi)
+
+    def cari(self, ids):
+        """Indeks baris lapisan untuk setiap posisi di ``ids``, -1 bila baris dasar."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.posisi):
+            return np.full(len(ids), -1, dtype=np.int64)
+        j = np.minimum(np.searchsorted(self.posisi, ids), len(self.posisi) - 1)
+        return np.where(self.posisi[j] == ids, j, -1)
+
+    def dengan(self, posisi, data, tfidf, dense=None):
+        """Salinan baru dengan baris di ``posisi`` diganti/ditambah; biaya O(lapisan + baris baru)."""
+        posisi = np.asarray(posisi, dtype=np.int64)
+        if not len(self):
+            tetap = np.empty(0, dtype=np.int64)
+            bagian = [(data, tfidf, dense)]
+        else:
+            tetap = np.flatnonzero(~np.isin(self.posisi, posisi))
+            bagian = [(self.data.iloc[tetap], self.tfidf[tetap],
+                       self.dense[tetap] if self.dense is not None else None), (data, tfidf, dense)]
+        semua = np.concatenate([self.posisi[tetap], posisi])
+        urut = np.argsort(semua, kind="stable")
+        data = pd.concat([b[0] for b in bagian], ignore_index=True).iloc[urut].reset_index(drop=True)
+        tfidf = sp.vstack([b[1] for b in bagian], format="csr")[urut]
+        dense = np.concatenate([b[2] for b in bagian])[urut] if all(b[2] is not None for b in bagian) else None
+        return Lapisan(self.n_dasar, semua[urut], data, tfidf, dense)
+
+    def _indeks_gabung(self, n):
+        # Posisi logis -> baris di gabungan [dasar, lapisan]
+        idx = np.arange(n, dtype=np.int64)
+        idx[self.posisi] = self.n_dasar + np.arange(len(self.posisi))
+        return idx
+
+    # === Tampilan penuh (O(n), hanya untuk jalur dingin: pemadatan, batch, LSA, admin) ===
+    def gabung_data(self, dasar, n):
+        if not len(self):
+            return dasar
+        return pd.concat([dasar, self.data], ignore_index=True).iloc[self._indeks_gabung(n)].reset_index(drop=True)
+
+    def gabung_kolom(self, dasar, kolom, n):
+        if not len(self):
+            return dasar[kolom]
+        gabungan = pd.concat([dasar[kolom], self.data[kolom]], ignore_index=True)
+        return gabungan.iloc[self._indeks_gabung(n)].reset_index(drop=True)
+
+    def gabung_tfidf(self, dasar, n):
+        if not len(self):
+            return dasar
+        return sp.vstack([dasar, self.tfidf], format="csr")[self._indeks_gabung(n)]
+
+    def gabung_dense(self, dasar, n):
+        if dasar is None or not len(self):
+            return dasar
+        return np.concatenate([dasar, self.dense])[self._indeks_gabung(n)]
+
+    # === Akses per baris (O(k)) ===
+    def _pisah(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        j = self.cari(ids)
+        di_lapisan = j >= 0
+        # Urutan baris gabungan [bagian dasar, bagian lapisan] kembali ke urutan ids
+        urutan = np.empty(len(ids), dtype=np.int64)
+        n_dasar = int((~di_lapisan).sum())
+        urutan[~di_lapisan] = np.arange(n_dasar)
+        urutan[di_lapisan] = n_dasar + np.arange(len(ids) - n_dasar)
+        return ids[~di_lapisan], j[di_lapisan], urutan
+
+    def baris(self, dasar, ids, kolom=None):
+        if kolom is not None:
+            dasar = dasar[kolom]
+        if not len(self):
+            return dasar.iloc[ids]
+        ids_dasar, j, urutan = self._pisah(ids)
+        if not len(j):
+            return dasar.iloc[ids_dasar]
+        lapisan = self.data if kolom is None else self.data[kolom]
+        hasil = pd.concat([dasar.iloc[ids_dasar], lapisan.iloc[j]]).iloc[urutan]
+        hasil.index = np.asarray(ids, dtype=np.int64)
+        return hasil
+
+    def tfidf_baris(self, dasar, ids):
+        if not len(self):
+            return dasar[ids]
+        ids_dasar, j, urutan = self._pisah(ids)
+        if not len(j):
+            return dasar[ids_dasar]
+        return sp.vstack([dasar[ids_dasar], self.tfidf[j]], format="csr")[urutan]
+
+    def skor(self, dasar, lapisan, q, n):
+        """``gabungan @ q`` tanpa menyusun gabungan: skor dasar lalu baris lapisan ditimpa."""
+        skor = dasar @ q
+        if not len(self):
+            return skor
+        hasil = np.zeros(n, dtype=skor.dtype)
+        hasil[:len(skor)] = skor
+        hasil[self.posisi] = lapisan @ q
+        return hasil
@@ -0,0 +1,135 @@
+"""Mode retrieval LSA opsional: TF-IDF diproyeksikan ke ruang padat berdimensi kecil.
+
+Proyeksi TruncatedSVD dilatih sekali dari matriks TF-IDF korpus lalu disimpan
+di samping tfidf_vectorizer.pkl (``lsa_proyeksi.pkl``). Saat aktif, korpus
+disimpan sebagai matriks float32 n x k (k ~ 128-300) yang sudah dinormalisasi
+L2, sehingga skoring sebuah query cukup satu perkalian matriks-vektor BLAS dan
+kata yang berdekatan maknanya ikut cocok.
+
+Mode dipilih per deployment lewat environment ``RISDA_RETRIEVAL=lsa``
+(default ``sparse`` = cosine TF-IDF persis). Bila berkas proyeksi belum ada
+atau tidak cocok dengan vectorizer, retrieval tetap memakai jalur sparse.
+``RISDA_LSA_RERANK=f`` (f > 0) mengambil f x top_n kandidat dari LSA lalu
+mengurutkannya ulang dengan cosine sparse persis; recall terhadap peringkat
+persis naik, biayanya sebanding f x top_n baris.
+
+    python -m risda.lsa latih --komponen 200
+    python -m risda.lsa evaluasi --k 20 --query 200
+"""
+
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+
+LSA_PATH = "lsa_proyeksi.pkl"
+N_KOMPONEN = 200
+AKTIF = os.environ.get("RISDA_RETRIEVAL", "sparse").lower() == "lsa"
+FAKTOR_RERANK = int(os.environ.get("RISDA_LSA_RERANK", "0"))
+
+
+class ProyeksiLSA:
+    def __init__(self, komponen):
+        # komponen: k x n_fitur (baris = vektor singular kanan)
+        self.komponen = np.ascontiguousarray(komponen, dtype=np.float32)
+
+    @property
+    def n_fitur(self):
+        return self.komponen.shape[1]
+
+    def transform(self, X):
+        padat = np.asarray(X @ self.komponen.T, dtype=np.float32)
+        norma = np.linalg.norm(padat, axis=1, keepdims=True)
+        np.divide(padat, norma, out=padat, where=norma > 0)
+        return padat
+
+
+def latih(tfidf_matrix, n_komponen=N_KOMPONEN, seed=0):
+    from sklearn.decomposition import TruncatedSVD
+
+    n_komponen = min(n_komponen, min(tfidf_matrix.shape) - 1)
+    svd = TruncatedSVD(n_components=n_komponen, algorithm="randomized", random_state=seed)
+    svd.fit(tfidf_matrix)
+    return ProyeksiLSA(svd.components_)
+
+
+def simpan(proyeksi, path=LSA_PATH):
+    # Disimpan sebagai array biasa agar berkas tidak bergantung pada nama kelas ini
+    joblib.dump({"komponen": proyeksi.komponen}, path)
+
+
+def muat(path=LSA_PATH, vectorizer=None):
+    """Proyeksi tersimpan, atau None bila belum dilatih / tidak cocok dengan vectorizer."""
+    if not os.path.exists(path):
+        return None
+    proyeksi = ProyeksiLSA(joblib.load(path)["komponen"])
+    if vectorizer is not None and proyeksi.n_fitur != len(vectorizer.vocabulary_):
+        return None
+    return proyeksi
+
+
+def evaluasi(res, proyeksi, queries, k=20, faktor_rerank=(0, 5, 20)):
+    """Recall@k LSA (dengan/tanpa rerank) terhadap peringkat cosine sparse persis, plus latensinya."""
+    from risda import retrieval
+
+    res = res.tanpa_lapisan()
+    res = res.ganti(proyeksi=proyeksi, dense_dasar=proyeksi.transform(res.tfidf_dasar))
+    recall = {f: [] for f in faktor_rerank}
+    ms_sparse, ms_lsa = [], {f: [] for f in faktor_rerank}
+    for q in queries:
+        q_vec = res.vectorizer.transform([q])
+        mulai = time.perf_counter()
+        skor = (res.tfidf_matrix @ q_vec.T).toarray().ravel()
+        persis, _ = retrieval.top_k(skor, k, 0, res.alive)
+        ms_sparse.append(time.perf_counter() - mulai)
+
+        for f in faktor_rerank:
+            mulai = time.perf_counter()
+            perkiraan, _ = retrieval.rekomendasi_lsa(res, q, k, None, faktor_rerank=f)
+            ms_lsa[f].append(time.perf_counter() - mulai)
+            if len(persis):
+                recall[f].append(len(np.intersect1d(persis, perkiraan)) / len(persis))
+    hasil = {"k": k, "query": len(queries), "sparse_ms": float(np.mean(ms_sparse) * 1000)}
+    for f in faktor_rerank:
+        hasil[f"recall_rerank{f}"] = float(np.mean(recall[f])) if recall[f] else None
+        hasil[f"lsa_rerank{f}_ms"] = float(np.mean(ms_lsa[f]) * 1000)
+    hasil["memori_sparse_mb"] = (res.tfidf_matrix.data.nbytes + res.tfidf_matrix.indices.nbytes
+                                 + res.tfidf_matrix.indptr.nbytes) / 2**20
+    hasil["memori_lsa_mb"] = res.dense.nbytes / 2**20
+    return hasil
+
+
+def main(argv=None):
+    from risda import resources
+
+    parser = argparse.ArgumentParser(description="Latih / evaluasi proyeksi LSA untuk retrieval")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    p_latih = sub.add_parser("latih")
+    p_latih.add_argument("--komponen", type=int, default=N_KOMPONEN)
+    p_eval = sub.add_parser("evaluasi")
+    p_eval.add_argument("--k", type=int, default=20)
+    p_eval.add_argument("--query", type=int, default=200, help="jumlah judul korpus yang dipakai sebagai query")
+    args = parser.parse_args(argv)
+
+    res = resources.get_resources()
+    if args.perintah == "latih":
+        mulai = time.perf_counter()
+        proyeksi = latih(res.tfidf_matrix[res.alive], args.komponen)
+        simpan(proyeksi)
+        print(f"{proyeksi.komponen.shape[0]} komponen disimpan ke {LSA_PATH} "
+              f"({time.perf_counter() - mulai:.1f} detik)")
+        return
+
+    proyeksi = muat(vectorizer=res.vectorizer)
+    if proyeksi is None:
+        parser.error(f"{LSA_PATH} belum ada atau tidak cocok dengan vectorizer; jalankan 'latih' dulu")
+    rng = np.random.default_rng(0)
+    ids = rng.choice(res.live_ids(), size=min(args.query, int(res.alive.sum())), replace=False)
+    for kunci, nilai in evaluasi(res, proyeksi, res.baris(ids, "judul").tolist(), args.k).items():
+        print(f"{kunci:<20} {nilai:.4f}" if isinstance(nilai, float) else f"{kunci:<20} {nilai}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Pekerjaan latar untuk operasi admin yang lambat, dengan progres yang bisa dipantau.
+
+Klasifikasi upload CSV, bangun ulang indeks dan rekomendasi batch tidak lagi
+dijalankan di dalam rerun Streamlit. Halaman cukup memanggil ``kirim(jenis,
+...)``: pekerjaan dicatat di tabel ``pekerjaan`` (risda.db) lalu dijalankan
+thread pool proses ini, sehingga rerun tetap cepat dan pekerjaan tidak ikut
+hilang bila browser admin terputus. Status (antre, berjalan, selesai, gagal),
+progres 0..1, pesan tahap dan laporan hasil (JSON) ditulis ke tabel yang sama
+dan ditampilkan di halaman admin.
+
+Setiap proses punya token acak (``TOKEN``) dan memegang sewa atas pekerjaan
+yang dijalankannya; sewa diperpanjang tiap ``INTERVAL_DETAK`` detik. Pekerjaan
+yang sewanya habis (proses mati, mis. server di-restart saat upload, di
+replika mana pun yang berbagi risda.db) diambil alih oleh proses lain atau
+proses baru; PID tidak dipakai karena bisa sama setelah restart kontainer.
+Pekerjaan di sini aman diulang karena baris duplikat ditolak saat ditulis
+(risda/dedup.py). Berkas masukan besar
+(CSV upload) disimpan di folder ``pekerjaan/``, bukan di tabel.
+
+Jumlah worker diatur lewat ``RISDA_WORKER_PEKERJAAN`` (default 1: pekerjaan
+yang menulis korpus dijalankan berurutan).
+"""
+
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from risda import storage, tracing
+
+N_WORKER = int(os.environ.get("RISDA_WORKER_PEKERJAAN", "1"))
+FOLDER = "pekerjaan"
+INTERVAL_LAPOR = 0.5
+# Sewa pekerjaan berjalan (detik); diperpanjang tiap INTERVAL_DETAK selama prosesnya hidup
+SEWA_DETIK = 60
+INTERVAL_DETAK = 15
+UKURAN_BATCH_UPLOAD = 1000
+
+SELESAI = ("selesai", "gagal")
+
+# Pemilik pekerjaan yang dijalankan proses ini (unik per start, tidak seperti PID)
+TOKEN = uuid.uuid4().hex
+
+_jenis = {}
+_pool = {"executor": None}
+_pool_lock = threading.Lock()
+# Id pekerjaan yang sudah dijadwalkan di executor proses ini dan belum selesai
+_dijadwalkan = set()
+_dijadwalkan_lock = threading.Lock()
+
+
+def jenis(nama, label):
+    """Daftarkan fungsi ``fn(parameter, lapor) -> hasil`` sebagai jenis pekerjaan ``nama``."""
+    def daftar(fn):
+        _jenis[nama] = (fn, label)
+        return fn
+    return daftar
+
+
+def label(nama):
+    return _jenis[nama][1] if nama in _jenis else nama
+
+
+class _Lapor:
+    """Callback progres; penulisan ke tabel dibatasi satu kali per ``INTERVAL_LAPOR`` detik."""
+
+    def __init__(self, pekerjaan_id):
+        self.pekerjaan_id = pekerjaan_id
+        self._terakhir = 0.0
+        self._pesan = None
+
+    def __call__(self, progres, pesan=None):
+        sekarang = time.monotonic()
+        ganti_tahap = pesan is not None and pesan != self._pesan
+        if sekarang - self._terakhir < INTERVAL_LAPOR and progres < 1 and not ganti_tahap:
+            return
+        self._terakhir = sekarang
+        kolom = {"progres": float(min(max(progres, 0.0), 1.0))}
+        if pesan is not None:
+            kolom["pesan"] = self._pesan = pesan
+        storage.ubah_pekerjaan(self.pekerjaan_id, **kolom)
+
+
+def _executor():
+    with _pool_lock:
+        if _pool["executor"] is None:
+            _pool["executor"] = ThreadPoolExecutor(N_WORKER, thread_name_prefix="risda-pekerjaan")
+            _lanjutkan(_pool["executor"])
+            threading.Thread(target=_detak, args=(_pool["executor"],), name="risda-pekerjaan-detak",
+                             daemon=True).start()
+        return _pool["executor"]
+
+
+def _jadwalkan(executor, pekerjaan_id):
+    with _dijadwalkan_lock:
+        if pekerjaan_id in _dijadwalkan:
+            return
+        _dijadwalkan.add(pekerjaan_id)
+    executor.submit(_jalankan, pekerjaan_id)
+
+
+def _lanjutkan(executor):
+    # Pekerjaan yang masih antre, atau berjalan dengan sewa yang sudah habis, dijadwalkan ulang
+    for pekerjaan_id in storage.pekerjaan_tertunda(time.time()):
+        _jadwalkan(executor, pekerjaan_id)
+
+
+def _detak(executor):
+    while True:
+        time.sleep(INTERVAL_DETAK)
+        try:
+            storage.perpanjang_sewa(TOKEN, time.time() + SEWA_DETIK)
+            _lanjutkan(executor)
+        except Exception:  # noqa: BLE001 - mis. risda.db terkunci sesaat; dicoba lagi di detak berikutnya
+            pass
+
+
+def lanjutkan():
+    """Mulai worker dan jadwalkan ulang pekerjaan tertunda dari proses sebelumnya."""
+    _executor()
+
+
+def kirim(nama_jenis, **parameter):
+    """Catat pekerjaan baru lalu jalankan di latar; mengembalikan id pekerjaan."""
+    if nama_jenis not in _jenis:
+        raise ValueError(f"jenis pekerjaan tidak dikenal: {nama_jenis}")
+    pekerjaan_id = storage.tambah_pekerjaan(nama_jenis, parameter)
+    _jadwalkan(_executor(), pekerjaan_id)
+    return pekerjaan_id
+
+
+def _jalankan(pekerjaan_id):
+    try:
+        _jalankan_klaim(pekerjaan_id)
+    finally:
+        with _dijadwalkan_lock:
+            _dijadwalkan.discard(pekerjaan_id)
+
+
+def _jalankan_klaim(pekerjaan_id):
+    waktu = time.time()
+    if not storage.klaim_pekerjaan(pekerjaan_id, TOKEN, waktu + SEWA_DETIK, waktu):
+        return  # sudah diambil proses lain
+    info = storage.ambil_pekerjaan(pekerjaan_id)
+    fn = _jenis[info["jenis"]][0]
+    lapor = _Lapor(pekerjaan_id)
+    try:
+        with tracing.jejak("pekerjaan", info["jenis"]):
+            hasil = fn(info["parameter"], lapor)
+    except Exception as e:
+        storage.ubah_pekerjaan(pekerjaan_id, status="gagal", selesai=storage.sekarang(),
+                               galat=f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}")
+        return
+    storage.ubah_pekerjaan(pekerjaan_id, status="selesai", progres=1.0, pesan="selesai",
+                           selesai=storage.sekarang(), hasil=json.dumps(hasil, ensure_ascii=False, default=str))
+
+
+def daftar(n=20):
+    """Pekerjaan terbaru (DataFrame: id, jenis, status, progres, pesan, dibuat, mulai, selesai)."""
+    return storage.pekerjaan_df(n)
+
+
+def ambil(pekerjaan_id):
+    """Baris lengkap satu pekerjaan, termasuk ``parameter``, ``hasil`` dan ``galat``."""
+    return storage.ambil_pekerjaan(pekerjaan_id)
+
+
+def simpan_berkas(df, awalan):
+    """Simpan DataFrame masukan pekerjaan ke ``pekerjaan/``; path-nya dipakai sebagai parameter."""
+    os.makedirs(FOLDER, exist_ok=True)
+    path = os.path.join(FOLDER, f"{awalan}-{time.time_ns()}.csv")
+    tmp = f"{path}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+# === Jenis pekerjaan ===
+@jenis("upload", "Upload CSV inovasi")
+def _upload(parameter, lapor):
+    from risda import classify, index_manager, resources
+
+    df = pd.read_csv(parameter["berkas"])
+    res = resources.get_resources()
+    lapor(0.0, f"klasifikasi {len(df)} baris")
+    df["label"], statistik = classify.klasifikasi_batch(
+        res.model, res.mlb, df, UKURAN_BATCH_UPLOAD,
+        progres=lambda p: lapor(0.9 * p, "klasifikasi"))
+    lapor(0.9, "menyimpan ke korpus")
+    tersimpan, duplikat = index_manager.tambah(df)
+    try:
+        os.remove(parameter["berkas"])
+    except OSError:
+        pass
+    return {
+        "baris": len(df),
+        "tersimpan": len(tersimpan),
+        "id_baru": tersimpan["id"].tolist(),
+        "duplikat": len(duplikat),
+        # duplikat_dari: id inovasi yang isinya sama, -1 = baris sebelumnya di CSV ini
+        "baris_duplikat": json.loads(duplikat[["duplikat_dari", "judul", "sinopsis"]].to_json(orient="records")),
+        "klasifikasi": statistik,
+    }
+
+
+@jenis("bangun_indeks", "Bangun ulang indeks")
+def _bangun_indeks(parameter, lapor):
+    from risda import resources, snapshot
+
+    lapor(0.05, "memuat CSV + jurnal, vektorisasi, indeks")
+    mulai = time.perf_counter()
+    manifest = snapshot.bangun_ulang()
+    res = resources.get_resources()
+    return {"baris": int(res.alive.sum()), "versi": res.version, "detik": time.perf_counter() - mulai,
+            "snapshot": manifest["id"] if manifest else None}
+
+
+@jenis("rekomendasi_batch", "Rekomendasi batch semua permasalahan")
+def _rekomendasi_batch(parameter, lapor):
+    from risda import batch, resources
+
+    k = int(parameter.get("k", batch.K))
+    path = parameter.get("out", batch.PATH_HASIL)
+    permasalahan = storage.semua_permasalahan()
+    res = resources.get_resources()
+    teks = [batch.teks_permasalahan(j, d) for j, d in zip(permasalahan["Judul"], permasalahan["Deskripsi"])]
+    ids, skor = batch.rekomendasi_batch(res, teks, k, progres=lambda p: lapor(0.95 * p, "skoring"))
+    hasil = batch.tabel_hasil(res, permasalahan, ids, skor)
+    batch.tulis(hasil, path)
+    return {"permasalahan": len(permasalahan), "baris": len(hasil), "k": k, "berkas": path}
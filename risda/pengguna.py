@@ -0,0 +1,101 @@
+"""Direktori user di memori dan password bersalt.
+
+Login, profil (nama untuk histori permasalahan) dan cek username saat daftar
+cukup satu lookup dict ``username -> user``. Dict dibangun sekali dari tabel
+``users`` dan dibangun ulang hanya bila ``storage.versi_users()`` berubah;
+versi itu dinaikkan trigger SQLite, jadi perubahan dari proses lain (API,
+worker, sqlite3 manual) juga terdeteksi.
+
+Password disimpan sebagai ``pbkdf2_sha256$iterasi$salt$hash`` (hex) dan dicek
+dengan ``hmac.compare_digest``. Username yang tidak ada tetap menghitung
+PBKDF2 agar waktu respons tidak membocorkan username yang terdaftar. Password
+teks lama (hasil impor users.csv) di-hash otomatis saat direktori pertama
+kali dimuat.
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+
+from risda import storage
+
+ALGORITMA = "pbkdf2_sha256"
+ITERASI = 600_000
+PANJANG_SALT = 16
+
+_lock = threading.Lock()
+_cache = {"versi": None, "user": {}}
+_dummy = {"hash": None}
+
+
+def hash_password(password, salt=None, iterasi=ITERASI):
+    salt = os.urandom(PANJANG_SALT) if salt is None else salt
+    kunci = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterasi)
+    return f"{ALGORITMA}${iterasi}${salt.hex()}${kunci.hex()}"
+
+
+def sudah_hash(tersimpan):
+    return isinstance(tersimpan, str) and tersimpan.startswith(f"{ALGORITMA}$")
+
+
+def cocok(password, tersimpan):
+    """Bandingkan ``password`` dengan hash tersimpan dalam waktu konstan."""
+    try:
+        _, iterasi, salt, kunci = tersimpan.split("$")
+        hitung = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), bytes.fromhex(salt), int(iterasi))
+        return hmac.compare_digest(hitung, bytes.fromhex(kunci))
+    except (AttributeError, ValueError):
+        return False
+
+
+def _hash_dummy():
+    if _dummy["hash"] is None:
+        _dummy["hash"] = hash_password("")
+    return _dummy["hash"]
+
+
+def _muat():
+    # Versi dibaca sebelum isi tabel: perubahan di antaranya memicu muat ulang berikutnya
+    versi = storage.versi_users()
+    users = storage.load_users().to_dict("records")
+    # Migrasi satu kali: password teks dari users.csv diganti hash
+    lama = [(u["username"], hash_password(u["password"] or "")) for u in users if not sudah_hash(u["password"])]
+    if lama:
+        storage.ubah_password(lama)
+        return _muat()
+    return versi, {u["username"]: u for u in users}
+
+
+def _direktori():
+    versi = storage.versi_users()
+    with _lock:
+        if _cache["versi"] != versi:
+            _cache["versi"], _cache["user"] = _muat()
+        return _cache["user"]
+
+
+def cari(username):
+    """Profil user (tanpa password) atau None."""
+    user = _direktori().get(username)
+    return {k: v for k, v in user.items() if k != "password"} if user else None
+
+
+def ada(username):
+    return username in _direktori()
+
+
+def verifikasi(username, password):
+    """Profil user bila username dan password cocok, selain itu None."""
+    user = _direktori().get(username)
+    tersimpan = user["password"] if user else _hash_dummy()
+    if not cocok(password, tersimpan) or user is None:
+        return None
+    return cari(username)
+
+
+def daftar(username, password, name, email, phone, institution):
+    """Simpan user baru dengan password bersalt; False bila username sudah dipakai."""
+    if ada(username):
+        return False  # tidak perlu menghitung PBKDF2
+    return storage.save_user(username, hash_password(password), name, email, phone, institution)
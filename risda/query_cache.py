@@ -0,0 +1,112 @@
+"""Cache hasil query (LRU + TTL) untuk rekomendasi dan pencarian kata kunci.
+
+Teks masalah yang sama ("banjir", "sampah", ...) dimasukkan berulang kali oleh
+user pemda yang berbeda. Hasil top-k (id baris dan skor) disimpan dengan kunci
+teks query yang dinormalisasi ditambah versi indeks. Setiap perubahan korpus
+menghasilkan versi baru, sehingga entri lama tidak pernah terpakai lagi dan
+dibuang saat versi berganti.
+
+Ukuran (jumlah entri) dan umur entri diatur per deployment lewat
+``RISDA_CACHE_UKURAN`` (default 1024) dan ``RISDA_CACHE_TTL`` (detik, default 600).
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from risda import tracing
+
+UKURAN = int(os.environ.get("RISDA_CACHE_UKURAN", "1024"))
+TTL_DETIK = float(os.environ.get("RISDA_CACHE_TTL", "600"))
+
+
+def normalisasi(teks):
+    return re.sub(r"\s+", " ", str(teks)).strip().lower()
+
+
+def _beku(nilai):
+    # Hasil dibagikan antar sesi, jadi array dibuat read-only
+    if isinstance(nilai, np.ndarray):
+        nilai = nilai.copy()
+        nilai.setflags(write=False)
+    return nilai
+
+
+class QueryCache:
+    def __init__(self, ukuran=UKURAN, ttl=TTL_DETIK):
+        self.ukuran = ukuran
+        self.ttl = ttl
+        self.hit = 0
+        self.miss = 0
+        self._entri = OrderedDict()
+        self._versi = None
+        self._lock = threading.Lock()
+
+    def atur(self, ukuran=None, ttl=None):
+        with self._lock:
+            if ukuran is not None:
+                self.ukuran = ukuran
+            if ttl is not None:
+                self.ttl = ttl
+            while len(self._entri) > max(self.ukuran, 0):
+                self._entri.popitem(last=False)
+
+    def kosongkan(self):
+        with self._lock:
+            self._entri.clear()
+
+    def _cari(self, kunci, versi, sekarang):
+        if versi != self._versi:
+            # Korpus berubah: semua entri versi lama dibuang sekaligus
+            self._entri.clear()
+            self._versi = versi
+        entri = self._entri.get(kunci)
+        if entri is None or (self.ttl is not None and sekarang - entri[0] > self.ttl):
+            self._entri.pop(kunci, None)
+            return None
+        self._entri.move_to_end(kunci)
+        return entri[1]
+
+    def ambil(self, versi, kunci, hitung):
+        """Hasil dari cache bila ada, kalau tidak ``hitung()`` lalu simpan."""
+        if self.ukuran <= 0:
+            return hitung()
+        with self._lock:
+            hasil = self._cari(kunci, versi, time.monotonic())
+            if hasil is not None:
+                self.hit += 1
+                tracing.catat_cache(True)
+                return hasil
+            self.miss += 1
+        tracing.catat_cache(False)
+
+        # Dihitung di luar lock agar query lain tidak menunggu
+        hasil = hitung()
+        hasil = tuple(_beku(h) for h in hasil) if isinstance(hasil, tuple) else _beku(hasil)
+        with self._lock:
+            if versi == self._versi:
+                self._entri[kunci] = (time.monotonic(), hasil)
+                self._entri.move_to_end(kunci)
+                while len(self._entri) > self.ukuran:
+                    self._entri.popitem(last=False)
+        return hasil
+
+    def statistik(self):
+        with self._lock:
+            total = self.hit + self.miss
+            return {
+                "hit": self.hit,
+                "miss": self.miss,
+                "hit_rate": self.hit / total if total else 0.0,
+                "entri": len(self._entri),
+                "ukuran": self.ukuran,
+                "ttl": self.ttl,
+            }
+
+
+# Satu cache untuk seluruh proses, dipakai bersama oleh semua sesi Streamlit
+cache = QueryCache()
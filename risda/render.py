@@ -0,0 +1,229 @@
+"""Potongan HTML per baris inovasi (kartu & daftar) yang di-cache, dirakit jadi satu payload per halaman.
+
+Setiap baris diubah menjadi tuple isi yang sudah di-escape; tuple itu sendiri
+menjadi kunci cache (hash isi baris), sehingga HTML sebuah inovasi cukup dibuat
+sekali selama isinya tidak berubah. Satu halaman lalu dikirim sebagai satu
+``st.markdown``, bukan beberapa panggilan per baris.
+
+HTML dibuat tanpa baris kosong/indentasi: di dalam satu blok markdown, baris
+kosong akan mengakhiri blok HTML dan baris berindentasi dibaca sebagai kode.
+"""
+
+import html
+import math
+from functools import lru_cache
+
+UKURAN_CACHE = 4096
+
+WARNA_LABEL = {
+    'Air Bersih & Sanitasi': '#a2d5f2',
+    'Banjir': '#f8d7da',
+    'Energi': '#fce38a',
+    'Industri': '#cce5ff',
+    'Infrastruktur': '#e2f0cb',
+    'Kebakaran': '#ffcccc',
+    'Kemacetan': '#f6c6ea',
+    'Kemiskinan & Sosial': '#ffd3b6',
+    'Kesehatan': '#d1ecf1',
+    'Keselamatan': '#fff3cd',
+    'Ketahanan Pangan': '#c3f584',
+    'Limbah': '#ffddcc',
+    'Lingkungan': '#b8f2e6',
+    'Otomasi & Kontrol': '#f0e68c',
+    'Pencemaran Air': '#add8e6',
+    'Pendidikan': '#e2e3e5',
+    'Perkotaan / Permukiman': '#b5ead7',
+    'Perubahan Iklim': '#f4cccc',
+    'Polusi Udara': '#ffe4e1',
+    'Sampah': '#e0bbe4',
+    'Transportasi': '#dadada',
+    'Transportasi Laut / Maritim': '#d0f0c0',
+    'Umum': '#dddddd'
+}
+
+EMOJI_LABEL = {
+    "Air Bersih & Sanitasi": "🚿",
+    "Banjir": "🌊",
+    "Energi": "⚡",
+    "Industri": "🏭",
+    "Infrastruktur": "🛣️",
+    "Kebakaran": "🔥",
+    "Kemacetan": "🚗",
+    "Kemiskinan & Sosial": "🤝",
+    "Kesehatan": "🩺",
+    "Keselamatan": "🛡️",
+    "Ketahanan Pangan": "🌾",
+    "Limbah": "🧴",
+    "Lingkungan": "🌱",
+    "Otomasi & Kontrol": "🤖",
+    "Pencemaran Air": "🚱",
+    "Pendidikan": "📚",
+    "Perkotaan / Permukiman": "🏘️",
+    "Perubahan Iklim": "🌡️",
+    "Polusi Udara": "🌫️",
+    "Sampah": "🗑️",
+    "Transportasi": "🚌",
+    "Transportasi Laut / Maritim": "🚢",
+    "Umum": "📌"
+}
+
+KOLOM = ("judul", "sinopsis", "nama", "email", "afiliasi", "daerah", "tahun", "link")
+
+
+def _rapat(teks):
+    # Template ditulis rapi di sini, dikirim dalam satu baris
+    return " ".join(teks.split())
+
+
+def _aman(nilai, default=""):
+    if nilai is None or (isinstance(nilai, float) and math.isnan(nilai)):
+        return default
+    return html.escape(" ".join(str(nilai).split()))
+
+
+def isi_baris(row, label_list):
+    """Tuple isi baris yang sudah di-escape; dipakai sebagai kunci cache potongan HTML."""
+    isi = {k: _aman(row.get(k)) for k in KOLOM}
+    link = row.get("link")
+    isi["link"] = html.escape(str(link), quote=True) if isinstance(link, str) and link.startswith("http") else ""
+    return tuple(isi[k] for k in KOLOM) + (tuple(label_list),)
+
+
+_BADGE = _rapat("""
+<span style="background-color: {warna}; color: #111; padding: 6px 12px; margin: 4px 6px 4px 0;
+border-radius: 14px; font-size: 13px; display: inline-block; white-space: nowrap;
+box-shadow: 0 1px 3px rgba(0,0,0,0.08);">{label}</span>
+""")
+
+_KARTU = _rapat("""
+<div style="background-color: #fdfdfd; padding: 20px; border-radius: 12px; box-shadow: 0 1px 6px rgba(0,0,0,0.08);
+display: flex; flex-direction: column; justify-content: space-between; min-height: 480px;">
+<div>
+<h4 style="margin-bottom: 0.2rem;">{judul}</h4>
+<div style="font-size: 13px; color: #555;"><b>{tahun}</b> &bull; {label_badges}</div>
+<p style="font-size: 14px; margin-top: 0.8rem;"><b>Peneliti:</b> {peneliti}<br>
+<b>Afiliasi:</b> {afiliasi}<br><b>Daerah:</b> {daerah}</p>
+<div style="margin-top: 14px; font-size: 13px; color: #374151;"><b>📝 Sinopsis:</b>
+<div style="max-height: 100px; overflow-y: auto; padding: 10px; background-color: #ffffff;
+border: 1px solid #e5e7eb; border-radius: 8px; margin-top: 6px;">{sinopsis}</div></div>
+</div>
+{link_html}
+</div>
+""")
+
+_KARTU_LINK = _rapat("""
+<div style="margin-top: 8px;"><a href="{link}" target="_blank"
+style="font-size: 13px; color: #2563eb; text-decoration: none;">🔗 Link Penelitian</a></div>
+""")
+
+_DAFTAR = _rapat("""
+<div style="display: flex; justify-content: space-between; align-items: center; background-color: #f1f5f9;
+padding: 10px 16px; border-radius: 10px 10px 0 0; border: 1px solid #e5e7eb; border-bottom: none;">
+<div style="font-weight: 600; font-size: 15px;">{tahun}</div><div>{label_badges}</div></div>
+<div style="border: 1px solid #e5e7eb; border-top: none; border-radius: 0 0 10px 10px;
+background-color: #ffffff; padding: 16px 20px; margin-bottom: 12px;">
+<h4 style="margin-top: 0; margin-bottom: 8px; color: #1f2937;">{judul}</h4>
+<div style="font-size: 14px; color: #374151;"><b>👤 Nama:</b> {nama}<br><b>📧 Email:</b> {email}<br>
+<b>🏢 Afiliasi:</b> {afiliasi}<br><b>📍 Daerah:</b> {daerah}</div></div>
+<details style="border: 1px solid #e5e7eb; border-radius: 8px; padding: 8px 12px;">
+<summary style="cursor: pointer;">📝 Sinopsis</summary>
+<div style="background-color: #f9fafb; border: 1px solid #e2e8f0; border-radius: 8px; padding: 12px;
+font-size: 14px; color: #374151; max-height: 150px; overflow-y: auto; margin-top: 8px;">
+<b>Sinopsis:</b><br>{sinopsis}</div></details>
+{link_html}
+<hr style="margin: 24px 0;">
+""")
+
+_DAFTAR_LINK = _rapat("""
+<a href="{link}" target="_blank" style="display: inline-block; margin-top: 10px; background-color: #1d4ed8;
+color: white; padding: 6px 14px; font-size: 13px; border-radius: 8px; text-decoration: none;">
+🔗 Kunjungi Penelitian</a>
+""")
+
+_RINGKAS = _rapat("""
+<div class="inovasi-card"><h4>{judul}</h4><p><b>{tahun}</b> — {nama}</p><p>{afiliasi}</p>
+<p><i>{daerah}</i></p><p class="sinopsis">{sinopsis}...</p></div>
+""")
+
+
+_HIGHLIGHT = _rapat("""
+<div class="highlight-card"><h4>{judul}</h4><p><b>{tahun}</b> — {nama}</p><p>{afiliasi}</p></div>
+""")
+
+
+def render_label_badges(label_list):
+    badge_html = "".join(
+        _BADGE.format(warna=WARNA_LABEL.get(label.strip(), "#e2e3e5"), label=html.escape(label))
+        for label in label_list)
+    return f'<div style="margin-top: 8px; display: flex; flex-wrap: wrap;">{badge_html}</div>'
+
+
+def label_with_emoji(label):
+    return f"{EMOJI_LABEL.get(label, '')} {label}"
+
+
+def _isi_dict(isi):
+    return dict(zip(KOLOM, isi[:-1]), labels=isi[-1])
+
+
+@lru_cache(maxsize=UKURAN_CACHE)
+def kartu(isi):
+    d = _isi_dict(isi)
+    peneliti = [p.strip() for p in d["nama"].split(";") if p.strip()]
+    return _KARTU.format(
+        judul=d["judul"], tahun=d["tahun"], afiliasi=d["afiliasi"], daerah=d["daerah"],
+        sinopsis=d["sinopsis"] or "-",
+        label_badges=", ".join(html.escape(label_with_emoji(lbl)) for lbl in d["labels"]),
+        peneliti="; ".join(peneliti[:2]) + (", dkk." if len(peneliti) > 2 else ""),
+        link_html=_KARTU_LINK.format(link=d["link"]) if d["link"] else "",
+    )
+
+
+@lru_cache(maxsize=UKURAN_CACHE)
+def daftar(isi):
+    d = _isi_dict(isi)
+    return _DAFTAR.format(
+        tahun=d["tahun"], label_badges=render_label_badges(d["labels"]), judul=d["judul"],
+        nama=d["nama"], email=d["email"], afiliasi=d["afiliasi"], daerah=d["daerah"],
+        sinopsis=d["sinopsis"] or "-",
+        link_html=_DAFTAR_LINK.format(link=d["link"]) if d["link"] else "",
+    )
+
+
+@lru_cache(maxsize=UKURAN_CACHE)
+def kartu_ringkas(isi):
+    d = _isi_dict(isi)
+    # Dipotong sebelum di-escape ulang agar entitas HTML tidak terpotong di tengah
+    sinopsis = html.escape(html.unescape(d["sinopsis"])[:150])
+    return _RINGKAS.format(judul=d["judul"], tahun=d["tahun"], nama=d["nama"], afiliasi=d["afiliasi"],
+                           daerah=d["daerah"], sinopsis=sinopsis)
+
+
+@lru_cache(maxsize=UKURAN_CACHE)
+def kartu_highlight(isi):
+    d = _isi_dict(isi)
+    return _HIGHLIGHT.format(judul=d["judul"], tahun=d["tahun"], nama=d["nama"], afiliasi=d["afiliasi"])
+
+
+def halaman_kartu(daftar_isi, kolom=3):
+    sel = "".join(f'<div style="min-width: 0;">{kartu(isi)}</div>' for isi in daftar_isi)
+    return (f'<div style="display: grid; grid-template-columns: repeat({kolom}, minmax(0, 1fr)); '
+            f'gap: 16px; margin-bottom: 16px;">{sel}</div>')
+
+
+def halaman_daftar(daftar_isi):
+    return "".join(daftar(isi) for isi in daftar_isi)
+
+
+def grid_highlight(daftar_isi):
+    return '<div class="highlight-grid">' + "".join(kartu_highlight(isi) for isi in daftar_isi) + "</div>"
+
+
+def grid_ringkas(daftar_isi):
+    return '<div class="grid-container">' + "".join(kartu_ringkas(isi) for isi in daftar_isi) + "</div>"
+
+
+def statistik():
+    return {nama: fn.cache_info()._asdict() for nama, fn in
+            [("kartu", kartu), ("daftar", daftar), ("kartu_ringkas", kartu_ringkas),
+             ("kartu_highlight", kartu_highlight)]}
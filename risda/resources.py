@@ -0,0 +1,351 @@
+"""Lapisan sumber daya bersama: korpus, vectorizer, model, dan matriks TF-IDF.
+
+Semua objek dimuat sekali per proses lalu dipakai ulang oleh setiap rerun dan
+setiap sesi Streamlit. Model klasifikasi baru dimuat saat pertama kali dipakai
+(halaman admin / endpoint klasifikasi), bukan saat start. Korpus, matriks TF-IDF
+dan indeks dibaca dari snapshot biner ber-mmap bila masih cocok dengan berkas
+sumber (lihat risda/snapshot.py). Cache otomatis dimuat ulang bila mtime/ukuran sekaligus
+isi (hash) salah satu berkas sumber berubah, misalnya setelah admin menyimpan
+data lewat halaman tambah_inovasi.
+"""
+
+import contextlib
+import copy
+import functools
+import hashlib
+import os
+import threading
+
+import joblib
+import numpy as np
+
+from risda import dedup, journal, lsa, snapshot
+from risda.keyword_index import bangun_indeks
+from risda.lapisan import Lapisan, PetaBerlapis
+from risda.labels import bangun_label_matrix, dari_kode, kodekan
+
+CORPUS_PATH = journal.SNAPSHOT_PATH
+JOURNAL_PATH = journal.JOURNAL_PATH
+VECTORIZER_PATH = "tfidf_vectorizer.pkl"
+MODEL_PATH = "model_kategori.pkl"
+MLB_PATH = "mlb_kategori.pkl"
+LSA_PATH = lsa.LSA_PATH
+
+# Berkas sumber yang dipantau get_resources()
+_SUMBER = (CORPUS_PATH, JOURNAL_PATH, VECTORIZER_PATH, MODEL_PATH, MLB_PATH, LSA_PATH)
+
+_lock = threading.Lock()
+_state = {"resources": None, "stats": {}, "digests": {}, "menulis": 0}
+_version = 0
+
+
+class _Malas:
+    """Nilai yang baru dimuat saat pertama kali diambil; dibagi oleh semua salinan Resources."""
+
+    def __init__(self, muat):
+        self._muat = muat
+        self._lock = threading.Lock()
+        self._nilai = None
+        self._termuat = False
+
+    def ambil(self):
+        if not self._termuat:
+            with self._lock:
+                if not self._termuat:
+                    self._nilai = self._muat()
+                    self._termuat = True
+        return self._nilai
+
+
+class Resources:
+    """Kumpulan objek hasil muat yang dibagi antar sesi (hanya-baca bagi halaman).
+
+    Korpus disimpan sebagai dasar (``data_dasar``, ``tfidf_dasar``, ``dense_dasar``) ditambah
+    ``lapisan`` baris yang diubah admin sejak pemadatan (risda/lapisan.py). Jalur baca memakai
+    ``baris``/``tfidf_baris``/``skor_tfidf``/``skor_dense``; ``data``, ``tfidf_matrix`` dan
+    ``dense`` menyusun tampilan penuh (O(n), sekali per versi) untuk jalur dingin.
+    """
+
+    def __init__(self, data, vectorizer, model, tfidf_matrix, version, keyword_index=None, mlb=None, labels=None,
+                 alive=None, row_id=None, proyeksi=None, dense=None, hash_index=None, lapisan=None, posisi_id=None):
+        self._penuh = {}
+        self.data_dasar = data
+        self.vectorizer = vectorizer
+        self.model = model
+        self.tfidf_dasar = tfidf_matrix
+        self.version = version
+        self.keyword_index = keyword_index
+        self.mlb = mlb
+        self.labels = labels
+        # alive[i] False = baris ke-i sudah dihapus (tombstone) dan menunggu pemadatan
+        self.alive = alive if alive is not None else np.ones(len(data), dtype=bool)
+        # row_id[i] = id stabil (kolom "id" di jurnal/snapshot) milik baris ke-i
+        if row_id is None:
+            row_id = data["id"].to_numpy() if "id" in data.columns else np.arange(len(data))
+        self.row_id = row_id
+        self.lapisan = lapisan if lapisan is not None else Lapisan(len(data))
+        # Hash isi -> id stabil baris hidup, untuk menolak duplikat saat ditulis (risda/dedup.py)
+        if hash_index is None:
+            hash_index = dedup.IndeksHash.dari_data(self.data[self.alive], row_id[self.alive]) \
+                if "hash" in data.columns else dedup.IndeksHash()
+        self.hash_index = hash_index
+        # id stabil -> posisi baris hidup
+        if posisi_id is None:
+            hidup = np.flatnonzero(self.alive)
+            posisi_id = PetaBerlapis(dict(zip(np.asarray(row_id)[hidup].tolist(), hidup.tolist())))
+        self.posisi_id = posisi_id
+        # Mode LSA (risda/lsa.py): proyeksi SVD dan matriks padat float32 korpus, atau None
+        self.proyeksi = proyeksi
+        self.dense_dasar = dense
+
+    @property
+    def model(self):
+        return self._model.ambil() if isinstance(self._model, _Malas) else self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    def _tampilan(self, nama, susun):
+        # Tampilan penuh disusun sekali per objek (versi); dasar tanpa lapisan dipakai langsung
+        if nama not in self._penuh:
+            self._penuh[nama] = susun()
+        return self._penuh[nama]
+
+    @property
+    def data(self):
+        return self._tampilan("data", lambda: self.lapisan.gabung_data(self.data_dasar, len(self.alive)))
+
+    @property
+    def tfidf_matrix(self):
+        return self._tampilan("tfidf", lambda: self.lapisan.gabung_tfidf(self.tfidf_dasar, len(self.alive)))
+
+    @property
+    def dense(self):
+        return self._tampilan("dense", lambda: self.lapisan.gabung_dense(self.dense_dasar, len(self.alive)))
+
+    def baris(self, ids, kolom=None):
+        """Baris korpus di posisi ``ids`` (urutan sama, indeks = posisi); ``kolom`` membatasi kolomnya."""
+        return self.lapisan.baris(self.data_dasar, ids, kolom)
+
+    def kolom(self, nama):
+        """Satu kolom korpus untuk semua posisi."""
+        return self.lapisan.gabung_kolom(self.data_dasar, nama, len(self.alive))
+
+    def tfidf_baris(self, ids):
+        return self.lapisan.tfidf_baris(self.tfidf_dasar, ids)
+
+    def skor_tfidf(self, q):
+        """Cosine semua posisi terhadap vektor query padat ``q``."""
+        return self.lapisan.skor(self.tfidf_dasar, self.lapisan.tfidf, q, len(self.alive))
+
+    def skor_dense(self, v):
+        return self.lapisan.skor(self.dense_dasar, self.lapisan.dense, v, len(self.alive))
+
+    def live_ids(self):
+        return np.flatnonzero(self.alive)
+
+    def tanpa_lapisan(self):
+        """Salinan dengan lapisan dilebur ke dasar (posisi tetap)."""
+        return self.ganti(data_dasar=self.data, tfidf_dasar=self.tfidf_matrix, dense_dasar=self.dense,
+                          lapisan=Lapisan(len(self.alive)))
+
+    def ganti(self, **perubahan):
+        # Salinan dangkal dengan versi baru; objek lama tetap utuh bagi sesi yang sedang membacanya
+        baru = copy.copy(self)
+        for nama, nilai in perubahan.items():
+            setattr(baru, nama, nilai)
+        baru.version = _next_version()
+        baru._penuh = {}
+        return baru
+
+
+def file_stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def siapkan_korpus(df):
+    data = df.dropna(subset=["judul", "sinopsis", "label"])
+    data = data.reset_index(drop=True)
+    data["gabungan"] = (data["judul"].fillna('') * 3 + " " + data["sinopsis"].fillna('')).astype(str).str.strip()
+    # Isi yang sama (judul + sinopsis, lihat risda/dedup.py) hanya diindeks sekali: yang pertama
+    data["hash"] = dedup.kolom_hash(data)
+    data = data[~data["hash"].duplicated()].reset_index(drop=True)
+    return data
+
+
+def load_corpus():
+    # Snapshot fixr.csv + ekor jurnal perubahan admin (lihat risda/journal.py)
+    return siapkan_korpus(journal.baca())
+
+
+def sidik_sumber(digests=None):
+    """Sha1 berkas sumber snapshot indeks (korpus, jurnal, vectorizer); digest yang ada dipakai ulang."""
+    digests = digests or {}
+    return {p: digests.get(p) or file_digest(p) for p in (CORPUS_PATH, JOURNAL_PATH, VECTORIZER_PATH)}
+
+
+def _muat_korpus_terindeks(vectorizer, digests):
+    # Snapshot biner (risda/snapshot.py) bila cocok dengan berkas sumber; selain itu dari CSV + jurnal
+    sidik = sidik_sumber(digests) if snapshot.AKTIF else None
+    if sidik is not None:
+        hasil = snapshot.muat(sidik)
+        if hasil is not None:
+            return hasil
+    data = load_corpus()
+    tfidf_matrix = vectorizer.transform(data["gabungan"])
+    keyword_index = bangun_indeks(data)
+    kode_label = kodekan(data["label"])
+    if sidik is not None:
+        try:
+            snapshot.simpan(data, tfidf_matrix, keyword_index, kode_label, sidik)
+        except (OSError, TypeError, ValueError):
+            # Folder tidak bisa ditulis, atau kolom campuran (mis. teks + angka hasil edit)
+            # tidak bisa disimpan kolumnar: tetap jalan tanpa snapshot
+            pass
+    return data, tfidf_matrix, keyword_index, kode_label
+
+
+def _next_version():
+    global _version
+    _version += 1
+    return _version
+
+
+def _build(old, changed, digests=None):
+    # Hanya bagian yang berkasnya berubah yang dimuat ulang
+    vectorizer = joblib.load(VECTORIZER_PATH) if old is None or VECTORIZER_PATH in changed else old.vectorizer
+    model = _Malas(functools.partial(joblib.load, MODEL_PATH)) if old is None or MODEL_PATH in changed else old._model
+    mlb = joblib.load(MLB_PATH) if old is None or MLB_PATH in changed else old.mlb
+
+    korpus_berubah = bool(changed & {CORPUS_PATH, JOURNAL_PATH})
+    if old is not None and not korpus_berubah and not changed & {VECTORIZER_PATH, MLB_PATH, LSA_PATH}:
+        return old.ganti(model=model)
+
+    if old is None or korpus_berubah:
+        data, tfidf_matrix, keyword_index, kode_label = _muat_korpus_terindeks(vectorizer, digests)
+        labels = dari_kode(*kode_label, mlb.classes_)
+        alive = row_id = hash_index = None
+    else:
+        # Lapisan dilebur: matriks dibangun ulang dari tampilan penuh
+        data, alive, row_id = old.data, old.alive, old.row_id
+        keyword_index, hash_index = old.keyword_index, old.hash_index
+        tfidf_matrix = vectorizer.transform(data["gabungan"]) if VECTORIZER_PATH in changed else old.tfidf_matrix
+        labels = bangun_label_matrix(data["label"], mlb.classes_) if MLB_PATH in changed else old.labels
+
+    proyeksi = dense = None
+    if lsa.AKTIF:
+        if old is None or VECTORIZER_PATH in changed or LSA_PATH in changed:
+            proyeksi = lsa.muat(LSA_PATH, vectorizer)
+        else:
+            proyeksi = old.proyeksi
+        if proyeksi is not None:
+            dense = old.dense if old is not None and tfidf_matrix is old.tfidf_matrix \
+                and proyeksi is old.proyeksi else proyeksi.transform(tfidf_matrix)
+
+    return Resources(data, vectorizer, model, tfidf_matrix, _next_version(), keyword_index, mlb, labels,
+                     alive=alive, row_id=row_id, proyeksi=proyeksi, dense=dense, hash_index=hash_index)
+
+
+def get_resources():
+    paths = _SUMBER
+    stats = {p: file_stat(p) for p in paths}
+
+    with _lock:
+        current = _state["resources"]
+        # Selama penulis di proses ini sedang menulis, berkas bisa setengah berubah: pembaca
+        # memakai versi termuat (delta penulis menggantinya begitu selesai) tanpa memuat ulang
+        if current is not None and (stats == _state["stats"] or _state["menulis"]):
+            return current
+
+        # mtime berubah: pastikan isinya memang berubah sebelum memuat ulang
+        digests = {
+            p: _state["digests"].get(p) if current is not None and stats[p] == _state["stats"].get(p) else file_digest(p)
+            for p in paths
+        }
+        changed = {p for p in paths if digests[p] != _state["digests"].get(p)}
+
+        if current is None or changed:
+            current = _build(current, changed, digests)
+            _state["resources"] = current
+
+        _state["stats"] = stats
+        _state["digests"] = digests
+        return current
+
+
+@contextlib.contextmanager
+def _menulis():
+    with _lock:
+        _state["menulis"] += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _state["menulis"] -= 1
+
+
+def terapkan_delta(paths, tulis, delta):
+    """Tulis berkas lalu terapkan perubahan yang sama ke sumber daya yang sudah termuat.
+
+    Jika salah satu berkas sudah diubah pihak lain sejak terakhir dimuat, delta tidak
+    diterapkan dan get_resources() berikutnya akan memuat ulang penuh. ``tulis`` menerima
+    sumber daya yang sedang termuat (None bila tertinggal dari berkas), ``delta`` menerima
+    sumber daya lama dan hasil ``tulis()``; hasil ``tulis()`` dikembalikan.
+    """
+    # Penulis diserialkan oleh kunci jurnal; fsync, pemadatan jurnal dan delta berjalan di
+    # luar _lock, yang hanya dipegang sebentar untuk membaca dan menukar referensi
+    with journal.kunci(), _menulis():
+        with _lock:
+            current = _state["resources"]
+            sinkron = current is not None and all(_state["stats"].get(p) == file_stat(p) for p in paths)
+        hasil = tulis(current if sinkron else None)
+        if sinkron:
+            baru = delta(current, hasil)
+            stats = {p: file_stat(p) for p in paths}
+            with _lock:
+                _state["resources"] = baru
+                # Digest dikosongkan agar tidak perlu meng-hash ulang seluruh berkas; perubahan
+                # stat berikutnya (oleh proses lain) tetap memicu muat ulang penuh.
+                _state["stats"] = dict(_state["stats"], **stats)
+                _state["digests"] = dict(_state["digests"], **{p: None for p in paths})
+        return hasil
+
+
+def muat_ulang():
+    """Bangun ulang penuh dari berkas tanpa menahan pembaca, lalu tukar; mengembalikan hasilnya.
+
+    Build (baca CSV, vektorisasi, indeks) berjalan di luar _lock: sampai penukaran, semua
+    rerun dan permintaan API tetap memakai sumber daya lama. Penulis korpus menunggu kunci
+    jurnal agar delta mereka tidak tertimpa hasil build yang lebih lama.
+    """
+    with journal.kunci():
+        stats = {p: file_stat(p) for p in _SUMBER}
+        digests = {p: file_digest(p) for p in _SUMBER}
+        baru = _build(None, set(_SUMBER), digests)
+        with _lock:
+            _state["resources"] = baru
+            _state["stats"] = stats
+            _state["digests"] = digests
+    return baru
+
+
+def invalidate():
+    with _lock:
+        _state["resources"] = None
+        _state["stats"] = {}
+        _state["digests"] = {}
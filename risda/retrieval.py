@@ -0,0 +1,198 @@
+"""Mesin pencarian top-k di atas matriks TF-IDF yang sudah ternormalisasi L2.
+
+Hasil pencarian hanya berupa id baris (posisi logis korpus, lihat
+risda/lapisan.py) dan skor; baris lengkap baru diambil (``res.baris``) untuk
+halaman yang benar-benar ditampilkan.
+Hasil query disimpan di ``query_cache.cache`` per versi indeks.
+
+Pencarian halaman research memakai skor gabungan (``hybrid_ids``): BM25 dari
+indeks kata kunci dan cosine TF-IDF, dihitung sekali atas baris kandidat saja
+dan digabung dengan bobot ``RISDA_BOBOT_BM25`` / ``RISDA_BOBOT_COSINE``.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from risda import agregat, lsa, sharding, tracing
+from risda.query_cache import cache, normalisasi
+
+BOBOT_BM25 = float(os.environ.get("RISDA_BOBOT_BM25", "0.5"))
+BOBOT_COSINE = float(os.environ.get("RISDA_BOBOT_COSINE", "0.5"))
+
+
+@tracing.tahap("transform")
+def vektor_query(res, teks):
+    # Query dipadatkan jadi vektor biasa: matriks sparse x vektor padat ~3x lebih cepat
+    # daripada sparse x sparse, dengan skor per baris yang identik
+    return res.vectorizer.transform([teks]).toarray().ravel()
+
+
+def skor_query(res, teks):
+    # Vectorizer memakai norm='l2', jadi cosine similarity = satu perkalian dot sparse
+    return res.skor_tfidf(vektor_query(res, teks))
+
+
+def top_k(skor, k=None, min_skor=None, mask=None):
+    if mask is None:
+        mask = np.ones(skor.shape[0], dtype=bool)
+    kandidat = np.flatnonzero(mask & (skor > min_skor)) if min_skor is not None else np.flatnonzero(mask)
+    if k is not None and k <= 0:
+        kandidat = kandidat[:0]
+    elif k is not None and k < kandidat.shape[0]:
+        s = skor[kandidat]
+        # Dari yang seri dengan skor ke-k hanya diambil id terkecil sampai genap k (kandidat
+        # terurut id), jadi hasil deterministik, sama dengan skoring per shard, dan yang
+        # diurutkan tetap k baris walau banyak skor seri (mis. skor 0)
+        batas = s[np.argpartition(-s, k - 1)[k - 1]]
+        atas = s > batas
+        seri = np.flatnonzero(s == batas)[:k - int(atas.sum())]
+        kandidat = np.concatenate([kandidat[atas], kandidat[seri]])
+    # Urutkan skor menurun, seri diurutkan berdasarkan id agar hasil stabil
+    urutan = np.lexsort((kandidat, -skor[kandidat]))
+    ids = kandidat[urutan][:k]
+    return ids, skor[ids]
+
+
+def rekomendasi_sparse(res, teks, top_n=None, min_skor=None):
+    q = vektor_query(res, teks)
+    with tracing.tahap("kemiripan"):
+        if sharding.aktif(res.tfidf_dasar):
+            return _top_k_shard_lapisan(res, q, top_n, min_skor)
+        return top_k(res.skor_tfidf(q), top_n, min_skor, res.alive)
+
+
+def _top_k_shard_lapisan(res, q, top_n, min_skor):
+    # Korpus besar: korpus dasar diskor per shard di beberapa core (lihat risda/sharding.py),
+    # baris lapisan (ditambah/diubah admin) diskor terpisah lalu keduanya digabung
+    lapisan = res.lapisan
+    n_dasar = res.tfidf_dasar.shape[0]
+    mask = res.alive[:n_dasar].copy()
+    mask[lapisan.posisi[lapisan.posisi < n_dasar]] = False
+    ids, skor = sharding.top_k_paralel(res.tfidf_dasar, q, top_n, min_skor, mask)
+    if not len(lapisan):
+        return ids, skor
+    j, skor_lapisan = top_k(lapisan.tfidf @ q, top_n, min_skor, res.alive[lapisan.posisi])
+    ids = np.concatenate([ids, lapisan.posisi[j]])
+    skor = np.concatenate([skor, skor_lapisan])
+    urutan = np.lexsort((ids, -skor))[:top_n]
+    return ids[urutan], skor[urutan]
+
+
+def rekomendasi_lsa(res, teks, top_n, min_skor=None, faktor_rerank=None):
+    # Satu perkalian matriks-vektor BLAS di ruang padat (lihat risda/lsa.py)
+    faktor_rerank = lsa.FAKTOR_RERANK if faktor_rerank is None else faktor_rerank
+    with tracing.tahap("transform"):
+        input_vec = res.vectorizer.transform([teks])
+    with tracing.tahap("kemiripan"):
+        skor = res.skor_dense(res.proyeksi.transform(input_vec)[0])
+        if not faktor_rerank:
+            return top_k(skor, top_n, min_skor, res.alive)
+        # Kandidat LSA diurutkan ulang dengan cosine sparse persis (id kandidat terurut agar seri tetap stabil)
+        kandidat = np.sort(top_k(skor, top_n * faktor_rerank, None, res.alive)[0])
+        ids, skor = top_k((res.tfidf_baris(kandidat) @ input_vec.T).toarray().ravel(), top_n, min_skor)
+        return kandidat[ids], skor
+
+
+def rekomendasi_ids(res, teks, top_n=None, min_skor=None):
+    # Baris yang sudah dihapus (tombstone) tidak pernah ikut direkomendasikan.
+    # Skor LSA hampir tidak pernah 0, jadi tanpa top_n (mis. "semua yang mirip" di
+    # halaman research) tetap dipakai cosine sparse yang persis.
+    teks = normalisasi(teks)
+    if top_n is not None and res.dense_dasar is not None:
+        return cache.ambil(res.version, ("lsa", teks, top_n, min_skor),
+                           lambda: rekomendasi_lsa(res, teks, top_n, min_skor))
+    return cache.ambil(res.version, ("rekomendasi", teks, top_n, min_skor),
+                       lambda: rekomendasi_sparse(res, teks, top_n, min_skor))
+
+
+def hybrid(res, teks, bobot_bm25=None, bobot_cosine=None):
+    """(ids, skor) baris hidup yang cocok dengan kata kunci ``teks``, terurut skor gabungan menurun."""
+    bobot_bm25 = BOBOT_BM25 if bobot_bm25 is None else bobot_bm25
+    bobot_cosine = BOBOT_COSINE if bobot_cosine is None else bobot_cosine
+    with tracing.tahap("cari_kata"):
+        # Kandidat = baris yang memuat salah satu kata query (sebagai awalan token). Tokenisasi
+        # vectorizer sama, jadi setiap baris dengan cosine > 0 pasti sudah ada di sini.
+        ids, bm25 = res.keyword_index.bm25(teks, res.alive)
+    if not len(ids):
+        return ids, bm25
+    q = vektor_query(res, teks)
+    with tracing.tahap("kemiripan"):
+        if len(ids) * 4 < len(res.alive):
+            cosine = res.tfidf_baris(ids) @ q
+        else:
+            # Hampir seluruh korpus cocok: satu perkalian penuh lebih murah daripada memotong baris
+            cosine = res.skor_tfidf(q)[ids]
+    skor = bobot_bm25 * bm25 / bm25.max() + bobot_cosine * cosine
+    urutan = np.lexsort((ids, -skor))
+    return ids[urutan], skor[urutan]
+
+
+def hybrid_ids(res, teks, bobot_bm25=None, bobot_cosine=None):
+    teks = normalisasi(teks)
+    return cache.ambil(res.version, ("hybrid", teks, bobot_bm25, bobot_cosine),
+                       lambda: hybrid(res, teks, bobot_bm25, bobot_cosine))
+
+
+def cari_research(res, teks=None, labels=None, tahun_min=None, tahun_maks=None):
+    """Id baris hasil pencarian halaman research.
+
+    Dengan teks: baris yang mengandung kata kuncinya, terurut relevansi (BM25 +
+    cosine, lihat ``hybrid``; korpus bebas judul+sinopsis ganda, lihat
+    risda/dedup.py). Tanpa teks: semua baris hidup, terurut id. Lalu difilter
+    label (minimal satu cocok) dan rentang tahun dengan urutan tetap.
+    """
+    if teks:
+        ids, _ = hybrid_ids(res, teks)
+    else:
+        ids = res.live_ids()
+    with tracing.tahap("filter_urut"):
+        return _filter_label_tahun(res, ids, labels, tahun_min, tahun_maks)
+
+
+def _filter_label_tahun(res, ids, labels, tahun_min, tahun_maks):
+    if labels:
+        ids = ids[res.labels.mask_any(labels)[ids]]
+    if tahun_min is not None or tahun_maks is not None:
+        tahun = pd.to_numeric(res.baris(ids, "tahun"), errors="coerce").to_numpy()
+        cocok = np.ones(len(ids), dtype=bool)
+        if tahun_min is not None:
+            cocok &= tahun >= tahun_min
+        if tahun_maks is not None:
+            cocok &= tahun <= tahun_maks
+        ids = ids[cocok]
+    return ids
+
+
+def halaman_ids(res, ids, halaman, per_halaman, urut="terbaru"):
+    """(id baris halaman ke-``halaman``, total) dari ``ids``; ``ids=None`` = semua baris hidup.
+
+    ``urut``: "terbaru"/"terlama" memakai urutan tahun yang sudah dihitung per versi
+    (agregat.ambil): tanpa filter cukup diiris, dengan filter hanya ``ids`` yang diberi
+    peringkat dan dipilih (argpartition) tanpa mengurutkan seluruh hasil. "relevansi"
+    mempertahankan urutan ``ids`` (hasil ``cari_research`` dengan teks).
+    """
+    awal = (halaman - 1) * per_halaman
+    if urut == "relevansi" and ids is not None:
+        return ids[awal:awal + per_halaman], len(ids)
+    ag = agregat.ambil(res)
+    arah = "terlama" if urut == "terlama" else "terbaru"
+    if ids is None:
+        urutan = ag.urutan[arah]
+        return urutan[awal:awal + per_halaman], len(urutan)
+    total = len(ids)
+    akhir = min(awal + per_halaman, total)
+    if awal >= akhir:
+        return ids[:0], total
+    peringkat = ag.peringkat[arah][ids]
+    pilih = np.argpartition(peringkat, akhir - 1)[:akhir] if akhir < total else np.arange(total)
+    pilih = pilih[np.argsort(peringkat[pilih])]
+    return ids[pilih[awal:akhir]], total
+
+
+def ambil_baris(res, ids, skor=None):
+    hasil = res.baris(ids)
+    if skor is not None:
+        hasil = hasil.assign(similarity=skor)
+    return hasil
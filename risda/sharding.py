@@ -0,0 +1,76 @@
+"""Skoring cosine paralel per shard baris untuk korpus besar.
+
+Matriks TF-IDF (CSR) dibagi menjadi rentang baris yang bersebelahan. Setiap
+shard hanya berupa view atas array data/indices milik matriks asli, jadi tidak
+ada salinan korpus. Setiap shard dihitung di thread pool (perkalian sparse
+scipy dan argpartition numpy melepas GIL), menghasilkan top-k lokalnya, lalu
+hasil digabung. Karena skor per baris dan aturan seri (id terkecil menang)
+sama persis, keluarannya identik dengan ``retrieval.top_k`` satu thread.
+
+Jumlah worker diatur per deployment lewat ``RISDA_WORKER_SKORING`` (default 1 =
+tanpa sharding). Korpus di bawah ``MIN_BARIS`` tetap dihitung satu thread
+karena overhead penjadwalan lebih besar dari hasilnya.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+N_WORKER = int(os.environ.get("RISDA_WORKER_SKORING", "1"))
+MIN_BARIS = 100_000
+
+_pool = {"executor": None, "n": 0}
+_pool_lock = threading.Lock()
+
+
+def _executor(n_worker):
+    with _pool_lock:
+        if _pool["executor"] is None or _pool["n"] != n_worker:
+            if _pool["executor"] is not None:
+                _pool["executor"].shutdown(wait=False)
+            _pool["executor"] = ThreadPoolExecutor(n_worker, thread_name_prefix="risda-skoring")
+            _pool["n"] = n_worker
+        return _pool["executor"]
+
+
+def aktif(matriks, n_worker=None):
+    n_worker = N_WORKER if n_worker is None else n_worker
+    return n_worker > 1 and matriks.shape[0] >= MIN_BARIS
+
+
+def batas_shard(n_baris, n_shard):
+    return np.linspace(0, n_baris, n_shard + 1).astype(np.int64)
+
+
+def _view_baris(matriks, awal, akhir):
+    # Potongan baris CSR tanpa menyalin data/indices
+    indptr = matriks.indptr[awal:akhir + 1]
+    mulai, selesai = indptr[0], indptr[-1]
+    return sp.csr_matrix((matriks.data[mulai:selesai], matriks.indices[mulai:selesai], indptr - mulai),
+                         shape=(akhir - awal, matriks.shape[1]), copy=False)
+
+
+def _top_k_shard(matriks, q, awal, akhir, k, min_skor, mask):
+    from risda.retrieval import top_k
+
+    skor = _view_baris(matriks, awal, akhir) @ q
+    ids, skor = top_k(skor, k, min_skor, mask[awal:akhir] if mask is not None else None)
+    return ids + awal, skor
+
+
+def top_k_paralel(matriks, q, k=None, min_skor=None, mask=None, n_worker=None):
+    """Sama dengan ``top_k(matriks @ q, k, min_skor, mask)`` (q vektor padat), dihitung per shard."""
+    n_worker = N_WORKER if n_worker is None else n_worker
+    batas = batas_shard(matriks.shape[0], n_worker)
+    hasil = list(_executor(n_worker).map(
+        lambda i: _top_k_shard(matriks, q, batas[i], batas[i + 1], k, min_skor, mask),
+        range(n_worker)))
+
+    ids = np.concatenate([h[0] for h in hasil])
+    skor = np.concatenate([h[1] for h in hasil])
+    # Gabungan: skor menurun, seri berdasarkan id, lalu ambil k teratas
+    urutan = np.lexsort((ids, -skor))[:k]
+    return ids[urutan], skor[urutan]
@@ -0,0 +1,212 @@
+"""Snapshot indeks biner: matriks TF-IDF CSR, korpus kolumnar dan indeks kata kunci.
+
+Tanpa snapshot, setiap start proses membaca ulang fixr.csv dengan pandas lalu
+menjalankan ``vectorizer.transform`` dan membangun indeks kata kunci atas
+seluruh baris. Padahal hasilnya hanya berubah bila admin mengubah data.
+
+Setelah sebuah build penuh, hasilnya ditulis ke folder ``indeks/``:
+
+* ``<id>.tfidf_{data,indices,indptr}.npy``: array CSR matriks TF-IDF
+* ``<id>.kata_{indptr,indices,tokens}.npy``: indeks kata kunci (CSC)
+* ``<id>.label_kode.npy`` + ``<id>.label_unik.json``: kolom label yang sudah
+  di-parse (kode per baris, daftar label per string unik)
+* ``<id>.korpus.arrow``: korpus siap pakai (Arrow IPC / feather, kolumnar)
+* ``manifest.json``: sidik (sha1) fixr.csv, jurnal dan vectorizer yang
+  dipakai, bentuk matriks, dan nama berkas di atas
+
+Saat start, array dibuka dengan ``np.load(mmap_mode="r")`` dan korpus dengan
+memory map Arrow, sehingga waktu muat hampir tidak bergantung pada ukuran
+korpus dan beberapa proses berbagi halaman yang sama lewat page cache OS.
+Kolom teks korpus tetap berupa array Arrow di atas memory map (tidak disalin
+menjadi objek Python); baris baru dimaterialisasi saat diambil
+(``res.baris(ids)``). Hanya kolom angka (id, tahun) yang disalin ke numpy.
+Snapshot hanya dipakai bila sidik di manifest sama persis dengan berkas
+sumber saat ini; selain itu dibangun ulang dari CSV seperti biasa.
+
+Manifest ditulis paling akhir dan diganti secara atomik; berkas data memakai
+id build di namanya, jadi proses yang sedang membaca snapshot lama tidak
+terganggu. Nonaktifkan dengan ``RISDA_SNAPSHOT=0``.
+
+    python -m risda.snapshot bangun     # tulis snapshot dari fixr.csv + jurnal
+    python -m risda.snapshot status
+"""
+
+import argparse
+import datetime
+import json
+import os
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from risda import tracing
+
+FOLDER = "indeks"
+MANIFEST = "manifest.json"
+VERSI_FORMAT = 2
+AKTIF = os.environ.get("RISDA_SNAPSHOT", "1") != "0"
+
+_ARRAY = ("tfidf_data", "tfidf_indices", "tfidf_indptr", "kata_indptr", "kata_indices", "kata_tokens", "label_kode")
+
+
+def _path(folder, nama):
+    return os.path.join(folder, nama)
+
+
+def baca_manifest(folder=FOLDER):
+    try:
+        with open(_path(folder, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@tracing.tahap("tulis")
+def simpan(data, tfidf_matrix, keyword_index, kode_label, sidik, folder=FOLDER):
+    """Tulis snapshot untuk korpus tanpa tombstone; ``kode_label`` hasil ``labels.kodekan``,
+    ``sidik`` = {nama berkas sumber: sha1}."""
+    os.makedirs(folder, exist_ok=True)
+    id_build = uuid.uuid4().hex[:12]
+    tfidf_matrix = tfidf_matrix.tocsr()
+    array = {
+        "tfidf_data": tfidf_matrix.data,
+        "tfidf_indices": tfidf_matrix.indices,
+        "tfidf_indptr": tfidf_matrix.indptr,
+        "kata_indptr": np.asarray(keyword_index.indptr),
+        "kata_indices": np.asarray(keyword_index.indices),
+        "kata_tokens": np.asarray(keyword_index.tokens, dtype=str),
+        "label_kode": np.asarray(kode_label[0], dtype=np.int32),
+    }
+    berkas = {}
+    for nama, arr in array.items():
+        berkas[nama] = f"{id_build}.{nama}.npy"
+        np.save(_path(folder, berkas[nama]), np.ascontiguousarray(arr), allow_pickle=False)
+    berkas["label_unik"] = f"{id_build}.label_unik.json"
+    with open(_path(folder, berkas["label_unik"]), "w", encoding="utf-8") as f:
+        json.dump([list(lbl) for lbl in kode_label[1]], f, ensure_ascii=False)
+    berkas["korpus"] = f"{id_build}.korpus.arrow"
+    _tulis_korpus(data, _path(folder, berkas["korpus"]))
+
+    manifest = {
+        "versi": VERSI_FORMAT,
+        "id": id_build,
+        "dibuat": datetime.datetime.now().isoformat(timespec="seconds"),
+        "sidik": sidik,
+        "baris": int(len(data)),
+        "shape": list(tfidf_matrix.shape),
+        "berkas": berkas,
+    }
+    tmp = _path(folder, f"{MANIFEST}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, _path(folder, MANIFEST))
+    _bersihkan(folder, id_build)
+    return manifest
+
+
+def _tulis_korpus(data, path):
+    import pyarrow as pa
+    from pyarrow import feather
+
+    # Semua kolom teks disimpan large_string, tipe yang dipakai array string pandas, agar
+    # saat dimuat tidak ada kolom yang perlu di-cast (= disalin) keluar dari memory map
+    tabel = pa.Table.from_pandas(data.reset_index(drop=True), preserve_index=False)
+    tabel = tabel.cast(pa.schema([f.with_type(pa.large_string()) if pa.types.is_string(f.type) else f
+                                  for f in tabel.schema], metadata=tabel.schema.metadata))
+    feather.write_feather(tabel, path, compression="uncompressed")
+
+
+def _tipe_pandas(tipe):
+    import pyarrow as pa
+
+    # Kolom teks menjadi array string pandas yang membungkus buffer Arrow apa adanya
+    # (zero-copy, NaN untuk kosong seperti hasil read_csv); tipe lain memakai konversi bawaan
+    if pa.types.is_large_string(tipe) or pa.types.is_string(tipe):
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    return None
+
+
+def _bersihkan(folder, id_aktif):
+    # Berkas build lama boleh dihapus meski masih di-mmap proses lain (inode tetap hidup)
+    for nama in os.listdir(folder):
+        if nama != MANIFEST and not nama.startswith(id_aktif + ".") and not nama.endswith(".tmp"):
+            try:
+                os.remove(_path(folder, nama))
+            except OSError:
+                pass
+
+
+@tracing.tahap("muat_snapshot")
+def muat(sidik, folder=FOLDER):
+    """(data, tfidf_matrix, keyword_index, kode_label) dari snapshot yang cocok dengan ``sidik``, atau None."""
+    from pyarrow import feather
+
+    from risda.keyword_index import KeywordIndex
+
+    manifest = baca_manifest(folder)
+    if manifest is None or manifest.get("versi") != VERSI_FORMAT or manifest.get("sidik") != sidik:
+        return None
+    berkas = manifest["berkas"]
+    try:
+        arr = {nama: np.load(_path(folder, berkas[nama]), mmap_mode="r", allow_pickle=False) for nama in _ARRAY}
+        with open(_path(folder, berkas["label_unik"]), encoding="utf-8") as f:
+            label_unik = [tuple(lbl) for lbl in json.load(f)]
+        data = feather.read_table(_path(folder, berkas["korpus"]), memory_map=True).to_pandas(
+            types_mapper=_tipe_pandas)
+    except (FileNotFoundError, KeyError, ValueError):
+        # Snapshot diganti proses lain di tengah pembacaan / berkas rusak: bangun dari CSV
+        return None
+
+    tfidf_matrix = sp.csr_matrix((arr["tfidf_data"], arr["tfidf_indices"], arr["tfidf_indptr"]),
+                                 shape=tuple(manifest["shape"]), copy=False)
+    keyword_index = KeywordIndex(arr["kata_tokens"].tolist(), arr["kata_indptr"], arr["kata_indices"], len(data))
+    return data, tfidf_matrix, keyword_index, (arr["label_kode"], label_unik)
+
+
+def bangun_ulang(folder=FOLDER):
+    """Bangun ulang sumber daya dari CSV + jurnal dan tulis snapshot baru; manifest baru atau None."""
+    from risda import resources
+
+    # Manifest dibuang dulu agar build membaca CSV lalu menulis snapshot baru; sumber daya
+    # lama tetap dilayani ke pembaca sampai hasilnya ditukar (resources.muat_ulang)
+    try:
+        os.remove(_path(folder, MANIFEST))
+    except FileNotFoundError:
+        pass
+    resources.muat_ulang()
+    return baca_manifest(folder)
+
+
+def main(argv=None):
+    from risda import resources
+
+    parser = argparse.ArgumentParser(description="Bangun / periksa snapshot indeks biner")
+    parser.add_argument("perintah", choices=["bangun", "status"])
+    args = parser.parse_args(argv)
+
+    sidik = resources.sidik_sumber()
+    if args.perintah == "status":
+        manifest = baca_manifest()
+        if manifest is None:
+            print(f"belum ada snapshot di {FOLDER}/")
+            return
+        cocok = manifest.get("versi") == VERSI_FORMAT and manifest.get("sidik") == sidik
+        print(f"snapshot {manifest['id']} ({manifest['dibuat']}), {manifest['baris']} baris, "
+              f"{'cocok' if cocok else 'BASI'} dengan berkas sumber")
+        return
+
+    mulai = time.perf_counter()
+    manifest = bangun_ulang()
+    if manifest is None:
+        parser.error(f"snapshot tidak tertulis (RISDA_SNAPSHOT=0 atau {FOLDER}/ tidak bisa ditulis)")
+    print(f"snapshot {manifest['id']} ditulis ke {FOLDER}/ ({manifest['baris']} baris, "
+          f"{time.perf_counter() - mulai:.1f} detik)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""Penyimpanan SQLite untuk user, permasalahan, permintaan kerja sama, tempat sampah inovasi
+dan tabel pekerjaan latar (risda/pekerjaan.py).
+
+Sebelumnya setiap penyimpanan membaca seluruh CSV, menambah satu baris lalu
+menulis ulang berkasnya. Sekarang setiap insert cukup satu INSERT ke B-tree
+SQLite, dan query per user memakai indeks. CSV lama diimpor sekali secara
+otomatis. Ekspor CSV untuk tombol unduh tetap dibuat dari hasil query.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from risda import tracing
+
+DB_PATH = "risda.db"
+
+USERS_CSV = "users.csv"
+PERMASALAHAN_CSV = "permasalahan.csv"
+KERJASAMA_CSV = "form_kerjasama.csv"
+TRASH_CSV = "fixr_trash.csv"
+
+KOLOM_USER = ["username", "password", "name", "email", "phone", "institution"]
+KOLOM_PERMASALAHAN = ["Waktu", "Nama", "Instansi", "Judul", "Deskripsi"]
+KOLOM_KERJASAMA = ["nama", "instansi", "keperluan", "kontak", "tanggal"]
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT, name TEXT, email TEXT, phone TEXT, institution TEXT
+);
+CREATE TABLE IF NOT EXISTS permasalahan (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Waktu TEXT, Nama TEXT, Instansi TEXT, Judul TEXT, Deskripsi TEXT,
+    username TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_permasalahan_username ON permasalahan(username);
+CREATE INDEX IF NOT EXISTS idx_permasalahan_instansi ON permasalahan(Instansi);
+CREATE INDEX IF NOT EXISTS idx_permasalahan_waktu ON permasalahan(Waktu);
+CREATE TABLE IF NOT EXISTS kerjasama (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nama TEXT, instansi TEXT, keperluan TEXT, kontak TEXT, tanggal TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_kerjasama_tanggal ON kerjasama(tanggal);
+CREATE TABLE IF NOT EXISTS trash (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dihapus TEXT,
+    baris TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trash_dihapus ON trash(dihapus);
+CREATE TABLE IF NOT EXISTS pekerjaan (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jenis TEXT, status TEXT, progres REAL, pesan TEXT,
+    parameter TEXT, hasil TEXT, galat TEXT,
+    dibuat TEXT, mulai TEXT, selesai TEXT, pemilik TEXT, sewa REAL
+);
+CREATE INDEX IF NOT EXISTS idx_pekerjaan_status ON pekerjaan(status);
+CREATE TABLE IF NOT EXISTS versi_tabel (
+    nama TEXT PRIMARY KEY,
+    versi INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO versi_tabel (nama, versi) VALUES ('users', 0);
+CREATE TRIGGER IF NOT EXISTS users_versi_insert AFTER INSERT ON users
+BEGIN UPDATE versi_tabel SET versi = versi + 1 WHERE nama = 'users'; END;
+CREATE TRIGGER IF NOT EXISTS users_versi_update AFTER UPDATE ON users
+BEGIN UPDATE versi_tabel SET versi = versi + 1 WHERE nama = 'users'; END;
+CREATE TRIGGER IF NOT EXISTS users_versi_delete AFTER DELETE ON users
+BEGIN UPDATE versi_tabel SET versi = versi + 1 WHERE nama = 'users'; END;
+CREATE TABLE IF NOT EXISTS migrasi (
+    sumber TEXT PRIMARY KEY,
+    waktu TEXT
+);
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_siap = set()
+
+
+def sekarang():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _teks(nilai):
+    # NaN dari pandas disimpan sebagai NULL, nilai lain sebagai teks seperti di CSV
+    if nilai is None or (isinstance(nilai, float) and pd.isna(nilai)):
+        return None
+    return str(nilai)
+
+
+def koneksi():
+    path = os.path.abspath(DB_PATH)
+    conn = getattr(_local, "conns", {}).get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        _local.conns = dict(getattr(_local, "conns", {}), **{path: conn})
+    if path not in _siap:
+        with _init_lock:
+            if path not in _siap:
+                conn.executescript(SKEMA)
+                _tambah_kolom(conn, "pekerjaan", "sewa", "REAL")
+                _migrasi_csv(conn)
+                _siap.add(path)
+    return conn
+
+
+def _tambah_kolom(conn, tabel, kolom, tipe):
+    # Basis data lama: kolom baru ditambahkan di tempat (CREATE TABLE IF NOT EXISTS tidak mengubahnya)
+    if kolom not in {b["name"] for b in conn.execute(f"PRAGMA table_info({tabel})")}:
+        with conn:
+            conn.execute(f"ALTER TABLE {tabel} ADD COLUMN {kolom} {tipe}")
+
+
+def _sudah_migrasi(conn, sumber):
+    return conn.execute("SELECT 1 FROM migrasi WHERE sumber = ?", (sumber,)).fetchone() is not None
+
+
+def _impor(conn, sumber, tabel, kolom, baris):
+    placeholder = ", ".join("?" for _ in kolom)
+    conn.executemany(f"INSERT OR IGNORE INTO {tabel} ({', '.join(kolom)}) VALUES ({placeholder})",
+                     ([_teks(b.get(k)) for k in kolom] for b in baris))
+    conn.execute("INSERT INTO migrasi (sumber, waktu) VALUES (?, ?)", (sumber, sekarang()))
+
+
+def _migrasi_csv(conn):
+    # Impor satu kali dari CSV lama; penanda di tabel migrasi mencegah impor ganda
+    with conn:
+        for sumber, tabel, kolom in [
+            (USERS_CSV, "users", KOLOM_USER),
+            (PERMASALAHAN_CSV, "permasalahan", KOLOM_PERMASALAHAN + ["username"]),
+            (KERJASAMA_CSV, "kerjasama", KOLOM_KERJASAMA),
+        ]:
+            if _sudah_migrasi(conn, sumber):
+                continue
+            baris = pd.read_csv(sumber, dtype=str).to_dict("records") if os.path.exists(sumber) else []
+            _impor(conn, sumber, tabel, kolom, baris)
+
+        if not _sudah_migrasi(conn, TRASH_CSV):
+            baris = pd.read_csv(TRASH_CSV).to_dict("records") if os.path.exists(TRASH_CSV) else []
+            _impor(conn, TRASH_CSV, "trash", ["dihapus", "baris"],
+                   [{"dihapus": None, "baris": _json_baris(b)} for b in baris])
+
+
+def _df(query, params=(), kolom=None):
+    baris = koneksi().execute(query, params).fetchall()
+    return pd.DataFrame([dict(b) for b in baris], columns=kolom)
+
+
+# === User ===
+def load_users():
+    return _df(f"SELECT {', '.join(KOLOM_USER)} FROM users", kolom=KOLOM_USER)
+
+
+def get_user(username):
+    baris = koneksi().execute(f"SELECT {', '.join(KOLOM_USER)} FROM users WHERE username = ?",
+                              (username,)).fetchone()
+    return dict(baris) if baris else None
+
+
+def versi_users():
+    # Dinaikkan trigger pada setiap perubahan tabel users, juga dari proses lain (risda/pengguna.py)
+    return koneksi().execute("SELECT versi FROM versi_tabel WHERE nama = 'users'").fetchone()[0]
+
+
+@tracing.tahap("tulis")
+def save_user(username, password, name, email, phone, institution):
+    # password: hash dari pengguna.hash_password, bukan teks asli
+    conn = koneksi()
+    try:
+        with conn:
+            conn.execute(f"INSERT INTO users ({', '.join(KOLOM_USER)}) VALUES (?, ?, ?, ?, ?, ?)",
+                         (username, password, name, email, phone, institution))
+    except sqlite3.IntegrityError:
+        return False  # Username sudah ada
+    return True
+
+
+@tracing.tahap("tulis")
+def ubah_password(daftar):
+    """Ganti kolom password untuk pasangan (username, hash) di ``daftar``."""
+    conn = koneksi()
+    with conn:
+        conn.executemany("UPDATE users SET password = ? WHERE username = ?",
+                         [(h, username) for username, h in daftar])
+
+
+# === Permasalahan daerah ===
+@tracing.tahap("tulis")
+def tambah_permasalahan(data, username=None):
+    conn = koneksi()
+    with conn:
+        conn.execute("INSERT INTO permasalahan (Waktu, Nama, Instansi, Judul, Deskripsi, username) "
+                     "VALUES (?, ?, ?, ?, ?, ?)",
+                     tuple(_teks(data.get(k)) for k in KOLOM_PERMASALAHAN) + (username,))
+
+
+def permasalahan_df(username=None, instansi=None):
+    # Baris lama (hasil migrasi CSV) belum punya username, jadi dicocokkan lewat instansi
+    kolom = ", ".join(KOLOM_PERMASALAHAN)
+    if username is None and instansi is None:
+        return _df(f"SELECT {kolom} FROM permasalahan ORDER BY id", kolom=KOLOM_PERMASALAHAN)
+    df = _df(f"SELECT id, {kolom} FROM permasalahan WHERE username = ? "
+             f"UNION ALL SELECT id, {kolom} FROM permasalahan WHERE username IS NULL AND Instansi = ? "
+             f"ORDER BY id", (username, instansi), kolom=["id"] + KOLOM_PERMASALAHAN)
+    return df.drop(columns="id")
+
+
+def semua_permasalahan():
+    """Semua permasalahan beserta id-nya (rekomendasi batch, lihat risda/batch.py)."""
+    kolom = ", ".join(KOLOM_PERMASALAHAN)
+    return _df(f"SELECT id, {kolom} FROM permasalahan ORDER BY id", kolom=["id"] + KOLOM_PERMASALAHAN)
+
+
+def jumlah_permasalahan(username=None, instansi=None):
+    if username is None and instansi is None:
+        return koneksi().execute("SELECT COUNT(*) FROM permasalahan").fetchone()[0]
+    return koneksi().execute(
+        "SELECT (SELECT COUNT(*) FROM permasalahan WHERE username = ?)"
+        " + (SELECT COUNT(*) FROM permasalahan WHERE username IS NULL AND Instansi = ?)",
+        (username, instansi)).fetchone()[0]
+
+
+# === Permintaan kerja sama ===
+@tracing.tahap("tulis")
+def tambah_kerjasama(data):
+    conn = koneksi()
+    with conn:
+        conn.execute(f"INSERT INTO kerjasama ({', '.join(KOLOM_KERJASAMA)}) VALUES (?, ?, ?, ?, ?)",
+                     tuple(_teks(data.get(k)) for k in KOLOM_KERJASAMA))
+
+
+def kerjasama_df():
+    return _df(f"SELECT {', '.join(KOLOM_KERJASAMA)} FROM kerjasama ORDER BY id", kolom=KOLOM_KERJASAMA)
+
+
+# === Tempat sampah inovasi ===
+def _json_baris(baris):
+    return json.dumps({k: (None if pd.isna(v) else v.item() if hasattr(v, "item") else v)
+                       for k, v in baris.items()}, ensure_ascii=False)
+
+
+@tracing.tahap("tulis")
+def buang_ke_trash(df_baris):
+    conn = koneksi()
+    with conn:
+        conn.executemany("INSERT INTO trash (dihapus, baris) VALUES (?, ?)",
+                         [(sekarang(), _json_baris(b)) for b in df_baris.to_dict("records")])
+
+
+def trash_df():
+    baris = koneksi().execute("SELECT id, baris FROM trash ORDER BY id").fetchall()
+    return pd.DataFrame([json.loads(b["baris"]) for b in baris], index=[b["id"] for b in baris])
+
+
+@tracing.tahap("tulis")
+def pulihkan_dari_trash(trash_id):
+    """Hapus satu baris dari tempat sampah dan kembalikan isinya sebagai DataFrame satu baris."""
+    conn = koneksi()
+    with conn:
+        baris = conn.execute("SELECT baris FROM trash WHERE id = ?", (trash_id,)).fetchone()
+        conn.execute("DELETE FROM trash WHERE id = ?", (trash_id,))
+    return pd.DataFrame([json.loads(baris["baris"])]) if baris else pd.DataFrame()
+
+
+# === Pekerjaan latar ===
+KOLOM_PEKERJAAN = ["id", "jenis", "status", "progres", "pesan", "dibuat", "mulai", "selesai"]
+
+
+def tambah_pekerjaan(jenis, parameter):
+    conn = koneksi()
+    with conn:
+        cur = conn.execute("INSERT INTO pekerjaan (jenis, status, progres, parameter, dibuat) "
+                           "VALUES (?, 'antre', 0, ?, ?)", (jenis, json.dumps(parameter), sekarang()))
+    return cur.lastrowid
+
+
+def klaim_pekerjaan(pekerjaan_id, pemilik, sewa, waktu):
+    """Tandai pekerjaan antre (atau berjalan dengan sewa yang habis sebelum ``waktu``) sedang
+    dijalankan ``pemilik`` dengan sewa sampai ``sewa``; False bila sudah diklaim pihak lain."""
+    conn = koneksi()
+    with conn:
+        cur = conn.execute(
+            "UPDATE pekerjaan SET status = 'berjalan', mulai = ?, pemilik = ?, sewa = ? "
+            "WHERE id = ? AND (status = 'antre' OR (status = 'berjalan' AND (sewa IS NULL OR sewa < ?)))",
+            (sekarang(), pemilik, sewa, pekerjaan_id, waktu))
+    return cur.rowcount == 1
+
+
+def perpanjang_sewa(pemilik, sewa):
+    """Perpanjang sewa semua pekerjaan yang sedang dijalankan ``pemilik``."""
+    conn = koneksi()
+    with conn:
+        conn.execute("UPDATE pekerjaan SET sewa = ? WHERE status = 'berjalan' AND pemilik = ?", (sewa, pemilik))
+
+
+def ubah_pekerjaan(pekerjaan_id, **kolom):
+    conn = koneksi()
+    with conn:
+        conn.execute(f"UPDATE pekerjaan SET {', '.join(f'{k} = ?' for k in kolom)} WHERE id = ?",
+                     (*kolom.values(), pekerjaan_id))
+
+
+def ambil_pekerjaan(pekerjaan_id):
+    baris = koneksi().execute("SELECT * FROM pekerjaan WHERE id = ?", (pekerjaan_id,)).fetchone()
+    if baris is None:
+        return None
+    hasil = dict(baris)
+    hasil["parameter"] = json.loads(hasil["parameter"]) if hasil["parameter"] else {}
+    hasil["hasil"] = json.loads(hasil["hasil"]) if hasil["hasil"] else None
+    return hasil
+
+
+def pekerjaan_df(n=20):
+    return _df(f"SELECT {', '.join(KOLOM_PEKERJAAN)} FROM pekerjaan ORDER BY id DESC LIMIT ?", (n,),
+               kolom=KOLOM_PEKERJAAN)
+
+
+def pekerjaan_tertunda(waktu):
+    """Id pekerjaan yang antre atau berjalan dengan sewa yang habis sebelum ``waktu``, terlama dulu."""
+    return [b["id"] for b in koneksi().execute(
+        "SELECT id FROM pekerjaan WHERE status = 'antre' "
+        "OR (status = 'berjalan' AND (sewa IS NULL OR sewa < ?)) ORDER BY id", (waktu,))]
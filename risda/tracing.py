@@ -0,0 +1,212 @@
+"""Log jejak terstruktur: satu baris JSON per interaksi pengguna / permintaan API.
+
+Setiap rerun halaman Streamlit (dan setiap permintaan ke risda/api.py) dibungkus
+``jejak(page, aksi)``. Selama jejak aktif, kode di bawahnya dapat menambahkan:
+
+* waktu per tahap lewat ``tahap(nama)`` (context manager atau dekorator):
+  ``muat_csv``, ``muat_snapshot``, ``transform``, ``kemiripan``, ``cari_kata``,
+  ``filter_urut``, ``render``, ``tulis``; tahap yang sama dijumlahkan
+* atribut lewat ``catat(...)``, mis. ``panjang_query`` dan ``jumlah_hasil``
+* hit/miss cache query (dicatat otomatis oleh risda/query_cache.py)
+
+Tanpa jejak aktif (mis. benchmark, CLI) semua pemanggilan itu tidak melakukan
+apa-apa. Baris jejak dimasukkan ke antrean dan ditulis (JSON + append) oleh
+thread latar per batch, jadi halaman tidak pernah menunggu disk. Bila antrean
+penuh, jejak dibuang dan dihitung di ``statistik()``.
+
+Berkas dirotasi berdasarkan ukuran: begitu melewati ``RISDA_TRACE_MAKS_MB``
+(default 50) berkas dipindah ke ``<path>.1`` (menimpa cadangan lama) dan
+penulisan berlanjut ke berkas baru, jadi disk terpakai paling banyak dua kali
+batas itu.
+
+Konfigurasi per deployment: ``RISDA_TRACE_PATH`` (default ``traces.jsonl``),
+``RISDA_TRACE_MAKS_MB`` (0 = tanpa rotasi), ``RISDA_TRACE=0`` untuk mematikan.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+
+PATH = os.environ.get("RISDA_TRACE_PATH", "traces.jsonl")
+AKTIF = os.environ.get("RISDA_TRACE", "1") != "0"
+MAKS_BYTE = int(float(os.environ.get("RISDA_TRACE_MAKS_MB", "50")) * 1024 * 1024)
+UKURAN_ANTREAN = 10000
+UKURAN_BATCH = 500
+INTERVAL_FLUSH = 1.0
+
+_aktif = contextvars.ContextVar("risda_jejak", default=None)
+
+
+class Jejak:
+    def __init__(self, page, aksi):
+        self.page = page
+        self.aksi = aksi
+        self.atribut = {}
+        self.tahap = {}
+        self.cache_hit = 0
+        self.cache_miss = 0
+        self.galat = None
+        self._mulai = time.perf_counter()
+        self._waktu = datetime.datetime.now().isoformat(timespec="milliseconds")
+
+    def sebagai_dict(self):
+        baris = {"ts": self._waktu, "page": self.page, "aksi": self.aksi}
+        baris.update(self.atribut)
+        baris["cache_hit"] = self.cache_hit
+        baris["cache_miss"] = self.cache_miss
+        baris["tahap_ms"] = {k: round(v * 1000, 3) for k, v in self.tahap.items()}
+        baris["total_ms"] = round((time.perf_counter() - self._mulai) * 1000, 3)
+        if self.galat:
+            baris["galat"] = self.galat
+        return baris
+
+
+class _Penulis:
+    """Antrean + thread latar yang menulis baris jejak per batch."""
+
+    def __init__(self):
+        self._antrean = queue.Queue(UKURAN_ANTREAN)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.ditulis = 0
+        self.dibuang = 0
+        self.rotasi = 0
+
+    def kirim(self, baris):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._jalan, name="risda-trace", daemon=True)
+                    self._thread.start()
+        try:
+            self._antrean.put_nowait(baris)
+        except queue.Full:
+            self.dibuang += 1
+
+    def _ambil_batch(self, timeout):
+        try:
+            batch = [self._antrean.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < UKURAN_BATCH:
+            try:
+                batch.append(self._antrean.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _tulis(self, batch):
+        if not batch:
+            return
+        teks = "".join(json.dumps(b, ensure_ascii=False, default=str) + "\n" for b in batch)
+        with self._lock:
+            try:
+                with open(PATH, "a", encoding="utf-8") as f:
+                    f.write(teks)
+                    ukuran = f.tell()
+                self.ditulis += len(batch)
+            except OSError:
+                self.dibuang += len(batch)
+                return
+            if MAKS_BYTE and ukuran >= MAKS_BYTE:
+                with contextlib.suppress(OSError):
+                    os.replace(PATH, f"{PATH}.1")
+                    self.rotasi += 1
+
+    def _jalan(self):
+        while True:
+            self._tulis(self._ambil_batch(INTERVAL_FLUSH))
+
+    def flush(self):
+        # Dipanggil saat proses berhenti / dari benchmark: tulis sisa antrean sekarang juga
+        while True:
+            batch = self._ambil_batch(0)
+            if not batch:
+                return
+            self._tulis(batch)
+
+
+_penulis = _Penulis()
+atexit.register(_penulis.flush)
+
+
+@contextlib.contextmanager
+def kumpulkan():
+    """Kumpulkan tahap tanpa mengirim jejak; digabung ke jejak berikutnya lewat ``jejak(..., awal=...)``."""
+    j = Jejak(None, None)
+    token = _aktif.set(j)
+    try:
+        yield j
+    finally:
+        _aktif.reset(token)
+
+
+@contextlib.contextmanager
+def jejak(page, aksi="tampil", awal=None):
+    """Bungkus satu interaksi; baris jejaknya dikirim ke penulis latar saat selesai."""
+    if not AKTIF:
+        yield None
+        return
+    j = Jejak(page, aksi)
+    if awal is not None:
+        # Tahap sebelum halaman diketahui (mis. muat sumber daya di awal rerun) ikut dihitung
+        j.tahap.update(awal.tahap)
+        j.cache_hit, j.cache_miss = awal.cache_hit, awal.cache_miss
+        j._mulai, j._waktu = awal._mulai, awal._waktu
+    token = _aktif.set(j)
+    try:
+        yield j
+    except Exception as e:
+        j.galat = type(e).__name__
+        raise
+    finally:
+        _aktif.reset(token)
+        _penulis.kirim(j.sebagai_dict())
+
+
+@contextlib.contextmanager
+def tahap(nama):
+    """Tambahkan durasi blok ini ke tahap ``nama`` jejak aktif (bisa juga dipakai sebagai dekorator)."""
+    j = _aktif.get()
+    if j is None:
+        yield
+        return
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        j.tahap[nama] = j.tahap.get(nama, 0.0) + time.perf_counter() - mulai
+
+
+def catat(aksi=None, **atribut):
+    j = _aktif.get()
+    if j is None:
+        return
+    if aksi is not None:
+        j.aksi = aksi
+    j.atribut.update(atribut)
+
+
+def catat_cache(hit):
+    j = _aktif.get()
+    if j is None:
+        return
+    if hit:
+        j.cache_hit += 1
+    else:
+        j.cache_miss += 1
+
+
+def flush():
+    _penulis.flush()
+
+
+def statistik():
+    return {"ditulis": _penulis.ditulis, "dibuang": _penulis.dibuang, "rotasi": _penulis.rotasi,
+            "antrean": _penulis._antrean.qsize()}
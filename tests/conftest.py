@@ -0,0 +1,27 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from risda import journal, resources
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def korpus(tmp_path, monkeypatch):
+    for nama in (resources.VECTORIZER_PATH, resources.MLB_PATH):
+        shutil.copy(os.path.join(REPO, nama), tmp_path / nama)
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({
+        "judul": ["Bank sampah", "Peringatan banjir", "Irigasi tetes"],
+        "sinopsis": ["daur ulang plastik", "sensor sungai", "hemat air sawah"],
+        "label": ["['Sampah']", "['Banjir']", "['Pertanian']"],
+        "link": [None, None, None],
+        "tahun": [2020, 2021, 2022],
+        "daerah": ["Bandung", "Semarang", "Malang"],
+    }).to_csv(journal.SNAPSHOT_PATH, index=False)
+    resources.invalidate()
+    yield tmp_path
+    resources.invalidate()
@@ -0,0 +1,15 @@
+import pytest
+
+from risda import api
+
+
+@pytest.mark.parametrize("label", [5, [None], ["Banjir", 3], {"a": 1}])
+def test_cari_label_bukan_string(label):
+    with pytest.raises(api.PermintaanSalah):
+        api.cari(None, {"label": label})
+
+
+@pytest.mark.parametrize("teks", [None, 3, [None, 3], ["banjir", {"a": 1}]])
+def test_klasifikasi_teks_bukan_string(teks):
+    with pytest.raises(api.PermintaanSalah):
+        api.klasifikasi(None, {"teks": teks})
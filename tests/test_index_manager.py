@@ -0,0 +1,119 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from risda import index_manager, journal, resources, retrieval
+
+
+def _baris(res, row_id):
+    return res.data.iloc[int(res.row_id.tolist().index(row_id))]
+
+
+def test_ubah_teks_ke_kolom_kosong(korpus):
+    resources.get_resources()
+    baris = {"judul": "Peringatan banjir dini", "sinopsis": "sensor sungai", "label": "['Banjir']",
+             "link": "https://contoh.id/banjir", "tahun": 2021}
+    assert index_manager.ubah(1, baris) is None
+    inkremental = resources.get_resources()
+    assert _baris(inkremental, 1)["link"] == "https://contoh.id/banjir"
+
+    resources.invalidate()
+    penuh = resources.get_resources()
+    assert _baris(penuh, 1)["link"] == "https://contoh.id/banjir"
+    assert list(penuh.row_id) == list(inkremental.row_id[inkremental.alive])
+
+
+def test_delta_gagal_tidak_menulis_jurnal(korpus, monkeypatch):
+    resources.get_resources()
+
+    def gagal(*args):
+        raise RuntimeError("delta gagal")
+    monkeypatch.setattr(index_manager, "delta_ubah", gagal)
+    with pytest.raises(RuntimeError):
+        index_manager.ubah(0, {"judul": "Bank sampah", "sinopsis": "baru", "label": "['Sampah']"})
+    assert not os.path.exists(journal.JOURNAL_PATH) or os.path.getsize(journal.JOURNAL_PATH) == 0
+    assert len(resources.get_resources().data) == 3
+
+
+def test_lapisan_sama_dengan_muat_ulang(korpus, monkeypatch):
+    monkeypatch.setattr(index_manager, "BATAS_TOMBSTONE", 1.0)
+    dasar = resources.get_resources()
+    index_manager.ubah(0, {"judul": "Bank sampah digital", "sinopsis": "tukar plastik jadi saldo",
+                           "label": "['Sampah']", "tahun": 2023})
+    index_manager.hapus(2)
+    index_manager.tambah(pd.DataFrame([{"judul": "Sumur resapan", "sinopsis": "cegah banjir kota",
+                                        "label": "['Banjir']", "tahun": 2024}]))
+    inkremental = resources.get_resources()
+    # Korpus dasar tidak disalin: perubahan hanya ada di lapisan
+    assert inkremental.data_dasar is dasar.data_dasar and inkremental.tfidf_dasar is dasar.tfidf_dasar
+    assert len(inkremental.lapisan) == 2
+
+    resources.invalidate()
+    penuh = resources.get_resources()
+    for teks in ("plastik saldo", "banjir"):
+        ids_a, skor_a = retrieval.rekomendasi_ids(inkremental, teks, top_n=5)
+        ids_b, skor_b = retrieval.rekomendasi_ids(penuh, teks, top_n=5)
+        assert list(inkremental.row_id[ids_a]) == list(penuh.row_id[ids_b])
+        assert skor_a == pytest.approx(skor_b)
+        assert list(inkremental.baris(ids_a)["judul"]) == list(penuh.baris(ids_b)["judul"])
+    padat = index_manager.padatkan(inkremental)
+    assert list(padat.row_id) == list(penuh.row_id)
+    assert list(padat.data["judul"]) == list(penuh.data["judul"])
+    assert padat.hash_index.peta.sebagai_dict() == penuh.hash_index.peta.sebagai_dict()
+
+
+def test_pembaca_tidak_menunggu_penulis(korpus):
+    lama = resources.get_resources()
+    mulai, lanjut = threading.Event(), threading.Event()
+
+    def tulis(res):
+        # Penulis tertahan di tengah penulisan berkas (mis. fsync lambat)
+        journal.hapus(2)
+        mulai.set()
+        assert lanjut.wait(5)
+    penulis = threading.Thread(target=index_manager._terapkan,
+                               args=(tulis, lambda res, _: index_manager.delta_hapus(res, 2)))
+    penulis.start()
+    assert mulai.wait(5)
+    pembaca = threading.Thread(target=resources.get_resources)
+    pembaca.start()
+    pembaca.join(1)
+    assert not pembaca.is_alive()
+    assert resources.get_resources() is lama
+    lanjut.set()
+    penulis.join(5)
+    assert 2 not in resources.get_resources().row_id[resources.get_resources().alive]
+
+
+def test_tambah_menolak_duplikat(korpus):
+    resources.get_resources()
+    df = pd.DataFrame([
+        {"judul": "Bank sampah", "sinopsis": "daur ulang plastik", "label": "['Sampah']", "tahun": 2024},
+        {"judul": "Sumur resapan", "sinopsis": "cegah banjir kota", "label": "['Banjir']", "tahun": 2024},
+        {"judul": "Sumur resapan", "sinopsis": "cegah banjir kota", "label": "['Banjir']", "tahun": 2025},
+    ])
+    tersimpan, duplikat = index_manager.tambah(df)
+
+    assert list(tersimpan["judul"]) == ["Sumur resapan"]
+    # Sama dengan baris korpus id 0, dan sama dengan baris sebelumnya di df yang sama (-1)
+    assert list(duplikat["duplikat_dari"]) == [0, -1]
+    res = resources.get_resources()
+    assert list(res.baris(res.live_ids())["judul"]) == ["Bank sampah", "Peringatan banjir", "Irigasi tetes",
+                                                          "Sumur resapan"]
+
+    # Baris yang baru tersimpan ikut dicek pada penambahan berikutnya
+    tersimpan, duplikat = index_manager.tambah(df.iloc[[1]])
+    assert tersimpan.empty and list(duplikat["duplikat_dari"]) == [int(res.row_id[3])]
+
+
+def test_ubah_menolak_isi_baris_lain(korpus):
+    resources.get_resources()
+    baris = {"judul": "Bank sampah", "sinopsis": "daur ulang plastik", "label": "['Banjir']", "tahun": 2021}
+    assert index_manager.ubah(1, baris) == 0
+    assert _baris(resources.get_resources(), 1)["judul"] == "Peringatan banjir"
+
+    # Isi yang sama dengan baris itu sendiri (mis. hanya label/tahun diubah) tetap boleh
+    assert index_manager.ubah(0, baris) is None
+    assert _baris(resources.get_resources(), 0)["label"] == "['Banjir']"
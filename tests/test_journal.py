@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from risda import journal
+
+
+@pytest.fixture
+def korpus(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Kolom link seluruhnya kosong: dibaca pandas sebagai float64
+    pd.DataFrame({
+        "judul": ["Bank sampah", "Peringatan banjir"],
+        "sinopsis": ["daur ulang plastik", "sensor sungai"],
+        "label": ["['Sampah']", "['Banjir']"],
+        "link": [None, None],
+        "tahun": [2020, 2021],
+    }).to_csv(journal.SNAPSHOT_PATH, index=False)
+    return tmp_path
+
+
+def test_replay_update_teks_ke_kolom_kosong(korpus):
+    journal.ubah(0, {"judul": "Bank sampah digital", "sinopsis": "daur ulang plastik", "label": "['Sampah']",
+                     "link": "https://contoh.id/bank-sampah", "tahun": 2022})
+    df = journal.baca()
+    assert df.loc[df["id"] == 0, "link"].item() == "https://contoh.id/bank-sampah"
+    assert df.loc[df["id"] == 0, "judul"].item() == "Bank sampah digital"
+    assert pd.isna(df.loc[df["id"] == 1, "link"].item())
+    assert df["id"].tolist() == [0, 1]
+
+
+def test_pemadatan_setelah_update_teks(korpus):
+    journal.ubah(1, {"judul": "Peringatan banjir", "sinopsis": "sensor sungai", "label": "['Banjir']",
+                     "link": "https://contoh.id/banjir", "tahun": None})
+    journal.tambah(pd.DataFrame([{"judul": "Baru", "sinopsis": "isi", "label": "['Banjir']", "tahun": 2023}]))
+    sebelum = journal.baca()
+    journal.padatkan()
+    sesudah = journal.baca()
+    assert sesudah["id"].tolist() == sebelum["id"].tolist() == [0, 1, 2]
+    assert sesudah.loc[1, "link"] == "https://contoh.id/banjir"
+    assert pd.isna(sesudah.loc[1, "tahun"])
+    # Jurnal kosong setelah pemadatan; record berikutnya tetap bisa di-replay
+    journal.ubah(0, {"judul": "Bank sampah", "sinopsis": "daur ulang plastik", "label": "['Sampah']",
+                     "link": "https://contoh.id/0", "tahun": 2020})
+    assert journal.baca().loc[0, "link"] == "https://contoh.id/0"
+
+
+def test_jumlah_record_dari_meta(korpus, monkeypatch):
+    def jangan_baca():
+        raise AssertionError("jurnal dibaca ulang untuk menghitung record")
+    monkeypatch.setattr(journal, "_hitung_record", jangan_baca)
+    monkeypatch.setattr(journal, "BATAS_RECORD", 3)
+    for i in range(5):
+        journal.ubah(0, {"judul": f"Bank sampah {i}", "sinopsis": "daur ulang plastik", "label": "['Sampah']"})
+    # Pemadatan di record ke-3, lalu dua record baru
+    with open(journal.JOURNAL_PATH, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+    assert journal._baca_meta()["record"] == 2
+    assert journal.baca().loc[0, "judul"] == "Bank sampah 4"
@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from risda import pekerjaan, storage
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(pekerjaan._jenis, "uji", (lambda parameter, lapor: {"ok": True}, "Uji"))
+    yield tmp_path
+
+
+def _berjalan_milik_lain(sewa):
+    # Pekerjaan yang diklaim proses lain (mis. server sebelum restart, PID bisa sama)
+    pekerjaan_id = storage.tambah_pekerjaan("uji", {})
+    assert storage.klaim_pekerjaan(pekerjaan_id, "proses-lama", sewa, time.time())
+    return pekerjaan_id
+
+
+def _lanjutkan():
+    executor = ThreadPoolExecutor(1)
+    pekerjaan._lanjutkan(executor)
+    executor.shutdown(wait=True)
+
+
+def test_sewa_habis_dilanjutkan(db):
+    pekerjaan_id = _berjalan_milik_lain(time.time() - 1)
+    _lanjutkan()
+    info = storage.ambil_pekerjaan(pekerjaan_id)
+    assert info["status"] == "selesai" and info["hasil"] == {"ok": True}
+    assert info["pemilik"] == pekerjaan.TOKEN
+
+
+def test_sewa_aktif_tidak_diambil_alih(db):
+    pekerjaan_id = _berjalan_milik_lain(time.time() + 60)
+    _lanjutkan()
+    info = storage.ambil_pekerjaan(pekerjaan_id)
+    assert info["status"] == "berjalan" and info["pemilik"] == "proses-lama"
+
+
+def test_pekerjaan_antre_dijalankan_sekali(db):
+    pekerjaan_id = storage.tambah_pekerjaan("uji", {})
+    _lanjutkan()
+    _lanjutkan()
+    assert storage.ambil_pekerjaan(pekerjaan_id)["status"] == "selesai"
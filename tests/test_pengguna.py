@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from risda import pengguna, storage
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Direktori di memori dikosongkan: versi users basis data baru bisa sama dengan yang lama
+    monkeypatch.setattr(pengguna, "_cache", {"versi": None, "user": {}})
+    yield tmp_path
+
+
+def test_hash_password_bersalt_dan_cocok():
+    tersimpan = pengguna.hash_password("rahasia", iterasi=1000)
+    assert pengguna.sudah_hash(tersimpan) and "rahasia" not in tersimpan
+    assert pengguna.cocok("rahasia", tersimpan)
+    assert not pengguna.cocok("Rahasia", tersimpan)
+    # Salt acak: password yang sama menghasilkan hash berbeda
+    assert tersimpan != pengguna.hash_password("rahasia", iterasi=1000)
+    assert not pengguna.cocok("rahasia", "rahasia") and not pengguna.cocok("rahasia", None)
+
+
+def test_daftar_lalu_verifikasi(db):
+    assert pengguna.daftar("budi", "rahasia", "Budi", "budi@contoh.id", "0812", "Pemda")
+    assert not pengguna.daftar("budi", "lain", "Budi", "budi@contoh.id", "0812", "Pemda")
+
+    assert pengguna.verifikasi("budi", "rahasia")["name"] == "Budi"
+    assert pengguna.verifikasi("budi", "salah") is None
+    assert pengguna.verifikasi("tidak_ada", "rahasia") is None
+    assert "password" not in pengguna.cari("budi")
+
+
+def test_password_teks_users_csv_dimigrasi(db):
+    pd.DataFrame([{"username": "sari", "password": "lama123", "name": "Sari", "email": "sari@contoh.id",
+                   "phone": "0813", "institution": "Dinas"}]).to_csv(storage.USERS_CSV, index=False)
+
+    assert pengguna.verifikasi("sari", "lama123")["name"] == "Sari"
+    tersimpan = storage.get_user("sari")["password"]
+    assert pengguna.sudah_hash(tersimpan) and pengguna.cocok("lama123", tersimpan)
+    assert pengguna.verifikasi("sari", "salah") is None
@@ -0,0 +1,64 @@
+from risda import query_cache
+from risda.query_cache import QueryCache
+
+
+def _hitung(nilai, log):
+    def hitung():
+        log.append(nilai)
+        return nilai
+    return hitung
+
+
+def test_lru_membuang_entri_terlama():
+    cache, log = QueryCache(ukuran=2, ttl=None), []
+    cache.ambil(1, "a", _hitung("A", log))
+    cache.ambil(1, "b", _hitung("B", log))
+    # "a" dipakai lagi, jadi "b" yang paling lama tidak terpakai
+    assert cache.ambil(1, "a", _hitung("A", log)) == "A"
+    cache.ambil(1, "c", _hitung("C", log))
+
+    assert cache.ambil(1, "a", _hitung("A", log)) == "A"
+    assert cache.ambil(1, "b", _hitung("B", log)) == "B"
+    assert log == ["A", "B", "C", "B"]
+    assert cache.statistik()["entri"] == 2
+
+
+def test_entri_kedaluwarsa_setelah_ttl(monkeypatch):
+    jam = [1000.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: jam[0])
+    cache, log = QueryCache(ukuran=10, ttl=60), []
+
+    cache.ambil(1, "a", _hitung("A", log))
+    jam[0] += 59
+    cache.ambil(1, "a", _hitung("A", log))
+    assert log == ["A"]
+
+    jam[0] += 2
+    cache.ambil(1, "a", _hitung("A", log))
+    assert log == ["A", "A"]
+    assert (cache.hit, cache.miss) == (1, 2)
+
+
+def test_versi_baru_membuang_semua_entri():
+    cache, log = QueryCache(ukuran=10, ttl=None), []
+    cache.ambil(1, "a", _hitung("A1", log))
+    cache.ambil(1, "b", _hitung("B1", log))
+
+    assert cache.ambil(2, "a", _hitung("A2", log)) == "A2"
+    assert cache.statistik()["entri"] == 1
+    assert cache.ambil(2, "b", _hitung("B2", log)) == "B2"
+    assert cache.ambil(2, "a", _hitung("A2", log)) == "A2"
+    assert log == ["A1", "B1", "A2", "B2"]
+
+
+def test_hasil_versi_lama_tidak_disimpan():
+    cache, log = QueryCache(ukuran=10, ttl=None), []
+
+    def hitung_sambil_korpus_berubah():
+        # Korpus berganti versi selagi query lama masih dihitung
+        cache.ambil(2, "b", _hitung("B2", log))
+        return "A1"
+
+    assert cache.ambil(1, "a", hitung_sambil_korpus_berubah) == "A1"
+    assert cache.ambil(2, "a", _hitung("A2", log)) == "A2"
+    assert log == ["B2", "A2"]
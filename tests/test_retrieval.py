@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from risda import api, journal, resources, retrieval
+
+
+def test_top_k_seri_dibatasi_id_terkecil():
+    skor = np.zeros(1000)
+    skor[[7, 500]] = 0.5
+    ids, hasil = retrieval.top_k(skor, 5)
+    assert list(ids) == [7, 500, 0, 1, 2]
+    assert list(hasil) == [0.5, 0.5, 0, 0, 0]
+
+
+def test_top_k_sama_dengan_urut_penuh():
+    rng = np.random.default_rng(0)
+    skor = rng.integers(0, 4, 500) / 4
+    mask = rng.random(500) > 0.2
+    for k in (1, 10, 100, 499):
+        ids, _ = retrieval.top_k(skor, k, None, mask)
+        semua = np.flatnonzero(mask)
+        assert list(ids) == list(semua[np.lexsort((semua, -skor[semua]))][:k])
+
+
+def _tulis_korpus(baris):
+    pd.DataFrame(baris, columns=["judul", "sinopsis", "label", "link", "tahun", "daerah"]).to_csv(
+        journal.SNAPSHOT_PATH, index=False)
+    resources.invalidate()
+    return resources.get_resources()
+
+
+def test_hybrid_urut_skor_gabungan(korpus):
+    res = _tulis_korpus([
+        ("Irigasi tetes", "hemat air sawah", "['Pertanian']", None, 2020, "Bandung"),
+        ("Peringatan banjir", "sensor banjir di sungai", "['Banjir']", None, 2021, "Bandung"),
+        ("Pompa air", "pompa dan tanggul penahan banjir rob di pesisir kota lama", "['Banjir']", None, 2022, "Bandung"),
+        ("Bank sampah", "daur ulang plastik", "['Sampah']", None, 2023, "Bandung"),
+    ])
+
+    ids, skor = retrieval.hybrid(res, "banjir sungai")
+    # Hanya baris yang memuat kata query; baris dengan kedua kata dan teks pendek di atas
+    assert list(ids) == [1, 2]
+    assert skor[0] > skor[1]
+
+    # Bobot ekstrem: urutan sama dengan BM25 saja / cosine saja atas kandidat yang sama
+    bm25_ids, bm25 = res.keyword_index.bm25("banjir sungai", res.alive)
+    ids, _ = retrieval.hybrid(res, "banjir sungai", bobot_bm25=1, bobot_cosine=0)
+    assert list(ids) == list(bm25_ids[np.lexsort((bm25_ids, -bm25))])
+    cosine = retrieval.skor_query(res, "banjir sungai")[bm25_ids]
+    ids, _ = retrieval.hybrid(res, "banjir sungai", bobot_bm25=0, bobot_cosine=1)
+    assert list(ids) == list(bm25_ids[np.lexsort((bm25_ids, -cosine))])
+
+    assert len(retrieval.hybrid(res, "zzzz")[0]) == 0
+
+
+def test_halaman_ids_batas_halaman(korpus):
+    res = resources.get_resources()
+    # Korpus fixture: id 0, 1, 2 dengan tahun 2020, 2021, 2022
+    assert [list(retrieval.halaman_ids(res, None, h, 2)[0]) for h in (1, 2, 3)] == [[2, 1], [0], []]
+    assert list(retrieval.halaman_ids(res, None, 1, 2, "terlama")[0]) == [0, 1]
+    assert retrieval.halaman_ids(res, None, 3, 2)[1] == 3
+
+    ids = np.array([0, 2])
+    assert [list(retrieval.halaman_ids(res, ids, h, 1)[0]) for h in (1, 2, 3)] == [[2], [0], []]
+    assert retrieval.halaman_ids(res, ids, 3, 1)[1] == 2
+
+    # Relevansi mempertahankan urutan ids, termasuk di halaman terakhir
+    ids = np.array([1, 0, 2])
+    assert [list(retrieval.halaman_ids(res, ids, h, 2, "relevansi")[0]) for h in (1, 2, 3)] == [[1, 0], [2], []]
+
+
+def test_cari_relevansi_tanpa_q_diurutkan_terbaru(korpus):
+    res = resources.get_resources()
+    hasil = api.cari(res, {"urut": "relevansi", "per_halaman": 2})
+    assert hasil["total"] == 3
+    assert [b["tahun"] for b in hasil["hasil"]] == [2022, 2021]
@@ -0,0 +1,50 @@
+import os
+import threading
+
+import pytest
+
+from risda import resources, snapshot
+
+
+def test_bangun_ulang_tidak_menahan_pembaca(korpus, monkeypatch):
+    lama = resources.get_resources()
+    mulai, lanjut = threading.Event(), threading.Event()
+    load_corpus = resources.load_corpus
+
+    def lambat():
+        mulai.set()
+        assert lanjut.wait(5)
+        return load_corpus()
+    monkeypatch.setattr(resources, "load_corpus", lambat)
+    job = threading.Thread(target=snapshot.bangun_ulang)
+    job.start()
+    assert mulai.wait(5)
+    # Selama build, pembaca langsung mendapat sumber daya lama
+    pembaca = threading.Thread(target=resources.get_resources)
+    pembaca.start()
+    pembaca.join(1)
+    assert not pembaca.is_alive()
+    assert resources.get_resources() is lama
+    lanjut.set()
+    job.join(5)
+    baru = resources.get_resources()
+    assert baru is not lama and len(baru.data) == len(lama.data)
+    assert snapshot.baca_manifest() is not None
+
+
+def _rentang_map(nama):
+    with open("/proc/self/maps") as f:
+        return [[int(x, 16) for x in baris.split()[0].split("-")] for baris in f if nama in baris]
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/maps"), reason="butuh /proc (Linux)")
+def test_kolom_teks_dilayani_dari_memory_map(korpus):
+    resources.get_resources()  # build pertama menulis snapshot
+    resources.invalidate()
+    res = resources.get_resources()
+    rentang = _rentang_map(".korpus.arrow")
+    assert rentang
+    for kolom in ("judul", "sinopsis", "label", "hash"):
+        buffer = [b for c in res.data_dasar[kolom].array._pa_array.chunks for b in c.buffers() if b is not None]
+        assert all(any(lo <= b.address < hi for lo, hi in rentang) for b in buffer), kolom
+    assert list(res.baris([2, 0])["judul"]) == ["Irigasi tetes", "Bank sampah"]
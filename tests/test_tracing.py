@@ -0,0 +1,35 @@
+import json
+
+from risda import tracing
+
+
+def test_rotasi_berdasarkan_ukuran(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing, "PATH", str(path))
+    monkeypatch.setattr(tracing, "MAKS_BYTE", 1000)
+    penulis = tracing._Penulis()
+
+    for i in range(30):
+        penulis._tulis([{"i": i, "isi": "x" * 100}])
+
+    cadangan = tmp_path / "traces.jsonl.1"
+    assert penulis.rotasi > 1 and penulis.ditulis == 30
+    # Hanya satu cadangan yang disimpan, dan tidak ada berkas yang melewati batas satu batch
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["traces.jsonl", "traces.jsonl.1"]
+    assert cadangan.stat().st_size < 1000 + 200 and path.stat().st_size < 1000
+    # Baris terbaru ada di berkas aktif, tepat setelah baris terakhir cadangan
+    akhir_cadangan = json.loads(cadangan.read_text().splitlines()[-1])["i"]
+    aktif = [json.loads(b)["i"] for b in path.read_text().splitlines()]
+    assert aktif == list(range(akhir_cadangan + 1, 30))
+
+
+def test_tanpa_rotasi_bila_batas_nol(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing, "PATH", str(path))
+    monkeypatch.setattr(tracing, "MAKS_BYTE", 0)
+    penulis = tracing._Penulis()
+
+    for i in range(30):
+        penulis._tulis([{"i": i, "isi": "x" * 100}])
+
+    assert penulis.rotasi == 0 and len(path.read_text().splitlines()) == 30